@@ -0,0 +1,27 @@
+"""add evaluation cache table"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evaluation_cache",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("cache_key", name=op.f("pk_evaluation_cache")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("evaluation_cache")
@@ -0,0 +1,64 @@
+"""add evaluation job queue"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+jobstatus_enum = sa.Enum(
+    "queued",
+    "running",
+    "succeeded",
+    "failed",
+    name="jobstatus",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evaluation_job",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("answer_id", sa.Integer(), nullable=False),
+        sa.Column("status", jobstatus_enum, nullable=False),
+        sa.Column(
+            "attempts", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.String(length=64), nullable=True),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["answer_id"],
+            ["answer.id"],
+            name=op.f("fk_evaluation_job_answer_id_answer"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_evaluation_job")),
+    )
+    op.create_index(
+        op.f("ix_evaluation_job_answer_id"),
+        "evaluation_job",
+        ["answer_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_evaluation_job_status_id", "evaluation_job", ["status", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_evaluation_job_status_id", table_name="evaluation_job")
+    op.drop_index(op.f("ix_evaluation_job_answer_id"), table_name="evaluation_job")
+    op.drop_table("evaluation_job")
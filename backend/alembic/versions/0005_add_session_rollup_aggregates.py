@@ -0,0 +1,45 @@
+"""add running score aggregates to session"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "session",
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "session",
+        sa.Column(
+            "evaluated_count", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+
+    op.execute(
+        """
+        UPDATE session SET
+            score_sum = COALESCE((
+                SELECT SUM(evaluation.score)
+                FROM evaluation JOIN answer ON answer.id = evaluation.answer_id
+                WHERE answer.session_id = session.id
+            ), 0),
+            evaluated_count = (
+                SELECT COUNT(evaluation.id)
+                FROM evaluation JOIN answer ON answer.id = evaluation.answer_id
+                WHERE answer.session_id = session.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("session", "evaluated_count")
+    op.drop_column("session", "score_sum")
@@ -0,0 +1,36 @@
+"""add keyset index for session history"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def rewrite_legacy_started_at(bind: sa.engine.Connection) -> None:
+    """Store SQLite ``CURRENT_TIMESTAMP`` values in the format bound datetimes use.
+
+    Rows created through the old server default hold ``YYYY-MM-DD HH:MM:SS`` while SQLAlchemy
+    binds ``YYYY-MM-DD HH:MM:SS.ffffff``; as text the shorter value sorts before the longer one
+    for the same second, which breaks ``(started_at, id)`` keyset comparisons.
+    """
+    if bind.dialect.name != "sqlite":
+        return
+    bind.execute(
+        sa.text(
+            "UPDATE session SET started_at = started_at || '.000000' WHERE length(started_at) = 19"
+        )
+    )
+
+
+def upgrade() -> None:
+    rewrite_legacy_started_at(op.get_bind())
+    op.create_index("ix_session_started_at_id", "session", ["started_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_session_started_at_id", table_name="session")
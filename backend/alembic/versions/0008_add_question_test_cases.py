@@ -0,0 +1,19 @@
+"""store executable test cases for code questions"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("question", sa.Column("test_cases", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("question", "test_cases")
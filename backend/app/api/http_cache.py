@@ -0,0 +1,42 @@
+"""Conditional GET helpers: strong ETags, ``If-None-Match`` and ``Cache-Control``."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: object) -> str:
+    """A strong validator for a representation identified by ``parts`` (row versions, hashes)."""
+    digest = hashlib.sha256(
+        "\x1f".join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _candidate_tags(header: str) -> Iterable[str]:
+    for tag in header.split(","):
+        tag = tag.strip()
+        # If-None-Match uses the weak comparison, so W/"x" matches "x" (RFC 9110, 13.1.2).
+        yield tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return any(tag == "*" or tag == etag for tag in _candidate_tags(if_none_match))
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str, cache_control: str
+) -> Optional[Response]:
+    """Set validators on ``response``; return a bodiless 304 if the client already has ``etag``."""
+    headers = {ETAG_HEADER: etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
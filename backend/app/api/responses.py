@@ -0,0 +1,45 @@
+"""JSON response classes for the API.
+
+:class:`ORJSONResponse` is the default response class: FastAPI still validates and converts
+the endpoint's return value, then orjson encodes it. Hot endpoints that already hold a
+validated model use :func:`model_response` instead, which skips FastAPI's second validation
+pass and hands the model's JSON-mode dump straight to orjson.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+__all__ = ["ORJSONResponse", "model_response"]
+
+
+def model_response(
+    content: Any,
+    *,
+    adapter: Optional[TypeAdapter[Any]] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+    exclude: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """Serialise ``content`` without FastAPI re-validating it.
+
+    ``content`` is a model instance, or any value ``adapter`` accepts (build adapters once at
+    import time). Headers set on an injected ``Response`` parameter are not merged into a
+    returned response, so pass them in through ``headers``. ``exclude`` is a ``model_dump``
+    exclude spec.
+    """
+    # One dict pass plus orjson beats pydantic-core writing the bytes itself once strings get
+    # long (feedback); see the ``encode:`` rows of ``python -m benchmarks.serialization``.
+    if adapter is not None:
+        data = adapter.dump_python(content, mode="json", exclude=exclude)
+    elif isinstance(content, BaseModel):
+        data = content.model_dump(mode="json", exclude=exclude)
+    else:
+        raise TypeError(
+            f"Cannot serialise {type(content).__name__} without a TypeAdapter."
+        )
+    return ORJSONResponse(data, status_code=status_code, headers=dict(headers or {}))
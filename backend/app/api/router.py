@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
+from app.api.responses import ORJSONResponse
 from app.api.v1 import evaluate, history, questions, roles, sessions
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 api_router.include_router(roles.router, prefix="/roles", tags=["roles"])
 api_router.include_router(questions.router, prefix="/questions", tags=["questions"])
 api_router.include_router(sessions.router, prefix="/sessions", tags=["sessions"])
@@ -1,93 +1,195 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Dict, Optional
+
+try:  # pragma: no cover - Python <3.9 compatibility
+    from typing import Annotated
+except ImportError:  # pragma: no cover
+    from typing_extensions import Annotated
+
+import structlog
+from fastapi import APIRouter, HTTPException, Path, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.responses import model_response
 from app.db.dependencies import DbSessionDep
-from app.models.enums import SessionTier
-from app.models.tables import Answer, Evaluation, Session
-from app.schemas.session import EvaluationRead, EvaluationRequest
-from app.services.evaluation import tier_for_score
-from app.services.llm import LLMEvaluationService
+from app.db.session import session_context
+from app.models.enums import JobStatus
+from app.models.tables import Answer, Evaluation, EvaluationJob
+from app.schemas.job import EvaluationJobRead
+from app.schemas.session import (
+    EvaluationBatchItem,
+    EvaluationBatchRequest,
+    EvaluationBatchResponse,
+    EvaluationRead,
+    EvaluationRequest,
+)
+from app.services.evaluation import EvaluationPayload
+from app.services.jobs import enqueue_evaluation, evaluation_workers
+from app.services.scoring import (
+    AnswerContext,
+    evaluate_and_store,
+    evaluate_and_store_many,
+    load_answer_context,
+    load_answer_contexts,
+    lookup_cached_evaluation,
+    store_evaluation,
+    stream_generated_evaluation,
+)
+
+logger = structlog.get_logger(__name__)
 
 router = APIRouter()
-llm_service = LLMEvaluationService()
 
 
 @router.post("", response_model=EvaluationRead, status_code=status.HTTP_200_OK)
-async def evaluate_answer(payload: EvaluationRequest, db: DbSessionDep) -> EvaluationRead:
-    answer_stmt = (
-        select(Answer)
-        .where(Answer.id == payload.answer_id)
-        .options(
-            selectinload(Answer.question),
-            selectinload(Answer.session).selectinload(Session.role),
-            selectinload(Answer.evaluation),
+async def evaluate_answer(payload: EvaluationRequest, db: DbSessionDep) -> Response:
+    context = await load_answer_context(db, payload.answer_id)
+    if not context:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found."
         )
+
+    evaluation = await evaluate_and_store(db, context)
+    await db.commit()
+
+    return model_response(EvaluationRead.model_validate(evaluation))
+
+
+@router.post(
+    "/batch",
+    response_model=EvaluationBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Evaluate many answers in one request",
+)
+async def evaluate_answers_batch(
+    payload: EvaluationBatchRequest, db: DbSessionDep
+) -> Response:
+    answer_ids = list(dict.fromkeys(payload.answer_ids))
+    contexts = await load_answer_contexts(db, answer_ids)
+    found = [contexts[answer_id] for answer_id in answer_ids if answer_id in contexts]
+
+    evaluations = await evaluate_and_store_many(db, found) if found else {}
+    await db.commit()
+
+    batch = EvaluationBatchResponse(
+        evaluations=[
+            EvaluationBatchItem(
+                answer_id=context.answer_id,
+                evaluation=EvaluationRead.model_validate(
+                    evaluations[context.answer_id]
+                ),
+            )
+            for context in found
+        ],
+        missing_answer_ids=[
+            answer_id for answer_id in answer_ids if answer_id not in contexts
+        ],
     )
-    answer_result = await db.execute(answer_stmt)
-    answer = answer_result.scalar_one_or_none()
-    if not answer:
+    return model_response(batch)
+
+
+@router.get(
+    "/{answer_id}/stream",
+    response_class=StreamingResponse,
+    summary="Stream evaluation feedback as server-sent events",
+)
+async def stream_answer_evaluation(
+    answer_id: Annotated[int, Path(description="Answer identifier")],
+    db: DbSessionDep,
+) -> StreamingResponse:
+    context = await load_answer_context(db, answer_id)
+    if not context:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found.")
+    cached = await lookup_cached_evaluation(db, context)
+    # Nothing else is read from this session; free its connection before streaming starts.
+    await db.commit()
 
-    question = answer.question
-    session_obj = answer.session
-    role = session_obj.role
-
-    evaluation_payload = await llm_service.evaluate_answer(
-        answer_text=answer.answer_text,
-        question_text=question.text,
-        category=question.category,
-        role_name=role.name,
-        requires_code=question.requires_code,
-        question_keywords=question.keywords,
+    return StreamingResponse(
+        _evaluation_events(context, cached),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    if answer.evaluation:
-        answer.evaluation.score = evaluation_payload.score
-        answer.evaluation.rubric = evaluation_payload.rubric
-        answer.evaluation.feedback_markdown = evaluation_payload.feedback_markdown
-        answer.evaluation.suggested_improvements = evaluation_payload.suggested_improvements
-    else:
-        answer.evaluation = Evaluation(
-            score=evaluation_payload.score,
-            rubric=evaluation_payload.rubric,
-            feedback_markdown=evaluation_payload.feedback_markdown,
-            suggested_improvements=evaluation_payload.suggested_improvements,
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _evaluation_events(
+    context: AnswerContext, cached: Optional[EvaluationPayload]
+) -> AsyncIterator[str]:
+    try:
+        payload = cached
+        if payload is not None:
+            yield _sse("delta", {"text": payload.feedback_markdown})
+        else:
+            async for event in stream_generated_evaluation(context):
+                if event.kind == "delta":
+                    yield _sse("delta", {"text": event.text})
+                else:
+                    payload = event.payload
+
+        if payload is None:
+            raise RuntimeError("Evaluation stream ended without a result.")
+
+        async with session_context.session() as db:
+            evaluation = await store_evaluation(db, context, payload)
+            await db.commit()
+            result = EvaluationRead.model_validate(evaluation).model_dump(mode="json")
+        yield _sse("result", result)
+    # Surface failures to the client instead of cutting the stream.
+    except Exception as exc:  # noqa: BLE001
+        logger.error(
+            "evaluation_stream_failed", answer_id=context.answer_id, error=str(exc)
         )
+        yield _sse("error", {"detail": "Evaluation failed."})
 
-    await db.flush()
 
-    await _update_session_rollup(db=db, session_obj=session_obj)
+@router.post(
+    "/jobs",
+    response_model=EvaluationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue an answer for background evaluation",
+)
+async def enqueue_evaluation_job(
+    payload: EvaluationRequest, db: DbSessionDep
+) -> EvaluationJobRead:
+    answer_id = await db.scalar(select(Answer.id).where(Answer.id == payload.answer_id))
+    if answer_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found."
+        )
 
+    job = await enqueue_evaluation(db, answer_id)
     await db.commit()
-    await db.refresh(answer, attribute_names=["evaluation"])
+    evaluation_workers.notify()
+    return EvaluationJobRead.model_validate(job)
 
-    return EvaluationRead.model_validate(answer.evaluation)
 
+@router.get(
+    "/jobs/{job_id}",
+    response_model=EvaluationJobRead,
+    summary="Check the status of a background evaluation",
+)
+async def get_evaluation_job(
+    job_id: Annotated[int, Path(description="Evaluation job identifier")],
+    db: DbSessionDep,
+) -> EvaluationJobRead:
+    job = await db.get(EvaluationJob, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Evaluation job not found."
+        )
 
-async def _update_session_rollup(*, db: AsyncSession, session_obj: Session) -> None:
-    stmt = (
-        select(Session)
-        .options(
-            selectinload(Session.answers).selectinload(Answer.evaluation),
+    job_read = EvaluationJobRead.model_validate(job)
+    if job.status == JobStatus.SUCCEEDED:
+        evaluation = await db.scalar(
+            select(Evaluation).where(Evaluation.answer_id == job.answer_id)
         )
-        .where(Session.id == session_obj.id)
-    )
-    result = await db.execute(stmt)
-    session_with_answers = result.scalar_one_or_none()
-    if not session_with_answers:
-        return
-
-    scores = [
-        answer.evaluation.score
-        for answer in session_with_answers.answers
-        if answer.evaluation
-    ]
-    if not scores:
-        return
-    avg_score = sum(scores) / len(scores)
-    session_obj.overall_score = round(avg_score, 2)
-    session_obj.summary_tier = tier_for_score(avg_score)
+        if evaluation:
+            job_read.evaluation = EvaluationRead.model_validate(evaluation)
+    return job_read
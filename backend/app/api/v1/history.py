@@ -1,43 +1,110 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 try:  # pragma: no cover - Python <3.9 compatibility
     from typing import Annotated
 except ImportError:  # pragma: no cover
     from typing_extensions import Annotated
 
-from fastapi import APIRouter, Query
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import selectinload
 
+from app.api.responses import model_response
 from app.db.dependencies import DbSessionDep
-from app.models.enums import RoleLevel
+from app.models.enums import RoleLevel, SessionTier
 from app.models.tables import Role, Session
 from app.schemas.session import HistoryItem
+from app.utils.datetime import as_utc_naive
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_HISTORY_ITEMS = TypeAdapter(List[HistoryItem])
+
+
+def encode_cursor(started_at: datetime, session_id: int) -> str:
+    raw = json.dumps(
+        [started_at.isoformat(), session_id], separators=(",", ":")
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, session_id = json.loads(raw)
+        return datetime.fromisoformat(started_at), int(session_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from exc
+
 
 @router.get("", response_model=List[HistoryItem], summary="List recent interview sessions")
 async def list_session_history(
     db: DbSessionDep,
+    response: Response,
     role: Annotated[Optional[str], Query(description="Filter by role slug")] = None,
-    level: Annotated[Optional[RoleLevel], Query(description="Filter by role level")] = None,
-    limit: Annotated[int, Query(ge=1, le=50, description="Maximum sessions to return")] = 25,
-) -> List[HistoryItem]:
+    level: Annotated[
+        Optional[RoleLevel], Query(description="Filter by role level")
+    ] = None,
+    tier: Annotated[
+        Optional[SessionTier], Query(description="Filter by summary tier")
+    ] = None,
+    started_after: Annotated[
+        Optional[datetime],
+        Query(description="Only sessions started at or after this time"),
+    ] = None,
+    started_before: Annotated[
+        Optional[datetime], Query(description="Only sessions started before this time")
+    ] = None,
+    cursor: Annotated[
+        Optional[str],
+        Query(
+            description=f"Opaque cursor from a previous page's {NEXT_CURSOR_HEADER} header"
+        ),
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum sessions to return")
+    ] = 25,
+) -> Response:
+    # Newest first on (started_at, id), which ix_session_started_at_id serves in index order;
+    # each page seeks past the previous one instead of counting skipped rows.
     stmt = (
         select(Session)
         .options(selectinload(Session.role))
-        .order_by(Session.started_at.desc())
-        .limit(limit)
+        .order_by(Session.started_at.desc(), Session.id.desc())
+        .limit(limit + 1)
     )
     if role:
         stmt = stmt.join(Session.role).where(Role.slug == role)
     if level:
         stmt = stmt.where(Session.level == level)
+    if tier:
+        stmt = stmt.where(Session.summary_tier == tier)
+    if started_after:
+        stmt = stmt.where(Session.started_at >= as_utc_naive(started_after))
+    if started_before:
+        stmt = stmt.where(Session.started_at < as_utc_naive(started_before))
+    if cursor:
+        cursor_started_at, cursor_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Session.started_at, Session.id)
+            < tuple_(cursor_started_at, cursor_id)
+        )
 
     result = await db.execute(stmt)
-    sessions = result.scalars().all()
-    return list(sessions)
+    sessions = list(result.scalars().all())
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        last = sessions[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.started_at, last.id)
+    items = _HISTORY_ITEMS.validate_python(sessions, from_attributes=True)
+    return model_response(items, adapter=_HISTORY_ITEMS, headers=response.headers)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import AbstractSet, List, Optional, Sequence
 
 try:  # pragma: no cover - Python <3.9 compatibility
     from typing import Annotated
@@ -9,31 +9,73 @@ except ImportError:  # pragma: no cover
 
 from fastapi import APIRouter, HTTPException, Query, status
 from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.dependencies import DbSessionDep
 from app.models.enums import QuestionCategory, RoleLevel
-from app.models.tables import Question, Role
+from app.models.tables import Answer, Question, Role, Session
 from app.schemas.question import QuestionRead
+from app.services.question_bank import LEVEL_ORDER, question_bank
+from app.services.reference_cache import reference_cache
 
 router = APIRouter()
 
-LEVEL_ORDER: Dict[RoleLevel, int] = {
-    RoleLevel.INTERNSHIP: 0,
-    RoleLevel.ENTRY: 1,
-    RoleLevel.MID: 2,
-    RoleLevel.SENIOR: 3,
-    RoleLevel.STAFF: 4,
-}
-
 
 @router.get("", response_model=List[QuestionRead], summary="Fetch interview questions")
 async def list_questions(
     session: DbSessionDep,
     role: Annotated[str, Query(description="Role slug to filter questions")],
-    category: Annotated[Optional[QuestionCategory], Query(description="Question category filter")] = None,
-    level: Annotated[Optional[RoleLevel], Query(description="Role level filter")] = None,
-    limit: Annotated[int, Query(ge=1, le=10, description="Number of questions to return")] = 1,
+    category: Annotated[
+        Optional[QuestionCategory], Query(description="Question category filter")
+    ] = None,
+    level: Annotated[
+        Optional[RoleLevel], Query(description="Role level filter")
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=10, description="Number of questions to return")
+    ] = 1,
+    session_id: Annotated[
+        Optional[int],
+        Query(description="Skip questions already answered in this interview session"),
+    ] = None,
 ) -> List[QuestionRead]:
+    answered_ids: AbstractSet[int] = frozenset()
+    if session_id is not None:
+        answered_ids = await _answered_question_ids(session, session_id)
+
+    # Reloads the catalogue, and with it the question index, when another process bumped it.
+    await reference_cache.ensure_fresh(session)
+    questions = question_bank.sample(
+        role, category=category, level=level, limit=limit, exclude_ids=answered_ids
+    )
+    if questions is None:
+        # Role missing from the in-memory index (e.g. created after startup); ask the database.
+        questions = await _query_questions(
+            session,
+            role=role,
+            category=category,
+            level=level,
+            limit=limit,
+            session_id=session_id,
+        )
+
+    if not questions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No questions available for the specified filters.",
+        )
+    return list(questions)
+
+
+async def _query_questions(
+    session: AsyncSession,
+    *,
+    role: str,
+    category: Optional[QuestionCategory],
+    level: Optional[RoleLevel],
+    limit: int,
+    session_id: Optional[int] = None,
+) -> Sequence[Question]:
     role_stmt = select(Role).where(Role.slug == role)
     role_result = await session.execute(role_stmt)
     role_obj = role_result.scalar_one_or_none()
@@ -43,6 +85,12 @@ async def list_questions(
     query = select(Question).where(Question.role_id == role_obj.id)
     if category:
         query = query.where(Question.category == category)
+    if session_id is not None:
+        query = query.where(
+            Question.id.not_in(
+                select(Answer.question_id).where(Answer.session_id == session_id)
+            )
+        )
 
     if level:
         target_rank = LEVEL_ORDER[level]
@@ -57,10 +105,21 @@ async def list_questions(
     query = query.limit(limit)
 
     questions_result = await session.execute(query)
-    questions = questions_result.scalars().all()
-    if not questions:
+    return questions_result.scalars().all()
+
+
+async def _answered_question_ids(
+    session: AsyncSession, session_id: int
+) -> AbstractSet[int]:
+    # The outer join doubles as the existence check, so this is a single round-trip.
+    rows = await session.execute(
+        select(Session.id, Answer.question_id)
+        .outerjoin(Answer, Answer.session_id == Session.id)
+        .where(Session.id == session_id)
+    )
+    rows = rows.all()
+    if not rows:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No questions available for the specified filters.",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found."
         )
-    return list(questions)
+    return frozenset(question_id for _, question_id in rows if question_id is not None)
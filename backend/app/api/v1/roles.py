@@ -1,18 +1,31 @@
 from typing import List
 
-from fastapi import APIRouter
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Request, Response
+from pydantic import TypeAdapter
 
+from app.api.http_cache import conditional_response, make_etag
+from app.api.responses import model_response
+from app.core.config import settings
 from app.db.dependencies import DbSessionDep
-from app.models.tables import Role
 from app.schemas.role import RoleRead
+from app.services.reference_cache import reference_cache
 
 router = APIRouter()
 
+_ROLE_LIST = TypeAdapter(List[RoleRead])
+
 
 @router.get("", response_model=List[RoleRead], summary="List roles")
-async def list_roles(session: DbSessionDep) -> List[RoleRead]:
-    result = await session.execute(select(Role).order_by(Role.name))
-    roles = result.scalars().all()
-    return list(roles)
+async def list_roles(
+    session: DbSessionDep, request: Request, response: Response
+) -> Response:
+    roles = await reference_cache.roles(session)
+    not_modified = conditional_response(
+        request,
+        response,
+        make_etag("roles", reference_cache.roles_digest()),
+        f"public, max-age={settings.roles_cache_max_age_sec}",
+    )
+    return not_modified or model_response(
+        roles, adapter=_ROLE_LIST, headers=response.headers
+    )
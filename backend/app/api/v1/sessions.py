@@ -1,47 +1,66 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-
 try:  # pragma: no cover - Python <3.9 compatibility
     from typing import Annotated
 except ImportError:  # pragma: no cover
     from typing_extensions import Annotated
 
-from fastapi import APIRouter, HTTPException, Path, status
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response, status
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.http_cache import conditional_response, make_etag
+from app.api.responses import model_response
 from app.db.dependencies import DbSessionDep
-from app.models.tables import Answer, Question, Role, Session
-from app.schemas.session import AnswerCreate, AnswerRead, SessionCreate, SessionDetail, SessionRead
+from app.models.tables import Answer, Session
+from app.schemas.question import QuestionRead
+from app.schemas.session import (
+    AnswerBulkCreate,
+    AnswerBulkResponse,
+    AnswerCreate,
+    AnswerRead,
+    SessionCreate,
+    SessionDetail,
+    SessionDetailField,
+    SessionRead,
+)
+from app.services.jobs import enqueue_new_evaluations, evaluation_workers
+from app.services.reference_cache import reference_cache
+from app.services.session_detail import (
+    detail_dump_exclude,
+    load_session_detail,
+    load_session_header,
+)
+from app.utils.datetime import as_utc_naive
 
 router = APIRouter()
 
 
-def _as_utc_naive(dt: datetime) -> datetime:
-    if dt.tzinfo is None:
-        return dt
-    return dt.astimezone(timezone.utc).replace(tzinfo=None)
-
-
 @router.post("", response_model=SessionRead, status_code=status.HTTP_201_CREATED)
 async def create_session(
     payload: SessionCreate,
     db: DbSessionDep,
-) -> SessionRead:
-    role_stmt = select(Role).where(Role.slug == payload.role_slug)
-    role_result = await db.execute(role_stmt)
-    role = role_result.scalar_one_or_none()
+) -> Response:
+    role = await reference_cache.role_by_slug(db, payload.role_slug)
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found.")
 
     new_session = Session(role_id=role.id, level=payload.level)
     db.add(new_session)
-    await db.flush()
-    await db.refresh(new_session, attribute_names=["role"])
     await db.commit()
-    return new_session
+    session_read = SessionRead(
+        id=new_session.id,
+        role=role,
+        level=new_session.level,
+        started_at=new_session.started_at,
+        ended_at=new_session.ended_at,
+        overall_score=new_session.overall_score,
+        summary_tier=new_session.summary_tier,
+    )
+    return model_response(session_read, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
@@ -54,20 +73,13 @@ async def submit_answer(
     payload: AnswerCreate,
     db: DbSessionDep,
     session_id: Annotated[int, Path(description="Session identifier")],
-) -> AnswerRead:
-    session_stmt = (
-        select(Session)
-        .options(selectinload(Session.role))
-        .where(Session.id == session_id)
-    )
-    session_result = await db.execute(session_stmt)
-    session_obj = session_result.scalar_one_or_none()
+) -> Response:
+    session_obj = await db.get(Session, session_id)
     if not session_obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found.")
+    session_obj.revision = Session.revision + 1
 
-    question_stmt = select(Question).where(Question.id == payload.question_id)
-    question_result = await db.execute(question_stmt)
-    question = question_result.scalar_one_or_none()
+    question = await reference_cache.question(db, payload.question_id)
     if not question:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found.")
     if question.role_id != session_obj.role_id:
@@ -78,36 +90,137 @@ async def submit_answer(
     # Allow minor level mismatches when the question fallback logic returns the closest difficulty.
     # The question record still captures its own level for analytics.
 
-    started_at = _as_utc_naive(payload.started_at)
-    ended_at = _as_utc_naive(payload.ended_at)
-    duration_ms = int((ended_at - started_at).total_seconds() * 1000)
-    if duration_ms <= 0:
+    answer = _new_answer(session_id, payload)
+    if answer.duration_ms <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Answer duration must be positive.",
         )
+    db.add(answer)
+    _extend_session_end(session_obj, answer.ended_at)
+
+    await db.commit()
+    return model_response(
+        _answer_read(answer, question), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/{session_id}/answers/bulk",
+    response_model=AnswerBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Submit all answers of a session at once",
+)
+async def submit_answers_bulk(
+    payload: AnswerBulkCreate,
+    db: DbSessionDep,
+    session_id: Annotated[int, Path(description="Session identifier")],
+) -> Response:
+    """Store a batch of answers atomically: either every answer is valid and saved, or none is."""
+    session_obj = await db.get(Session, session_id)
+    if not session_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found."
+        )
+
+    questions = await reference_cache.questions(
+        db, [item.question_id for item in payload.answers]
+    )
+    unknown = sorted({item.question_id for item in payload.answers} - questions.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Questions not found: {unknown}.",
+        )
+
+    rows: List[Dict[str, Any]] = []
+    for index, item in enumerate(payload.answers):
+        if questions[item.question_id].role_id != session_obj.role_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"answers[{index}]: Question does not belong to the session role.",
+            )
+        answer = _new_answer(session_id, item)
+        if answer.duration_ms <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"answers[{index}]: Answer duration must be positive.",
+            )
+        rows.append(_answer_row(answer))
 
-    answer = Answer(
+    # One executemany INSERT; rows come back in request order (a multi-row statement where the
+    # database can guarantee that order for RETURNING, one statement per row otherwise).
+    answers = list(
+        await db.scalars(
+            insert(Answer).returning(Answer, sort_by_parameter_order=True), rows
+        )
+    )
+    _extend_session_end(session_obj, max(answer.ended_at for answer in answers))
+    session_obj.revision = Session.revision + 1
+    job_ids: List[int] = []
+    if payload.evaluate:
+        job_ids = await enqueue_new_evaluations(db, [answer.id for answer in answers])
+    await db.commit()
+    if job_ids:
+        evaluation_workers.notify()
+
+    result = AnswerBulkResponse(
+        answers=[
+            _answer_read(answer, questions[answer.question_id]) for answer in answers
+        ],
+        evaluation_job_ids=job_ids,
+    )
+    return model_response(result, status_code=status.HTTP_201_CREATED)
+
+
+def _new_answer(session_id: int, payload: AnswerCreate) -> Answer:
+    started_at = as_utc_naive(payload.started_at)
+    ended_at = as_utc_naive(payload.ended_at)
+    return Answer(
         session_id=session_id,
         question_id=payload.question_id,
         answer_text=payload.answer_text,
         started_at=started_at,
         ended_at=ended_at,
-        duration_ms=duration_ms,
+        duration_ms=int((ended_at - started_at).total_seconds() * 1000),
         transcript_text=payload.transcript_text,
     )
-    db.add(answer)
 
+
+_ANSWER_INSERT_COLUMNS = (
+    "session_id",
+    "question_id",
+    "answer_text",
+    "started_at",
+    "ended_at",
+    "duration_ms",
+    "transcript_text",
+)
+
+
+def _answer_row(answer: Answer) -> Dict[str, Any]:
+    return {column: getattr(answer, column) for column in _ANSWER_INSERT_COLUMNS}
+
+
+def _extend_session_end(session_obj: Session, ended_at: datetime) -> None:
     session_ended_at = session_obj.ended_at
     if session_ended_at and session_ended_at.tzinfo is not None:
-        session_ended_at = _as_utc_naive(session_ended_at)
+        session_ended_at = as_utc_naive(session_ended_at)
     if not session_ended_at or ended_at > session_ended_at:
         session_obj.ended_at = ended_at
 
-    await db.flush()
-    await db.refresh(answer, attribute_names=["question", "evaluation"])
-    await db.commit()
-    return answer
+
+def _answer_read(answer: Answer, question: QuestionRead) -> AnswerRead:
+    # A fresh answer has no evaluation yet; the question comes from the reference cache.
+    return AnswerRead(
+        id=answer.id,
+        question=question,
+        answer_text=answer.answer_text,
+        started_at=answer.started_at,
+        ended_at=answer.ended_at,
+        duration_ms=answer.duration_ms,
+        transcript_text=answer.transcript_text,
+    )
 
 
 @router.get(
@@ -118,20 +231,32 @@ async def submit_answer(
 async def get_session_detail(
     session_id: Annotated[int, Path(description="Session identifier")],
     db: DbSessionDep,
-) -> SessionDetail:
-    stmt = (
-        select(Session)
-        .where(Session.id == session_id)
-        .options(
-            selectinload(Session.role),
-            selectinload(Session.answers)
-            .selectinload(Answer.question),
-            selectinload(Session.answers)
-            .selectinload(Answer.evaluation),
-        )
-    )
-    result = await db.execute(stmt)
-    session_obj = result.scalar_one_or_none()
-    if not session_obj:
+    request: Request,
+    response: Response,
+    exclude: Annotated[
+        List[SessionDetailField],
+        Query(description="Heavy answer fields to leave out of the response"),
+    ] = [],
+) -> Response:
+    # The header row carries the revision, so a matching If-None-Match skips loading the answers.
+    header = await load_session_header(db, session_id)
+    if header is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found.")
-    return session_obj
+    await reference_cache.ensure_fresh(db)
+    omitted = frozenset(exclude)
+    etag = make_etag(
+        "session",
+        session_id,
+        header.revision,
+        reference_cache.version,
+        *sorted(omitted),
+    )
+    # Answers and evaluations keep changing until the session is reviewed, so always revalidate.
+    not_modified = conditional_response(request, response, etag, "no-cache")
+    if not_modified is not None:
+        return not_modified
+
+    detail = await load_session_detail(db, header, exclude=omitted)
+    return model_response(
+        detail, headers=response.headers, exclude=detail_dump_exclude(omitted)
+    )
@@ -12,8 +12,67 @@ class Settings(BaseSettings):
     app_env: str = "development"
     database_url: str = "sqlite+aiosqlite:///./app.db"
     openai_api_key: Optional[str] = None
+    # Point the evaluator at any OpenAI-compatible endpoint, e.g. the bundled benchmarks.openai_stub.
+    openai_base_url: Optional[str] = None
     cors_origins: Union[List[AnyHttpUrl], List[str]] = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
+    # Pool sizing applies to pooled (file or server) databases; in-memory SQLite uses one shared connection.
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_sec: float = 30.0
+    db_pool_recycle_sec: int = 1800
+    db_pool_pre_ping: bool = True
+    # PRAGMAs applied to every new SQLite connection. WAL lets readers proceed during a write and
+    # busy_timeout makes a second writer wait for the lock instead of failing with "database is locked".
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_mb: int = 256
+
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry_sec: float = 30.0
+    llm_connect_timeout_sec: float = 5.0
+    llm_pool_timeout_sec: float = 10.0
+    llm_max_concurrency: int = 8
+    llm_request_timeout_sec: float = 20.0
+    llm_deadline_sec: float = 45.0
+    llm_retry_max_attempts: int = 3
+    llm_retry_base_delay_sec: float = 0.5
+    llm_retry_max_delay_sec: float = 4.0
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_window_sec: float = 30.0
+    llm_breaker_cooldown_sec: float = 30.0
+
+    # How often a worker checks app_metadata for a newer role/question catalogue.
+    reference_cache_check_interval_sec: float = 5.0
+    # Freshness lifetime browsers and CDNs may serve GET /roles without revalidating.
+    roles_cache_max_age_sec: int = 300
+
+    code_analysis_workers: int = 2
+    code_analysis_timeout_sec: float = 5.0
+    code_analysis_max_chars: int = 50_000
+
+    # Runs submitted code. Off by default: it needs Linux and root, so that each run can be
+    # dropped to ``sandbox_uid``/``sandbox_gid`` in a fresh network namespace under seccomp.
+    sandbox_enabled: bool = False
+    sandbox_uid: int = 65534
+    sandbox_gid: int = 65534
+    sandbox_workers: int = 2
+    sandbox_cpu_sec: int = 2
+    sandbox_memory_mb: int = 256
+    sandbox_wall_sec: float = 5.0
+    sandbox_cache_entries: int = 1024
+
+    evaluation_cache_max_entries: int = 2048
+    evaluation_cache_ttl_sec: float = 3600.0
+    evaluation_cache_persist: bool = True
+
+    evaluation_workers: int = 2
+    evaluation_job_poll_interval_sec: float = 1.0
+    evaluation_job_lease_sec: float = 300.0
+    evaluation_job_max_attempts: int = 3
+
     @field_validator("cors_origins", mode="before")
     @classmethod
     def assemble_cors_origins(cls, value):  # type: ignore[override]
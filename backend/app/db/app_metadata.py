@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import upsert_statement
+from app.models.tables import AppMetadata
+from app.utils.datetime import utcnow_naive
+
+
+async def get_metadata(db: AsyncSession, key: str) -> Optional[str]:
+    return await db.scalar(select(AppMetadata.value).where(AppMetadata.key == key))
+
+
+async def set_metadata(db: AsyncSession, key: str, value: str) -> None:
+    """Write ``key`` in the caller's transaction."""
+    row = {"key": key, "value": value, "updated_at": utcnow_naive()}
+    stmt = upsert_statement(
+        db,
+        AppMetadata,
+        [row],
+        conflict_columns=["key"],
+        update_columns=["value", "updated_at"],
+    )
+    if stmt is not None:
+        await db.execute(stmt)
+    else:
+        await db.merge(AppMetadata(**row))
@@ -0,0 +1,353 @@
+"""Stream a question bank from JSON Lines or CSV into the database.
+
+    python -m app.db.import_questions bank.jsonl [--format jsonl|csv] [--batch-size 1000]
+        [--rejects rejects.jsonl] [--create-roles] [--update-existing] [--dry-run]
+
+Records are read one at a time and validated against ``QuestionImport``; valid ones are
+written in batches of ``--batch-size``, one transaction each, so memory stays flat however
+large the file is. Invalid rows are appended to ``--rejects`` (with line number and reasons)
+and the run carries on. A batch the database refuses (a constraint violation, say) is rolled
+back and retried one row per transaction, so only the offending rows are rejected. Questions
+already present for the role (same text) are skipped unless ``--update-existing`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.init_db import ROLE_DETAILS
+from app.db.session import create_engine_and_sessionmaker
+from app.db.upsert import upsert_statement
+from app.models.tables import Question, Role
+from app.schemas.question import QuestionImport
+from app.services.reference_cache import reference_cache
+
+logger = structlog.get_logger(__name__)
+
+FORMATS = ("jsonl", "csv")
+_UPDATE_COLUMNS = (
+    "category",
+    "level",
+    "difficulty",
+    "expected_duration_sec",
+    "requires_code",
+    "keywords",
+    "test_cases",
+)
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    rejected: int = 0
+
+
+@dataclass(frozen=True)
+class _PendingRow:
+    line_number: int
+    record: Any
+    question: QuestionImport
+
+
+def detect_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "jsonl"
+
+
+def iter_records(handle: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line_number, record)``; a record that cannot be decoded is yielded as the exception."""
+    if fmt == "csv":
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, exc
+
+
+class QuestionImporter:
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        batch_size: int = 1000,
+        rejects: Optional[TextIO] = None,
+        create_roles: bool = False,
+        update_existing: bool = False,
+        dry_run: bool = False,
+    ) -> None:
+        self._db = db
+        self._batch_size = batch_size
+        self._rejects = rejects
+        self._create_roles = create_roles
+        self._update_existing = update_existing
+        self._dry_run = dry_run
+        self._role_ids: Dict[str, int] = {}
+        self.stats = ImportStats()
+
+    async def run(self, records: Iterator[Tuple[int, Any]]) -> ImportStats:
+        self._role_ids = dict(
+            (await self._db.execute(select(Role.slug, Role.id))).tuples().all()
+        )
+        started = time.perf_counter()
+        batch: Dict[Tuple[str, str], _PendingRow] = {}
+        for line_number, record in records:
+            self.stats.read += 1
+            question = self._validate(line_number, record)
+            if question is not None:
+                # Later rows win over earlier ones with the same role and text.
+                batch.pop((question.role_slug, question.text), None)
+                batch[(question.role_slug, question.text)] = _PendingRow(
+                    line_number, record, question
+                )
+            if len(batch) >= self._batch_size:
+                await self._flush(list(batch.values()))
+                batch.clear()
+                self._log_progress(started)
+        if batch:
+            await self._flush(list(batch.values()))
+        self._log_progress(started)
+        if not self._dry_run and (self.stats.inserted or self.stats.updated):
+            await reference_cache.bump_version(self._db)
+            await self._db.commit()
+            reference_cache.invalidate()
+        return self.stats
+
+    def _validate(self, line_number: int, record: Any) -> Optional[QuestionImport]:
+        if isinstance(record, Exception):
+            self._reject(line_number, None, [f"invalid JSON: {record}"])
+            return None
+        if not isinstance(record, dict):
+            self._reject(line_number, record, ["expected an object"])
+            return None
+        try:
+            question = QuestionImport.model_validate(record)
+        except ValidationError as exc:
+            errors = [
+                f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}"
+                for error in exc.errors()
+            ]
+            self._reject(line_number, record, errors)
+            return None
+        if question.role_slug not in self._role_ids and not self._create_roles:
+            self._reject(
+                line_number, record, [f"role_slug: unknown role '{question.role_slug}'"]
+            )
+            return None
+        return question
+
+    def _reject(self, line_number: int, record: Any, errors: List[str]) -> None:
+        self.stats.rejected += 1
+        if self._rejects is not None:
+            entry = {"line": line_number, "errors": errors, "record": record}
+            self._rejects.write(
+                json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+            )
+
+    async def _flush(self, batch: List[_PendingRow]) -> None:
+        try:
+            await self._write(batch)
+        except SQLAlchemyError as exc:
+            logger.warning(
+                "import_batch_failed", rows=len(batch), error=_error_text(exc)
+            )
+            for row in batch:
+                try:
+                    await self._write([row])
+                except SQLAlchemyError as row_exc:
+                    self._reject(
+                        row.line_number,
+                        row.record,
+                        [f"database: {_error_text(row_exc)}"],
+                    )
+
+    async def _write(self, batch: List[_PendingRow]) -> None:
+        """Write ``batch`` in one transaction; a database error rolls it back and propagates."""
+        role_ids = dict(self._role_ids)
+        try:
+            inserted, updated, skipped = await self._upsert(
+                [row.question for row in batch]
+            )
+            if self._dry_run:
+                await self._db.rollback()
+                # Roles created by a dry run were rolled back with everything else.
+                self._role_ids = role_ids
+            else:
+                await self._db.commit()
+        except SQLAlchemyError:
+            await self._db.rollback()
+            self._role_ids = role_ids
+            raise
+        self.stats.inserted += inserted
+        self.stats.updated += updated
+        self.stats.skipped += skipped
+
+    async def _upsert(self, questions: List[QuestionImport]) -> Tuple[int, int, int]:
+        """Insert (or update) ``questions`` without committing; returns inserted, updated, skipped."""
+        await self._ensure_roles({question.role_slug for question in questions})
+        rows = [
+            {
+                "role_id": self._role_ids[question.role_slug],
+                **question.model_dump(exclude={"role_slug"}),
+            }
+            for question in questions
+        ]
+        existing = await self._existing_keys(rows)
+        new_rows = [
+            row for row in rows if (row["role_id"], row["text"]) not in existing
+        ]
+        changed = (
+            [row for row in rows if (row["role_id"], row["text"]) in existing]
+            if self._update_existing
+            else []
+        )
+
+        if new_rows or changed:
+            stmt = upsert_statement(
+                self._db,
+                Question,
+                new_rows + changed,
+                conflict_columns=["role_id", "text"],
+                update_columns=_UPDATE_COLUMNS if self._update_existing else None,
+            )
+            if stmt is not None:
+                await self._db.execute(stmt)
+            else:
+                if new_rows:
+                    await self._db.execute(insert(Question), new_rows)
+                for row in changed:
+                    await self._db.execute(
+                        Question.__table__.update()
+                        .where(
+                            Question.role_id == row["role_id"],
+                            Question.text == row["text"],
+                        )
+                        .values({column: row[column] for column in _UPDATE_COLUMNS})
+                    )
+        return len(new_rows), len(changed), len(rows) - len(new_rows) - len(changed)
+
+    async def _ensure_roles(self, slugs: set) -> None:
+        missing = sorted(slug for slug in slugs if slug not in self._role_ids)
+        if not missing:
+            return
+        rows = []
+        for slug in missing:
+            details = ROLE_DETAILS.get(
+                slug, {"name": slug.replace("-", " ").title(), "description": None}
+            )
+            rows.append(
+                {
+                    "slug": slug,
+                    "name": details["name"],
+                    "description": details["description"],
+                }
+            )
+        stmt = upsert_statement(self._db, Role, rows, conflict_columns=["slug"])
+        await self._db.execute(stmt if stmt is not None else insert(Role).values(rows))
+        created = select(Role.slug, Role.id).where(Role.slug.in_(missing))
+        self._role_ids.update((await self._db.execute(created)).tuples().all())
+        logger.info("import_roles_created", roles=missing)
+
+    async def _existing_keys(self, rows: List[Dict[str, Any]]) -> set:
+        keys = [(row["role_id"], row["text"]) for row in rows]
+        result = await self._db.execute(
+            select(Question.role_id, Question.text).where(
+                tuple_(Question.role_id, Question.text).in_(keys)
+            )
+        )
+        return set(result.tuples().all())
+
+    def _log_progress(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "import_progress",
+            rate_per_sec=round(self.stats.read / elapsed, 1) if elapsed else None,
+            dry_run=self._dry_run,
+            **asdict(self.stats),
+        )
+
+
+def _error_text(exc: SQLAlchemyError) -> str:
+    # The driver's message without SQLAlchemy's statement and parameter dump.
+    return str(getattr(exc, "orig", None) or exc).splitlines()[0]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", type=Path, help="JSON Lines or CSV file")
+    parser.add_argument(
+        "--format", choices=FORMATS, help="Defaults to csv for *.csv, jsonl otherwise"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Questions per transaction"
+    )
+    parser.add_argument(
+        "--rejects", type=Path, help="Write rejected rows here as JSON Lines"
+    )
+    parser.add_argument(
+        "--create-roles", action="store_true", help="Create roles that do not exist yet"
+    )
+    parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="Overwrite questions already present",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate and report without writing anything",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    fmt = args.format or detect_format(args.path)
+    engine, session_factory = create_engine_and_sessionmaker(settings.database_url)
+    rejects = args.rejects.open("w", encoding="utf-8") if args.rejects else None
+    try:
+        # newline="" lets the csv module handle line breaks inside quoted fields.
+        with args.path.open(encoding="utf-8-sig", newline="") as handle:
+            async with session_factory() as db:
+                importer = QuestionImporter(
+                    db,
+                    batch_size=args.batch_size,
+                    rejects=rejects,
+                    create_roles=args.create_roles,
+                    update_existing=args.update_existing,
+                    dry_run=args.dry_run,
+                )
+                stats = await importer.run(iter_records(handle, fmt))
+        logger.info("import_finished", dry_run=args.dry_run, **asdict(stats))
+    finally:
+        if rejects is not None:
+            rejects.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
-from sqlalchemy import select, update
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.db.app_metadata import get_metadata, set_metadata
 from app.db.base import Base
+from app.db.session import create_engine_and_sessionmaker
+from app.db.upsert import upsert_statement
 from app.models.enums import QuestionCategory, RoleLevel
 from app.models.tables import Answer, Question, Role
+from app.services.reference_cache import reference_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -37,70 +44,215 @@ ROLE_DETAILS = {
 }
 
 
-async def load_seed_data(session: AsyncSession, seed_path: Path) -> None:
-    if not seed_path.exists():
-        raise FileNotFoundError(f"Seed file not found at {seed_path}")
+SEED_HASH_KEY = "seed_hash"
+# Part of the fingerprint: bump when the loader starts applying new fields, so databases
+# seeded by an older loader are refreshed even though the file bytes did not change.
+SEED_LOADER_VERSION = "2"
+_QUESTION_FIELDS = (
+    "category",
+    "level",
+    "difficulty",
+    "expected_duration_sec",
+    "requires_code",
+    "keywords",
+    "test_cases",
+)
+_INSERT_BATCH = 500
+
+
+@dataclass
+class SeedStats:
+    roles_created: int = 0
+    questions_created: int = 0
+    questions_updated: int = 0
+    questions_merged: int = 0
+
+
+def seed_fingerprint(raw: bytes) -> str:
+    return hashlib.sha256(SEED_LOADER_VERSION.encode() + b"\0" + raw).hexdigest()
+
+
+def _question_values(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "category": QuestionCategory(entry["category"]),
+        "level": RoleLevel(entry.get("level", "entry")),
+        "difficulty": entry["difficulty"],
+        "expected_duration_sec": entry.get("expected_duration_sec"),
+        "requires_code": bool(entry.get("requires_code", False)),
+        "keywords": entry.get("keywords", []),
+        "test_cases": entry.get("test_cases"),
+    }
+
+
+async def _sync_roles(
+    session: AsyncSession, payload: List[Dict[str, Any]], stats: SeedStats
+) -> Dict[str, int]:
+    role_ids: Dict[str, int] = dict(
+        (await session.execute(select(Role.slug, Role.id))).tuples().all()
+    )
+    missing = []
+    for role_slug in dict.fromkeys(entry["role_slug"] for entry in payload):
+        if role_slug in role_ids:
+            continue
+        details = ROLE_DETAILS.get(
+            role_slug,
+            {"name": role_slug.replace("-", " ").title(), "description": None},
+        )
+        missing.append(
+            {
+                "slug": role_slug,
+                "name": details["name"],
+                "description": details["description"],
+            }
+        )
+    if not missing:
+        return role_ids
+
+    stmt = upsert_statement(session, Role, missing, conflict_columns=["slug"])
+    if stmt is not None:
+        await session.execute(stmt)
+    else:
+        session.add_all(Role(**row) for row in missing)
+        await session.flush()
+    created = select(Role.slug, Role.id).where(
+        Role.slug.in_([row["slug"] for row in missing])
+    )
+    role_ids.update((await session.execute(created)).tuples().all())
+    stats.roles_created += len(missing)
+    return role_ids
+
 
-    payload = json.loads(seed_path.read_text(encoding="utf-8"))
+async def _sync_questions(
+    session: AsyncSession,
+    payload: List[Dict[str, Any]],
+    role_ids: Dict[str, int],
+    stats: SeedStats,
+) -> None:
+    columns = [
+        Question.id,
+        Question.role_id,
+        Question.text,
+        *(getattr(Question, name) for name in _QUESTION_FIELDS),
+    ]
+    rows = await session.execute(select(*columns).order_by(Question.id))
+    existing: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for row in rows:
+        existing[(row.role_id, row.text)] = dict(row._mapping)
+
+    inserts: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    updates: Dict[int, Dict[str, Any]] = {}
+    merges: Dict[int, List[int]] = {}
     for entry in payload:
-        role_slug = entry["role_slug"]
-        details = ROLE_DETAILS.get(role_slug, {"name": role_slug.replace("-", " ").title(), "description": None})
-
-        role = await session.scalar(select(Role).where(Role.slug == role_slug))
-        if not role:
-            role = Role(slug=role_slug, name=details["name"], description=details["description"])
-            session.add(role)
-            await session.flush()
-
-        text_variants = [entry["text"], *entry.get("legacy_texts", [])]
-        question_stmt = select(Question).where(
-            Question.role_id == role.id,
-            Question.text.in_(text_variants),
+        role_id = role_ids[entry["role_slug"]]
+        text = entry["text"]
+        values = _question_values(entry)
+        variants = [text, *entry.get("legacy_texts", [])]
+
+        pending = next(
+            (
+                key
+                for key in ((role_id, variant) for variant in variants)
+                if key in inserts
+            ),
+            None,
+        )
+        if pending is not None:
+            # A later entry matching a question this run is about to insert: last one wins.
+            row = inserts.pop(pending)
+            inserts[(role_id, text)] = {**row, "text": text, **values}
+            continue
+
+        matches = sorted(
+            (
+                existing[(role_id, variant)]
+                for variant in dict.fromkeys(variants)
+                if (role_id, variant) in existing
+            ),
+            key=lambda row: row["id"],
         )
-        questions_result = await session.execute(question_stmt)
-        matching_questions = questions_result.scalars().all()
-
-        if matching_questions:
-            primary = next((question for question in matching_questions if question.text == entry["text"]), matching_questions[0])
-            extras = [question for question in matching_questions if question is not primary]
-
-            for extra in extras:
-                await session.execute(
-                    update(Answer)
-                    .where(Answer.question_id == extra.id)
-                    .values(question_id=primary.id)
-                )
-                await session.delete(extra)
-
-            if primary.text != entry["text"]:
-                primary.text = entry["text"]
-            primary.category = QuestionCategory(entry["category"])
-            primary.level = RoleLevel(entry.get("level", "entry"))
-            primary.difficulty = entry["difficulty"]
-            primary.expected_duration_sec = entry.get("expected_duration_sec")
-            primary.requires_code = bool(entry.get("requires_code", False))
-            primary.keywords = entry.get("keywords", [])
+        if not matches:
+            inserts[(role_id, text)] = {"role_id": role_id, "text": text, **values}
             continue
 
-        question = Question(
-            role_id=role.id,
-            text=entry["text"],
-            category=QuestionCategory(entry["category"]),
-            level=RoleLevel(entry.get("level", "entry")),
-            difficulty=entry["difficulty"],
-            expected_duration_sec=entry.get("expected_duration_sec"),
-            requires_code=bool(entry.get("requires_code", False)),
-            keywords=entry.get("keywords", []),
+        primary = next((row for row in matches if row["text"] == text), matches[0])
+        for extra in matches:
+            if extra is not primary:
+                merges.setdefault(primary["id"], []).append(extra["id"])
+                del existing[(role_id, extra["text"])]
+        wanted = {"text": text, **values}
+        if (
+            any(primary[name] != value for name, value in wanted.items())
+            or primary["id"] in merges
+        ):
+            del existing[(role_id, primary["text"])]
+            primary.update(wanted)
+            existing[(role_id, text)] = primary
+            updates[primary["id"]] = {"id": primary["id"], **wanted}
+
+    # Fold duplicates into their primary question before any text is rewritten.
+    for primary_id, extra_ids in merges.items():
+        await session.execute(
+            update(Answer)
+            .where(Answer.question_id.in_(extra_ids))
+            .values(question_id=primary_id)
         )
-        session.add(question)
+        stats.questions_merged += len(extra_ids)
+    if merges:
+        extra_ids = [extra_id for ids in merges.values() for extra_id in ids]
+        await session.execute(delete(Question).where(Question.id.in_(extra_ids)))
+
+    if updates:
+        await session.execute(update(Question), list(updates.values()))
+        stats.questions_updated += len(updates)
+
+    rows_to_insert = list(inserts.values())
+    for start in range(0, len(rows_to_insert), _INSERT_BATCH):
+        batch = rows_to_insert[start : start + _INSERT_BATCH]
+        stmt = upsert_statement(
+            session,
+            Question,
+            batch,
+            conflict_columns=["role_id", "text"],
+            update_columns=_QUESTION_FIELDS,
+        )
+        if stmt is not None:
+            await session.execute(stmt)
+        else:
+            await session.execute(insert(Question), batch)
+    stats.questions_created += len(rows_to_insert)
+
+
+async def load_seed_data(
+    session: AsyncSession, seed_path: Path, *, force: bool = False
+) -> Optional[SeedStats]:
+    """Apply the seed file with a handful of set-based statements; ``None`` if it was already applied.
+
+    Roles and questions are prefetched in two queries and diffed in memory. A fingerprint of
+    the file is stored in ``app_metadata``, so re-running with an unchanged file costs one query.
+    """
+    if not seed_path.exists():
+        raise FileNotFoundError(f"Seed file not found at {seed_path}")
+
+    raw = seed_path.read_bytes()
+    fingerprint = seed_fingerprint(raw)
+    if not force and await get_metadata(session, SEED_HASH_KEY) == fingerprint:
+        logger.info("seed_data_unchanged")
+        return None
 
+    payload = json.loads(raw)
+    stats = SeedStats()
+    role_ids = await _sync_roles(session, payload, stats)
+    await _sync_questions(session, payload, role_ids, stats)
+    await set_metadata(session, SEED_HASH_KEY, fingerprint)
+    await reference_cache.bump_version(session)
     await session.commit()
-    logger.info("seed_data_loaded")
+    reference_cache.invalidate()
+    logger.info("seed_data_loaded", **asdict(stats))
+    return stats
 
 
 async def main() -> None:
-    engine = create_async_engine(settings.database_url, echo=False)
-    async_session = async_sessionmaker(engine, expire_on_commit=False)
+    engine, async_session = create_engine_and_sessionmaker(settings.database_url)
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
     seed_path = Path(__file__).resolve().parent.parent / "seeds" / "seed_roles_and_questions.json"
@@ -0,0 +1,233 @@
+"""Re-score stored answers with the current offline heuristics.
+
+    python -m app.db.rescore [--chunk-size 2000] [--dry-run] [--include-unknown | --all]
+
+Answers are read in keyset chunks (by id) so memory stays bounded however large the table is.
+Each chunk is scored, bulk-upserted into ``evaluation`` and its sessions' rollups rebuilt with
+SQL aggregates, then committed. By default only answers without an evaluation or whose
+evaluation came from the heuristics themselves are touched; model-graded rows are kept.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import create_engine_and_sessionmaker
+from app.db.upsert import upsert_statement
+from app.models.tables import Answer, Evaluation
+from app.services.evaluation import EvaluationPayload
+from app.services.llm import llm_service
+from app.services.sandbox import code_sandbox
+from app.services.scoring import (
+    AnswerContext,
+    answer_context_query,
+    context_from_row,
+    recompute_session_rollups,
+    store_evaluations,
+    stored_source,
+)
+
+logger = structlog.get_logger(__name__)
+
+HEURISTIC_SOURCES = ("offline", "code")
+_EVALUATION_COLUMNS = (
+    "score",
+    "rubric",
+    "feedback_markdown",
+    "suggested_improvements",
+    "source",
+)
+
+
+@dataclass
+class RescoreStats:
+    scanned: int = 0
+    rescored: int = 0
+    changed: int = 0
+    abs_delta_total: float = 0.0
+
+    def as_dict(self) -> dict:
+        mean_delta = self.abs_delta_total / self.changed if self.changed else 0.0
+        return {
+            "scanned": self.scanned,
+            "rescored": self.rescored,
+            "changed": self.changed,
+            "mean_abs_delta": round(mean_delta, 3),
+        }
+
+
+def _chunk_query(
+    after_id: int, limit: int, *, include_unknown: bool, rescore_all: bool
+):
+    stmt = (
+        answer_context_query()
+        .add_columns(Evaluation.score)
+        .outerjoin(Evaluation, Evaluation.answer_id == Answer.id)
+        .where(Answer.id > after_id)
+        .order_by(Answer.id)
+        .limit(limit)
+    )
+    if not rescore_all:
+        scope = [Evaluation.id.is_(None), Evaluation.source.in_(HEURISTIC_SOURCES)]
+        if include_unknown:
+            scope.append(Evaluation.source.is_(None))
+        stmt = stmt.where(or_(*scope))
+    return stmt
+
+
+async def _score(context: AnswerContext) -> EvaluationPayload:
+    metrics = execution = None
+    if context.requires_code:
+        metrics = llm_service.analyze_code_inline(context.answer_text)
+        execution = await code_sandbox.run_answer(metrics, context.test_cases)
+    return llm_service.heuristic_evaluation(
+        answer_text=context.answer_text,
+        question_text=context.question_text,
+        category=context.category,
+        requires_code=context.requires_code,
+        question_keywords=context.keywords,
+        metrics=metrics,
+        execution=execution,
+    )
+
+
+async def _write_chunk(
+    db: AsyncSession, results: Sequence[Tuple[AnswerContext, EvaluationPayload]]
+) -> None:
+    rows = [
+        {
+            "answer_id": context.answer_id,
+            "score": payload.score,
+            "rubric": payload.rubric,
+            "feedback_markdown": payload.feedback_markdown,
+            "suggested_improvements": payload.suggested_improvements,
+            "source": stored_source(payload),
+        }
+        for context, payload in results
+    ]
+    stmt = upsert_statement(
+        db,
+        Evaluation,
+        rows,
+        conflict_columns=["answer_id"],
+        update_columns=_EVALUATION_COLUMNS,
+    )
+    if stmt is None:
+        # No native upsert on this dialect: fall back to the ORM path, which maintains rollups itself.
+        await store_evaluations(db, results)
+        return
+    await db.execute(stmt)
+    await recompute_session_rollups(db, {context.session_id for context, _ in results})
+
+
+async def rescore(
+    db: AsyncSession,
+    *,
+    chunk_size: int = 2000,
+    dry_run: bool = False,
+    include_unknown: bool = False,
+    rescore_all: bool = False,
+) -> RescoreStats:
+    stats = RescoreStats()
+    after_id = 0
+    started = time.perf_counter()
+    while True:
+        rows = (
+            await db.execute(
+                _chunk_query(
+                    after_id,
+                    chunk_size,
+                    include_unknown=include_unknown,
+                    rescore_all=rescore_all,
+                )
+            )
+        ).all()
+        if not rows:
+            break
+        after_id = rows[-1][0]
+
+        results: List[Tuple[AnswerContext, EvaluationPayload]] = []
+        for row in rows:
+            context = context_from_row(row)
+            payload = await _score(context)
+            previous_score: Optional[float] = row[-1]
+            if previous_score is None or abs(previous_score - payload.score) > 1e-9:
+                stats.changed += 1
+                stats.abs_delta_total += abs(payload.score - (previous_score or 0.0))
+            results.append((context, payload))
+        stats.scanned += len(rows)
+
+        if not dry_run:
+            await _write_chunk(db, results)
+            await db.commit()
+            stats.rescored += len(results)
+        else:
+            await db.rollback()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "rescore_progress",
+            last_answer_id=after_id,
+            scanned=stats.scanned,
+            rate_per_sec=round(stats.scanned / elapsed, 1) if elapsed else None,
+            dry_run=dry_run,
+        )
+    return stats
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=2000, help="Answers per chunk/transaction"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Score and report without writing anything",
+    )
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--include-unknown",
+        action="store_true",
+        help="Also rescore evaluations written before their source was recorded",
+    )
+    scope.add_argument(
+        "--all",
+        dest="rescore_all",
+        action="store_true",
+        help="Rescore every answer, even model-graded",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    engine, session_factory = create_engine_and_sessionmaker(settings.database_url)
+    try:
+        async with session_factory() as db:
+            stats = await rescore(
+                db,
+                chunk_size=args.chunk_size,
+                dry_run=args.dry_run,
+                include_unknown=args.include_unknown,
+                rescore_all=args.rescore_all,
+            )
+        logger.info("rescore_finished", dry_run=args.dry_run, **stats.as_dict())
+    finally:
+        await code_sandbox.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
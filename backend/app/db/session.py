@@ -1,14 +1,86 @@
 from __future__ import annotations
 
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.config import settings
+from app.services.metrics import DB_POOL_CHECKOUT_WAIT, instrument_engine
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """The default async pool, recording how long each checkout takes."""
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def _is_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return _is_sqlite(url) and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def _engine_options(url: URL) -> Dict[str, Any]:
+    if _is_memory_sqlite(url):
+        # SQLAlchemy keeps a single static connection so the in-memory database survives.
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_sec,
+        "pool_recycle": settings.db_pool_recycle_sec,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _sqlite_pragmas(url: URL) -> Dict[str, Any]:
+    pragmas: Dict[str, Any] = {}
+    if not _is_memory_sqlite(url):
+        pragmas["journal_mode"] = settings.sqlite_journal_mode
+    pragmas["busy_timeout"] = settings.sqlite_busy_timeout_ms
+    pragmas["synchronous"] = settings.sqlite_synchronous
+    pragmas["mmap_size"] = settings.sqlite_mmap_size_mb * 1024 * 1024
+    return pragmas
+
+
+def configure_sqlite(engine: AsyncEngine) -> None:
+    """Apply the ``sqlite_*`` PRAGMAs to every connection ``engine`` opens."""
+    statements = [
+        f"PRAGMA {name}={value}" for name, value in _sqlite_pragmas(engine.url).items()
+    ]
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
 
 
 def create_engine_and_sessionmaker(database_url: str) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
-    engine = create_async_engine(database_url, future=True, echo=False)
+    url = make_url(database_url)
+    engine = create_async_engine(url, future=True, echo=False, **_engine_options(url))
+    if _is_sqlite(url):
+        configure_sqlite(engine)
+    instrument_engine(engine)
     session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
     return engine, session_factory
 
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Type
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+
+from app.db.base import Base
+
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert_statement(
+    session: AsyncSession,
+    model: Type[Base],
+    rows: Sequence[Dict[str, Any]],
+    *,
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+) -> Optional[Insert]:
+    """Build an ``INSERT ... ON CONFLICT`` for dialects that support it, otherwise ``None``.
+
+    When ``update_columns`` is empty the conflicting rows are left untouched.
+    """
+    dialect_insert = _DIALECT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is None or not rows:
+        return None
+    stmt = dialect_insert(model).values(list(rows))
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
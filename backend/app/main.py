@@ -3,12 +3,32 @@ from __future__ import annotations
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
 from app.db.session import create_engine_and_sessionmaker, session_context
 from app.api.router import api_router
+from app.api.http_cache import ETAG_HEADER
+from app.api.responses import ORJSONResponse
+from app.api.v1.history import NEXT_CURSOR_HEADER
+from app.services.code_analysis import code_analyzer
+from app.services.jobs import evaluation_workers
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm import llm_service
+from app.services.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    EVALUATION_CACHE_LOOKUPS,
+    LLM_CIRCUIT_OPEN,
+    LLM_CONCURRENCY,
+    SANDBOX_RUNS,
+    MetricsMiddleware,
+    registry,
+)
+from app.services.resilience import CircuitState
+from app.services.reference_cache import reference_cache
+from app.services.sandbox import code_sandbox
 from app.utils.logging import configure_logging
 
 logger = logging.getLogger(__name__)
@@ -21,10 +41,49 @@ async def lifespan(app: FastAPI):
 
     engine, session_factory = create_engine_and_sessionmaker(settings.database_url)
     session_context.configure(session_factory=session_factory)
+    try:
+        async with session_context.session() as db:
+            await reference_cache.load(db)
+            pruned = await evaluation_cache.prune(db)
+            await db.commit()
+        if pruned:
+            logger.info("Pruned %d expired evaluation cache entries", pruned)
+    except SQLAlchemyError as exc:
+        # Schema not migrated yet; the index is built lazily on the first request instead.
+        logger.warning("Reference data warm-up skipped: %s", exc)
+    await llm_service.startup()
+    code_analyzer.startup()
+    await code_sandbox.start()
+    await evaluation_workers.start()
 
     yield
 
     logger.info("Shutting down AI Interview Coach backend")
+    await evaluation_workers.stop()
+    code_analyzer.shutdown()
+    await code_sandbox.stop()
+    await llm_service.aclose()
+
+
+def _bind_runtime_metrics() -> None:
+    LLM_CONCURRENCY.labels("in_flight").set_function(
+        lambda: llm_service.limiter.in_flight
+    )
+    LLM_CONCURRENCY.labels("waiting").set_function(lambda: llm_service.limiter.waiting)
+    LLM_CIRCUIT_OPEN.set_function(
+        lambda: llm_service.breaker.state == CircuitState.OPEN
+    )
+    EVALUATION_CACHE_LOOKUPS.labels("memory_hit").set_function(
+        lambda: evaluation_cache.memory_hits
+    )
+    EVALUATION_CACHE_LOOKUPS.labels("db_hit").set_function(
+        lambda: evaluation_cache.db_hits
+    )
+    EVALUATION_CACHE_LOOKUPS.labels("miss").set_function(
+        lambda: evaluation_cache.misses
+    )
+    SANDBOX_RUNS.labels("executed").set_function(lambda: code_sandbox.runs)
+    SANDBOX_RUNS.labels("cache_hit").set_function(lambda: code_sandbox.cache_hits)
 
 
 def get_application() -> FastAPI:
@@ -33,6 +92,7 @@ def get_application() -> FastAPI:
         version="0.1.0",
         description="Backend services for the AI Interview Coach platform.",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -41,13 +101,20 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
     )
+    app.add_middleware(MetricsMiddleware)
+    _bind_runtime_metrics()
 
     app.include_router(api_router, prefix="/api/v1")
 
     @app.get("/healthz", tags=["health"])
     async def health_check():
-        return {"status": "ok"}
+        return {"status": "ok", "llm_circuit": llm_service.breaker.snapshot()}
+
+    @app.get("/metrics", tags=["health"], include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
 
     return app
 
@@ -19,3 +19,10 @@ class RoleLevel(str, Enum):
     MID = "mid"
     SENIOR = "senior"
     STAFF = "staff"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
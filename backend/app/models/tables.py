@@ -3,12 +3,24 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Boolean, JSON, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import (
+    Boolean,
+    JSON,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
-from app.models.enums import QuestionCategory, RoleLevel, SessionTier
+from app.models.enums import JobStatus, QuestionCategory, RoleLevel, SessionTier
+from app.utils.datetime import utcnow_naive
 
 
 class Role(Base):
@@ -35,19 +47,30 @@ class Question(Base):
     expected_duration_sec: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     requires_code: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     keywords: Mapped[List[str]] = mapped_column(JSON, default=list)
+    # {"entrypoint": optional function name, "cases": [{"args": [...], "expected": ...}]}
+    test_cases: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
 
     role: Mapped["Role"] = relationship(back_populates="questions")
     answers: Mapped[List["Answer"]] = relationship(back_populates="question")
 
 
 class Session(Base):
+    __table_args__ = (Index("ix_session_started_at_id", "started_at", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     role_id: Mapped[int] = mapped_column(ForeignKey("role.id", ondelete="RESTRICT"), nullable=False, index=True)
-    started_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    # Set in Python rather than by the database so SQLite stores the same text format as bound
+    # parameters; keyset pagination compares this column against cursor values. Migration 0006
+    # rewrites rows stored by the old server default.
+    started_at: Mapped[datetime] = mapped_column(default=utcnow_naive, nullable=False)
     ended_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     level: Mapped[RoleLevel] = mapped_column(Enum(RoleLevel, native_enum=False), nullable=False, default=RoleLevel.ENTRY)
     summary_tier: Mapped[Optional[SessionTier]] = mapped_column(Enum(SessionTier, native_enum=False), nullable=True)
     overall_score: Mapped[Optional[float]] = mapped_column(nullable=True)
+    score_sum: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    evaluated_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Bumped by every write that changes what GET /sessions/{id} returns; feeds its ETag.
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     role: Mapped["Role"] = relationship(back_populates="sessions")
     answers: Mapped[List["Answer"]] = relationship(back_populates="session", cascade="all, delete-orphan")
@@ -83,5 +106,48 @@ class Evaluation(Base):
     rubric: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
     feedback_markdown: Mapped[str] = mapped_column(Text, nullable=False)
     suggested_improvements: Mapped[List[str]] = mapped_column(JSON, default=list, nullable=False)
+    # Which evaluator produced the score ("llm", "offline" or "code"); NULL for rows written before tracking.
+    source: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
 
     answer: Mapped["Answer"] = relationship(back_populates="evaluation")
+
+
+class AppMetadata(Base):
+    """Small key/value facts about the database itself, e.g. which seed file was last applied."""
+
+    __tablename__ = "app_metadata"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=utcnow_naive, onupdate=utcnow_naive, nullable=False
+    )
+
+
+class EvaluationCacheEntry(Base):
+    __tablename__ = "evaluation_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+
+
+class EvaluationJob(Base):
+    __tablename__ = "evaluation_job"
+    __table_args__ = (Index("ix_evaluation_job_status_id", "status", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    answer_id: Mapped[int] = mapped_column(
+        ForeignKey("answer.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, native_enum=False), nullable=False, default=JobStatus.QUEUED
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=func.now(), onupdate=func.now(), nullable=False
+    )
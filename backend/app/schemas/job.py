@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.enums import JobStatus
+from app.schemas.session import EvaluationRead
+
+
+class EvaluationJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    answer_id: int
+    status: JobStatus
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    evaluation: Optional[EvaluationRead] = None
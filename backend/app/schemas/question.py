@@ -1,6 +1,7 @@
-from typing import List, Optional
+import json
+from typing import Any, Dict, List, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 from app.models.enums import QuestionCategory as QuestionCategoryEnum, RoleLevel
 from app.schemas.common import ORMModel
@@ -16,3 +17,49 @@ class QuestionRead(ORMModel):
     expected_duration_sec: Optional[int] = None
     requires_code: bool = False
     keywords: List[str] = []
+
+
+class QuestionImport(BaseModel):
+    """One question from an external bank (JSON Lines object or CSV row)."""
+
+    role_slug: str = Field(min_length=1, max_length=64)
+    text: str = Field(min_length=1)
+    category: QuestionCategoryEnum
+    level: RoleLevel = RoleLevel.ENTRY
+    difficulty: int = Field(default=3, ge=1, le=5)
+    expected_duration_sec: Optional[int] = Field(default=None, ge=0)
+    requires_code: bool = False
+    keywords: List[str] = []
+    test_cases: Optional[Dict[str, Any]] = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def blank_as_default(cls, value: Any, info: ValidationInfo) -> Any:
+        # CSV has no null; an empty cell means "not given".
+        if isinstance(value, str) and not value.strip():
+            field = cls.model_fields[info.field_name]
+            return None if field.is_required() else field.get_default()
+        return value
+
+    @field_validator("text", "role_slug")
+    @classmethod
+    def strip_text(cls, value: str) -> str:
+        return value.strip()
+
+    @field_validator("keywords", mode="before")
+    @classmethod
+    def split_keywords(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            if value.lstrip().startswith("["):
+                return json.loads(value)
+            return [
+                part.strip()
+                for part in value.replace("|", ";").split(";")
+                if part.strip()
+            ]
+        return value
+
+    @field_validator("test_cases", mode="before")
+    @classmethod
+    def parse_test_cases(cls, value: Any) -> Any:
+        return json.loads(value) if isinstance(value, str) and value.strip() else value
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, computed_field
@@ -36,6 +37,12 @@ class AnswerCreate(BaseModel):
     transcript_text: Optional[str] = None
 
 
+class AnswerBulkCreate(BaseModel):
+    answers: List[AnswerCreate] = Field(..., min_length=1, max_length=100)
+    # Queue background evaluation jobs for every stored answer.
+    evaluate: bool = False
+
+
 class RubricBreakdown(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -66,6 +73,20 @@ class EvaluationRead(BaseModel):
         return tier_for_score(self.score)
 
 
+class EvaluationBatchRequest(BaseModel):
+    answer_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+
+class EvaluationBatchItem(BaseModel):
+    answer_id: int
+    evaluation: EvaluationRead
+
+
+class EvaluationBatchResponse(BaseModel):
+    evaluations: List[EvaluationBatchItem]
+    missing_answer_ids: List[int] = []
+
+
 class AnswerRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -79,10 +100,22 @@ class AnswerRead(BaseModel):
     evaluation: Optional[EvaluationRead] = None
 
 
+class AnswerBulkResponse(BaseModel):
+    answers: List[AnswerRead]
+    evaluation_job_ids: List[int] = []
+
+
 class SessionDetail(SessionRead):
     answers: List[AnswerRead] = []
 
 
+class SessionDetailField(str, Enum):
+    """Heavy answer fields a session detail request can leave out."""
+
+    TRANSCRIPT_TEXT = "transcript_text"
+    FEEDBACK_MARKDOWN = "feedback_markdown"
+
+
 class HistoryItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
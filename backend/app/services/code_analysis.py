@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import multiprocessing
+import re
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+from app.services.concurrency import ConcurrencyLimiter
+
+logger = structlog.get_logger(__name__)
+
+_FENCE = re.compile(r"```[ \t]*([\w+#-]*)[^\n]*\n(.*?)```", re.DOTALL)
+_PYTHON_FENCES = {"py", "python", "python3"}
+_JS_FENCES = {"js", "javascript", "jsx", "ts", "typescript", "tsx"}
+# Lines that only make sense as Python source; prose rarely starts a line like this.
+_PYTHON_LINE = re.compile(
+    r"^\s*(def|class|import|from|for|while|if|elif|try|with|return)\b.*[:\w)\]]\s*$",
+    re.MULTILINE,
+)
+_PYTHON_STATEMENT = re.compile(r"^(\s|@|\w[\w.\[\]]*\s*(=|\(|\+=|-=)|$)")
+_JS_HINT = re.compile(r"\b(function|const|let|var)\b|=>")
+
+_JS_NOISE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|`(?:\\.|[^`\\])*`|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"",
+    re.DOTALL,
+)
+_JS_FUNCTION = re.compile(r"\bfunction\b|=>")
+_JS_CLASS = re.compile(r"\bclass\s+\w")
+_JS_LOOP = re.compile(
+    r"\b(?:for|while)\s*\(|\bdo\s*\{|\.(?:forEach|map|filter|reduce)\s*\("
+)
+_JS_BRANCH = re.compile(r"\bif\s*\(|\bcase\b|\bcatch\b|&&|\|\||\?(?![.?:])")
+_JS_ASSERT = re.compile(r"\b(?:assert|expect)\s*[.(]")
+_JS_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+@dataclass(frozen=True)
+class CodeMetrics:
+    """Static facts about the code in an answer.
+
+    ``language`` is ``None`` when the answer holds no recognisable code, in which case the
+    counters are meaningless and callers should fall back to text heuristics.
+    ``cyclomatic_complexity`` is McCabe's measure of the most complex function (or of the
+    module body when it is the most complex unit). ``source`` is the Python that parsed, for
+    callers that go on to run it.
+    """
+
+    language: Optional[str] = None
+    syntax_error: Optional[str] = None
+    error_line: Optional[int] = None
+    functions: int = 0
+    classes: int = 0
+    loops: int = 0
+    branches: int = 0
+    asserts: int = 0
+    cyclomatic_complexity: int = 0
+    lines: int = 0
+    source: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def parsed(self) -> bool:
+        return self.language is not None and self.syntax_error is None
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    def __init__(self) -> None:
+        self.functions = 0
+        self.classes = 0
+        self.loops = 0
+        self.branches = 0
+        self.asserts = 0
+        # One decision counter per enclosing function; index 0 is the module body.
+        self._complexity: List[int] = [1]
+        self.max_complexity = 1
+
+    def _decision(self, count: int = 1) -> None:
+        self._complexity[-1] += count
+
+    def _visit_function(self, node: ast.AST) -> None:
+        self.functions += 1
+        self._complexity.append(1)
+        self.generic_visit(node)
+        self.max_complexity = max(self.max_complexity, self._complexity.pop())
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = _visit_function
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes += 1
+        self.generic_visit(node)
+
+    def _visit_loop(self, node: ast.AST) -> None:
+        self.loops += 1
+        self._decision()
+        self.generic_visit(node)
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def _visit_branch(self, node: ast.AST) -> None:
+        self.branches += 1
+        self._decision()
+        self.generic_visit(node)
+
+    visit_If = visit_IfExp = visit_ExceptHandler = visit_match_case = _visit_branch
+
+    def visit_comprehension(self, node: ast.comprehension) -> None:
+        self.loops += 1
+        self._decision(1 + len(node.ifs))
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self._decision(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_Assert(self, node: ast.Assert) -> None:
+        self.asserts += 1
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        # unittest-style self.assertEqual(...) and pytest.raises(...) count as assertions too.
+        name = (
+            node.func.attr
+            if isinstance(node.func, ast.Attribute)
+            else getattr(node.func, "id", "")
+        )
+        if name.startswith("assert") or name == "raises":
+            self.asserts += 1
+        self.generic_visit(node)
+
+    def finish(self) -> int:
+        return max(self.max_complexity, self._complexity[0])
+
+
+def extract_code(text: str) -> Tuple[str, Optional[str]]:
+    """Return the code in ``text`` and the language named by its fence, if any.
+
+    Fenced blocks are joined when present; otherwise the whole answer is treated as code.
+    """
+    blocks = _FENCE.findall(text)
+    if not blocks:
+        return textwrap.dedent(text).strip("\n"), None
+    hint = next((tag.lower() for tag, _ in blocks if tag), None)
+    return "\n\n".join(textwrap.dedent(body).strip("\n") for _, body in blocks), hint
+
+
+def _python_metrics(tree: ast.AST, source: str, lines: int) -> CodeMetrics:
+    visitor = _PythonVisitor()
+    visitor.visit(tree)
+    return CodeMetrics(
+        language="python",
+        functions=visitor.functions,
+        classes=visitor.classes,
+        loops=visitor.loops,
+        branches=visitor.branches,
+        asserts=visitor.asserts,
+        cyclomatic_complexity=visitor.finish(),
+        lines=lines,
+        source=source,
+    )
+
+
+def _javascript_metrics(code: str, lines: int) -> CodeMetrics:
+    # Comments and string literals would otherwise feed the keyword counts and bracket check.
+    stripped = _JS_NOISE.sub(" ", code)
+    loops = len(_JS_LOOP.findall(stripped))
+    branches = len(_JS_BRANCH.findall(stripped))
+    syntax_error = None
+    error_line = None
+    stack: List[Tuple[str, int]] = []
+    for number, line in enumerate(stripped.splitlines(), start=1):
+        for char in line:
+            if char in "([{":
+                stack.append((char, number))
+            elif char in _JS_PAIRS:
+                if not stack or stack[-1][0] != _JS_PAIRS[char]:
+                    syntax_error, error_line = f"unexpected '{char}'", number
+                    break
+                stack.pop()
+        if syntax_error:
+            break
+    if syntax_error is None and stack:
+        opener, error_line = stack[-1]
+        syntax_error = f"'{opener}' was never closed"
+    return CodeMetrics(
+        language="javascript",
+        syntax_error=syntax_error,
+        error_line=error_line,
+        functions=len(_JS_FUNCTION.findall(stripped)),
+        classes=len(_JS_CLASS.findall(stripped)),
+        loops=loops,
+        branches=branches,
+        asserts=len(_JS_ASSERT.findall(stripped)),
+        cyclomatic_complexity=1 + loops + branches,
+        lines=lines,
+    )
+
+
+def _python_region(code: str) -> Optional[str]:
+    """The run of lines from the first Python-looking statement that still reads as code."""
+    match = _PYTHON_LINE.search(code)
+    if match is None:
+        return None
+    lines = code[match.start() :].splitlines()
+    region = [lines[0]]
+    for line in lines[1:]:
+        if not (_PYTHON_LINE.match(line) or _PYTHON_STATEMENT.match(line)):
+            break
+        region.append(line)
+    return textwrap.dedent("\n".join(region))
+
+
+def _parse_python(code: str, *, fenced: bool) -> Tuple[ast.AST, str]:
+    try:
+        return ast.parse(code), code
+    except SyntaxError:
+        # Unfenced answers often wrap the snippet in prose; retry on the snippet alone.
+        region = None if fenced else _python_region(code)
+        if region is None or region == code:
+            raise
+        return ast.parse(region), region
+
+
+def analyze_source(text: str) -> CodeMetrics:
+    """Parse the code in an answer and count its structure. CPU-bound; pure and picklable."""
+    code, hint = extract_code(text)
+    if not code.strip():
+        return CodeMetrics()
+    lines = sum(1 for line in code.splitlines() if line.strip())
+    if hint in _JS_FENCES:
+        return _javascript_metrics(code, lines)
+    try:
+        tree, source = _parse_python(code, fenced=hint is not None)
+    except (SyntaxError, ValueError) as exc:
+        if hint not in _PYTHON_FENCES and _JS_HINT.search(code):
+            return _javascript_metrics(code, lines)
+        if hint in _PYTHON_FENCES or _PYTHON_LINE.search(code):
+            return CodeMetrics(
+                language="python",
+                syntax_error=getattr(exc, "msg", None) or str(exc),
+                error_line=getattr(exc, "lineno", None),
+                lines=lines,
+            )
+        # Prose with no recognisable code.
+        return CodeMetrics()
+    except RecursionError:
+        return CodeMetrics(
+            language="python", syntax_error="nesting too deep to analyse", lines=lines
+        )
+    metrics = _python_metrics(tree, source, lines)
+    if not (
+        metrics.functions
+        or metrics.classes
+        or metrics.loops
+        or metrics.branches
+        or metrics.asserts
+    ):
+        # Plain sentences can parse as Python expressions; without any structure treat it as prose.
+        if not _PYTHON_LINE.search(code) and hint not in _PYTHON_FENCES:
+            return CodeMetrics()
+    return metrics
+
+
+class CodeAnalyzer:
+    """Runs :func:`analyze_source` in a bounded process pool off the event loop.
+
+    Submissions longer than ``max_chars`` are not analysed, at most ``workers`` parses run at
+    once and each is abandoned after ``timeout`` seconds; the pool is then recycled so a
+    runaway parse cannot hold a worker. ``workers=0`` parses in a thread instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        self._workers = settings.code_analysis_workers if workers is None else workers
+        self._timeout = timeout or settings.code_analysis_timeout_sec
+        self._max_chars = max_chars or settings.code_analysis_max_chars
+        self._limiter = ConcurrencyLimiter(max(1, self._workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def startup(self) -> None:
+        if self._pool is not None or self._workers < 1:
+            return
+        # spawn keeps workers free of the parent's event loop, sockets and locks.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def analyze(self, text: str) -> Optional[CodeMetrics]:
+        """Return metrics for ``text``, or ``None`` when it is too large or analysis failed."""
+        if len(text) > self._max_chars:
+            logger.info("code_analysis_skipped", reason="too_large", chars=len(text))
+            return None
+        async with self._limiter.slot():
+            if self._workers < 1:
+                call = asyncio.to_thread(analyze_source, text)
+            else:
+                self.startup()
+                call = asyncio.get_running_loop().run_in_executor(
+                    self._pool, analyze_source, text
+                )
+            try:
+                return await asyncio.wait_for(call, self._timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "code_analysis_timeout", chars=len(text), timeout=self._timeout
+                )
+                self._recycle()
+            except BrokenProcessPool:
+                logger.warning("code_analysis_pool_broken")
+                self._recycle()
+        return None
+
+    def _recycle(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # Executor has no public way to stop a running task; terminate its workers directly.
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+code_analyzer = CodeAnalyzer()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Deque, Dict
+
+
+class ConcurrencyLimiter:
+    """FIFO-fair gate bounding concurrent work and tracking queue wait time."""
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1.")
+        self._limit = limit
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._acquired_total = 0
+        self._wait_seconds_total = 0.0
+        self._max_wait_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> float:
+        """Wait for a free slot in arrival order and return the seconds spent queued."""
+        started = time.perf_counter()
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+        else:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just before cancellation; pass it on.
+                    self.release()
+                else:
+                    self._discard(waiter)
+                raise
+        waited = time.perf_counter() - started
+        self._acquired_total += 1
+        self._wait_seconds_total += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        return waited
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot directly to the next caller so late arrivals cannot jump the queue.
+                waiter.set_result(None)
+                return
+        self._in_flight = max(0, self._in_flight - 1)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "limit": float(self._limit),
+            "in_flight": float(self._in_flight),
+            "waiting": float(self.waiting),
+            "acquired_total": float(self._acquired_total),
+            "wait_seconds_total": round(self._wait_seconds_total, 6),
+            "max_wait_seconds": round(self._max_wait_seconds, 6),
+        }
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
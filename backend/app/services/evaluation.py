@@ -14,6 +14,9 @@ def tier_for_score(score: float) -> SessionTier:
     return SessionTier.READY
 
 
+# Bump whenever SYSTEM_PROMPT or the response schema changes so cached evaluations are not reused.
+PROMPT_VERSION = "2025-10-v1"
+
 SYSTEM_PROMPT = """You are an experienced interview coach helping candidates prepare for interviews.
 Evaluate the candidate's answer using the correct rubric for the question category.
 
@@ -38,6 +41,7 @@ class EvaluationPayload:
     rubric: Dict[str, Any]
     suggested_improvements: List[str]
     readiness_tier: SessionTier
+    source: str = "offline"
 
 
 def default_rubric(category: QuestionCategory) -> Dict[str, Any]:
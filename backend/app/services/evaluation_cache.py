@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.upsert import upsert_statement
+from app.models.enums import QuestionCategory
+from app.models.tables import EvaluationCacheEntry
+from app.services.evaluation import PROMPT_VERSION, EvaluationPayload, tier_for_score
+from app.utils.datetime import utcnow_naive
+
+
+def evaluation_cache_key(
+    *,
+    question_id: Optional[int],
+    question_text: str,
+    category: QuestionCategory,
+    role_name: str,
+    requires_code: bool,
+    keywords: Optional[List[str]],
+    answer_text: str,
+    prompt_version: str = PROMPT_VERSION,
+) -> str:
+    material = json.dumps(
+        [
+            prompt_version,
+            question_id,
+            question_text,
+            category.value,
+            role_name,
+            bool(requires_code),
+            list(keywords or []),
+            answer_text.strip(),
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _payload_to_dict(payload: EvaluationPayload) -> Dict[str, Any]:
+    return {
+        "score": payload.score,
+        "feedback_markdown": payload.feedback_markdown,
+        "rubric": payload.rubric,
+        "suggested_improvements": payload.suggested_improvements,
+    }
+
+
+def _payload_from_dict(data: Dict[str, Any]) -> EvaluationPayload:
+    score = float(data["score"])
+    return EvaluationPayload(
+        score=score,
+        feedback_markdown=data["feedback_markdown"],
+        rubric=dict(data["rubric"]),
+        suggested_improvements=list(data["suggested_improvements"]),
+        readiness_tier=tier_for_score(score),
+        source="cache",
+    )
+
+
+class EvaluationCache:
+    """Two-tier cache of model evaluations: an in-process LRU with TTL backed by a DB table.
+
+    The TTL also bounds the DB tier: rows older than it are ignored on read and removed by
+    :meth:`prune`.
+    """
+
+    def __init__(
+        self, *, max_entries: int, ttl_seconds: float, persist: bool = True
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._persist = persist
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[EvaluationPayload]:
+        cached = self._get_memory(key)
+        if cached is not None:
+            self.memory_hits += 1
+            return _payload_from_dict(cached)
+
+        if self._persist:
+            row = (
+                await db.execute(
+                    select(
+                        EvaluationCacheEntry.payload, EvaluationCacheEntry.created_at
+                    ).where(
+                        EvaluationCacheEntry.cache_key == key,
+                        EvaluationCacheEntry.created_at >= self._db_cutoff(),
+                    )
+                )
+            ).one_or_none()
+            if row is not None:
+                self.db_hits += 1
+                self._set_memory(key, row.payload, stored_at=row.created_at)
+                return _payload_from_dict(row.payload)
+
+        self.misses += 1
+        return None
+
+    async def get_many(
+        self, db: AsyncSession, keys: Sequence[str]
+    ) -> Dict[str, EvaluationPayload]:
+        """Resolve several keys with at most one DB query for the ones missing from memory."""
+        found: Dict[str, EvaluationPayload] = {}
+        pending: List[str] = []
+        for key in dict.fromkeys(keys):
+            cached = self._get_memory(key)
+            if cached is not None:
+                self.memory_hits += 1
+                found[key] = _payload_from_dict(cached)
+            else:
+                pending.append(key)
+
+        if pending and self._persist:
+            rows = await db.execute(
+                select(
+                    EvaluationCacheEntry.cache_key,
+                    EvaluationCacheEntry.payload,
+                    EvaluationCacheEntry.created_at,
+                ).where(
+                    EvaluationCacheEntry.cache_key.in_(pending),
+                    EvaluationCacheEntry.created_at >= self._db_cutoff(),
+                )
+            )
+            for key, data, stored_at in rows:
+                self.db_hits += 1
+                self._set_memory(key, data, stored_at=stored_at)
+                found[key] = _payload_from_dict(data)
+
+        self.misses += sum(1 for key in pending if key not in found)
+        return found
+
+    async def put(self, db: AsyncSession, key: str, payload: EvaluationPayload) -> None:
+        """Store a payload; the DB row is written in the caller's transaction."""
+        await self.put_many(db, {key: payload})
+
+    async def put_many(
+        self, db: AsyncSession, payloads: Dict[str, EvaluationPayload]
+    ) -> None:
+        now = utcnow_naive()
+        rows = [
+            {"cache_key": key, "payload": _payload_to_dict(payload), "created_at": now}
+            for key, payload in payloads.items()
+        ]
+        for row in rows:
+            self._set_memory(row["cache_key"], row["payload"])
+        if not self._persist or not rows:
+            return
+        # Overwrite expired rows so a fresh evaluation restarts the entry's TTL.
+        stmt = upsert_statement(
+            db,
+            EvaluationCacheEntry,
+            rows,
+            conflict_columns=["cache_key"],
+            update_columns=["payload", "created_at"],
+        )
+        if stmt is not None:
+            await db.execute(stmt)
+        else:
+            for row in rows:
+                await db.merge(EvaluationCacheEntry(**row))
+
+    async def prune(self, db: AsyncSession) -> int:
+        """Delete DB entries older than the TTL in the caller's transaction; returns the count."""
+        if not self._persist:
+            return 0
+        result = await db.execute(
+            delete(EvaluationCacheEntry).where(
+                EvaluationCacheEntry.created_at < self._db_cutoff()
+            )
+        )
+        return result.rowcount
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+        }
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def _db_cutoff(self) -> datetime:
+        return utcnow_naive() - timedelta(seconds=self._ttl_seconds)
+
+    def _set_memory(
+        self, key: str, data: Dict[str, Any], *, stored_at: Optional[datetime] = None
+    ) -> None:
+        ttl = self._ttl_seconds
+        if stored_at is not None:
+            # Entries read back from the DB keep the expiry they were written with.
+            ttl -= (utcnow_naive() - stored_at).total_seconds()
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+evaluation_cache = EvaluationCache(
+    max_entries=settings.evaluation_cache_max_entries,
+    ttl_seconds=settings.evaluation_cache_ttl_sec,
+    persist=settings.evaluation_cache_persist,
+)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+import structlog
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import session_context
+from app.models.enums import JobStatus
+from app.models.tables import EvaluationJob
+from app.services.scoring import (
+    generate_evaluation,
+    load_answer_context,
+    lookup_cached_evaluation,
+    store_evaluation,
+)
+from app.utils.datetime import utcnow_naive
+
+logger = structlog.get_logger(__name__)
+
+_CLAIM_ATTEMPTS = 5
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    answer_id: int
+    attempts: int
+
+
+async def enqueue_evaluation(db: AsyncSession, answer_id: int) -> EvaluationJob:
+    """Queue an evaluation, reusing a pending job for the same answer (no commit)."""
+    pending = await db.scalar(
+        select(EvaluationJob)
+        .where(
+            EvaluationJob.answer_id == answer_id,
+            EvaluationJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+        )
+        .order_by(EvaluationJob.id.desc())
+        .limit(1)
+    )
+    if pending:
+        return pending
+    job = EvaluationJob(answer_id=answer_id, status=JobStatus.QUEUED)
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def enqueue_new_evaluations(
+    db: AsyncSession, answer_ids: Sequence[int]
+) -> List[int]:
+    """Queue evaluations for answers created in this transaction (no commit); returns job ids.
+
+    New answers cannot have a pending job yet, so the per-answer lookup that
+    :func:`enqueue_evaluation` does is skipped and the jobs go out in one executemany INSERT.
+    """
+    rows = [
+        {"answer_id": answer_id, "status": JobStatus.QUEUED} for answer_id in answer_ids
+    ]
+    statement = insert(EvaluationJob).returning(
+        EvaluationJob.id, sort_by_parameter_order=True
+    )
+    return list(await db.scalars(statement, rows))
+
+
+def _claimable(lease_expired_before: datetime):
+    return or_(
+        EvaluationJob.status == JobStatus.QUEUED,
+        and_(
+            EvaluationJob.status == JobStatus.RUNNING,
+            EvaluationJob.locked_at < lease_expired_before,
+        ),
+    )
+
+
+async def claim_next_job(
+    db: AsyncSession, *, worker_id: str, lease_seconds: float
+) -> Optional[ClaimedJob]:
+    """Atomically take the oldest queued (or lease-expired) job.
+
+    PostgreSQL skips rows locked by other workers; elsewhere the conditional UPDATE acts as a
+    compare-and-set, so two processes can never both claim the same job.
+    """
+    for _ in range(_CLAIM_ATTEMPTS):
+        now = utcnow_naive()
+        lease_expired_before = now - timedelta(seconds=lease_seconds)
+        candidate = await db.scalar(
+            select(EvaluationJob.id)
+            .where(_claimable(lease_expired_before))
+            .order_by(EvaluationJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if candidate is None:
+            await db.commit()
+            return None
+
+        result = await db.execute(
+            update(EvaluationJob)
+            .where(EvaluationJob.id == candidate, _claimable(lease_expired_before))
+            .values(
+                status=JobStatus.RUNNING,
+                worker_id=worker_id,
+                locked_at=now,
+                attempts=EvaluationJob.attempts + 1,
+            )
+            .returning(EvaluationJob.answer_id, EvaluationJob.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.one_or_none()
+        await db.commit()
+        if claimed is not None:
+            return ClaimedJob(id=candidate, answer_id=claimed[0], attempts=claimed[1])
+    return None
+
+
+async def _finish_job(
+    db: AsyncSession,
+    job: ClaimedJob,
+    *,
+    worker_id: str,
+    status: JobStatus,
+    error: Optional[str] = None,
+) -> bool:
+    """Record the outcome if this claim still holds the lease; ``False`` if it was lost.
+
+    A lease that expired may have been re-claimed, which changes ``worker_id`` and bumps
+    ``attempts``, so both fence the update.
+    """
+    result = await db.execute(
+        update(EvaluationJob)
+        .where(
+            EvaluationJob.id == job.id,
+            EvaluationJob.status == JobStatus.RUNNING,
+            EvaluationJob.worker_id == worker_id,
+            EvaluationJob.attempts == job.attempts,
+        )
+        .values(status=status, error=error, locked_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def process_job(job: ClaimedJob, *, worker_id: str, max_attempts: int) -> None:
+    """Run one claimed job without holding a DB connection across the model call."""
+    try:
+        async with session_context.session() as db:
+            context = await load_answer_context(db, job.answer_id)
+            if context is None:
+                await _finish_job(
+                    db,
+                    job,
+                    worker_id=worker_id,
+                    status=JobStatus.FAILED,
+                    error="Answer not found.",
+                )
+                await db.commit()
+                return
+            payload = await lookup_cached_evaluation(db, context)
+
+        if payload is None:
+            payload = await generate_evaluation(context)
+
+        async with session_context.session() as db:
+            # Finish first: the job row stays locked until commit, so nobody can re-claim it
+            # between the ownership check and storing the result.
+            if not await _finish_job(
+                db, job, worker_id=worker_id, status=JobStatus.SUCCEEDED
+            ):
+                await db.rollback()
+                logger.warning(
+                    "evaluation_job_lease_lost", job_id=job.id, worker_id=worker_id
+                )
+                return
+            await store_evaluation(db, context, payload)
+            await db.commit()
+    except Exception as exc:  # noqa: BLE001 - a failing job must never kill the worker
+        logger.error(
+            "evaluation_job_failed",
+            job_id=job.id,
+            attempts=job.attempts,
+            error=str(exc),
+        )
+        status = JobStatus.FAILED if job.attempts >= max_attempts else JobStatus.QUEUED
+        async with session_context.session() as db:
+            await _finish_job(
+                db, job, worker_id=worker_id, status=status, error=str(exc)
+            )
+            await db.commit()
+
+
+class EvaluationWorkerPool:
+    """Asyncio workers that drain the DB-backed evaluation queue."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        poll_interval: float,
+        lease_seconds: float,
+        max_attempts: int,
+    ) -> None:
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._tasks: List[asyncio.Task[None]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks or self._workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        for index in range(self._workers):
+            worker_id = f"{self._prefix}:{index}"
+            self._tasks.append(
+                asyncio.create_task(
+                    self._worker_loop(worker_id), name=f"evaluation-worker-{index}"
+                )
+            )
+        logger.info("evaluation_workers_started", workers=self._workers)
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake idle workers so a freshly enqueued job does not wait for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_once(self, worker_id: Optional[str] = None) -> bool:
+        worker_id = worker_id or f"{self._prefix}:inline"
+        async with session_context.session() as db:
+            job = await claim_next_job(
+                db, worker_id=worker_id, lease_seconds=self._lease_seconds
+            )
+        if job is None:
+            return False
+        await process_job(job, worker_id=worker_id, max_attempts=self._max_attempts)
+        return True
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        while True:
+            try:
+                if await self.run_once(worker_id):
+                    continue
+            except asyncio.CancelledError:
+                raise
+            # Keep polling through transient DB errors.
+            except Exception as exc:  # noqa: BLE001
+                logger.error(
+                    "evaluation_worker_error", worker_id=worker_id, error=str(exc)
+                )
+            await self._idle()
+
+    async def _idle(self) -> None:
+        wakeup = self._wakeup
+        if wakeup is None:
+            await asyncio.sleep(self._poll_interval)
+            return
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=self._poll_interval)
+        except asyncio.TimeoutError:
+            return
+        wakeup.clear()
+
+
+evaluation_workers = EvaluationWorkerPool(
+    workers=settings.evaluation_workers,
+    poll_interval=settings.evaluation_job_poll_interval_sec,
+    lease_seconds=settings.evaluation_job_lease_sec,
+    max_attempts=settings.evaluation_job_max_attempts,
+)
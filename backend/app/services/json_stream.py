@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import string
+from typing import List, Optional
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class JsonStringFieldExtractor:
+    """Incrementally decodes one top-level string field from a JSON document arriving in chunks.
+
+    ``feed`` returns the newly decoded characters of the field's value, so callers can forward
+    text to users while the rest of the document is still being generated. Until the field is
+    found the document's nesting and string state are tracked, so the key only matches where
+    it is a key of the outermost object, never inside another field's text.
+    """
+
+    def __init__(self, field: str) -> None:
+        self._field = field
+        self._buffer = ""
+        self._position = 0
+        self._inside = False
+        self._finished = False
+        # Scanner state while looking for the key.
+        self._containers: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._reading_key = False
+        self._expect_key = False
+        self._key_chars: List[str] = []
+        self._last_key: Optional[str] = None
+        self._after_colon = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: str) -> str:
+        if self._finished:
+            return ""
+        self._buffer += chunk
+        if not self._inside:
+            start = self._find_value_start()
+            if start is None:
+                self._buffer = ""
+                return ""
+            self._inside = True
+            self._position = start
+
+        decoded: List[str] = []
+        buffer = self._buffer
+        index = self._position
+        while index < len(buffer):
+            char = buffer[index]
+            if char == '"':
+                self._finished = True
+                index += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                index += 1
+                continue
+            # Leave incomplete escape sequences in the buffer until the next chunk arrives.
+            if index + 1 >= len(buffer):
+                break
+            marker = buffer[index + 1]
+            if marker == "u":
+                if index + 6 > len(buffer):
+                    break
+                code = _hex_code(buffer[index + 2 : index + 6])
+                if code is None:
+                    decoded.append(buffer[index : index + 6])
+                    index += 6
+                    continue
+                if 0xD800 <= code <= 0xDBFF:
+                    rest = buffer[index + 6 : index + 12]
+                    if len(rest) < 6 and "\\u".startswith(rest[:2]):
+                        break  # the low half of the surrogate pair has not arrived yet
+                    low = _hex_code(rest[2:]) if rest.startswith("\\u") else None
+                    if low is not None and 0xDC00 <= low <= 0xDFFF:
+                        decoded.append(
+                            chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00))
+                        )
+                        index += 12
+                        continue
+                    code = 0xFFFD
+                elif 0xDC00 <= code <= 0xDFFF:
+                    code = 0xFFFD
+                # A lone surrogate cannot be encoded as UTF-8; send the replacement character.
+                decoded.append(chr(code))
+                index += 6
+                continue
+            decoded.append(_SIMPLE_ESCAPES.get(marker, marker))
+            index += 2
+
+        # Drop consumed input so long documents do not grow the buffer unboundedly.
+        self._buffer = buffer[index:]
+        self._position = 0
+        return "".join(decoded)
+
+    def _find_value_start(self) -> Optional[int]:
+        """Scan the buffer for the opening quote of the field's value; ``None`` if not seen yet."""
+        for index, char in enumerate(self._buffer):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._reading_key:
+                        self._reading_key = False
+                        self._last_key = "".join(self._key_chars)
+                    continue
+                if self._reading_key:
+                    self._key_chars.append(char)
+                continue
+
+            top_level = self._containers == ["{"]
+            if char == '"':
+                if self._after_colon and top_level and self._last_key == self._field:
+                    return index + 1
+                self._in_string = True
+                self._reading_key = top_level and self._expect_key
+                self._key_chars = []
+                self._expect_key = False
+                self._after_colon = False
+            elif char in "{[":
+                self._containers.append(char)
+                self._expect_key = self._containers == ["{"]
+                self._after_colon = False
+            elif char in "}]":
+                if self._containers:
+                    self._containers.pop()
+                self._after_colon = False
+            elif char == ",":
+                self._expect_key = top_level
+                self._last_key = None
+                self._after_colon = False
+            elif char == ":":
+                self._after_colon = top_level and self._last_key is not None
+            elif not char.isspace():
+                self._after_colon = False
+        return None
+
+
+def _hex_code(digits: str) -> Optional[int]:
+    if len(digits) != 4 or not all(char in string.hexdigits for char in digits):
+        return None
+    return int(digits, 16)
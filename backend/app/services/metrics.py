@@ -0,0 +1,427 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms live in a module-level :data:`registry` and are rendered by
+``GET /metrics``. Values are per process: with several uvicorn workers each one is scraped
+(or aggregated) separately. Everything is updated from the event-loop thread, so no locks.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_UNMATCHED_ROUTE = "unmatched"
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _CounterValue:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    @property
+    def value(self) -> float:
+        return float(self._function()) if self._function is not None else self._value
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        self._value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Mirror a total some other component already keeps, read at scrape time."""
+        self._function = function
+
+
+class _GaugeValue:
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    @property
+    def value(self) -> float:
+        return float(self._function()) if self._function is not None else self._value
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time instead of storing it."""
+        self._function = function
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._buckets, value)] += 1
+        self.sum += value
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {values}"
+            )
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Create the value holder for one label combination."""
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        for key, child in self._children.items():
+            yield self.name, self._label_dict(key), child.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for name, labels, value in super().samples():
+            yield name + "_total", labels, value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, child in self._children.items():
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                yield self.name + "_bucket", {
+                    **labels,
+                    "le": _format_value(bound),
+                }, cumulative
+            yield self.name + "_sum", labels, child.sum
+            yield self.name + "_count", labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(
+                        f'{label}="{_escape(text)}"' for label, text in labels.items()
+                    )
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to complete the response, body included.",
+    ("method", "route"),
+)
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests being handled.", ("method",)
+)
+HTTP_STAGE_SECONDS = registry.histogram(
+    "http_request_stage_seconds",
+    "Time each request spent waiting on a dependency.",
+    ("route", "stage"),
+)
+HTTP_DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "Database statements executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_QUERY_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time."
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to obtain a pooled connection, waiting and connecting included.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections", "Connections in the database pool.", ("state",)
+)
+LLM_LATENCY = registry.histogram(
+    "llm_request_duration_seconds",
+    "Provider call time including retries.",
+    ("operation", "outcome"),
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens", "Tokens reported by the provider.", ("kind",)
+)
+LLM_QUEUE_WAIT = registry.histogram(
+    "llm_queue_wait_seconds",
+    "Time provider calls waited for a concurrency limiter slot.",
+    ("operation",),
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LLM_FALLBACKS = registry.counter(
+    "llm_offline_fallbacks",
+    "Evaluations answered by the offline heuristics instead of the model.",
+    ("reason",),
+)
+# Scrape-time views of state other components keep; bound in app.main.
+LLM_CONCURRENCY = registry.gauge(
+    "llm_concurrency", "Provider calls holding or awaiting a limiter slot.", ("state",)
+)
+LLM_CIRCUIT_OPEN = registry.gauge(
+    "llm_circuit_open", "1 while the LLM circuit breaker rejects calls."
+)
+EVALUATION_CACHE_LOOKUPS = registry.counter(
+    "evaluation_cache_lookups", "Evaluation cache lookups by outcome.", ("result",)
+)
+SANDBOX_RUNS = registry.counter(
+    "sandbox_runs", "Code sandbox executions by outcome.", ("result",)
+)
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    llm_seconds: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_llm_call(
+    operation: str, outcome: str, seconds: float, usage: Any = None
+) -> None:
+    LLM_LATENCY.labels(operation, outcome).observe(seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.llm_seconds += seconds
+    if usage is not None:
+        for kind in ("input", "output"):
+            tokens = getattr(usage, f"{kind}_tokens", None)
+            if tokens:
+                LLM_TOKENS.labels(kind).inc(tokens)
+
+
+def record_llm_queue_wait(operation: str, seconds: float) -> None:
+    LLM_QUEUE_WAIT.labels(operation).observe(seconds)
+
+
+def record_llm_fallback(reason: str) -> None:
+    LLM_FALLBACKS.labels(reason).inc()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    # SQLAlchemy runs this in a greenlet that shares the awaiting task's context.
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement on ``engine``, attribute it to the current request and expose pool usage."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    if isinstance(sync_engine.pool, QueuePool):
+        # Read through the engine: dispose() swaps in a fresh pool object.
+        DB_POOL_CONNECTIONS.labels("checked_out").set_function(
+            lambda: sync_engine.pool.checkedout()
+        )
+        DB_POOL_CONNECTIONS.labels("idle").set_function(
+            lambda: sync_engine.pool.checkedin()
+        )
+        DB_POOL_CONNECTIONS.labels("overflow").set_function(
+            lambda: max(sync_engine.pool.overflow(), 0)
+        )
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request counts, latency and dependency time.
+
+    Routes are labelled by their path template (``/api/v1/sessions/{session_id}``) so label
+    cardinality stays bounded; requests that match no route share one label.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable[..., Any],
+        send: Callable[..., Any],
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            _request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or _UNMATCHED_ROUTE
+            HTTP_REQUESTS.labels(method, route, status_code).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_DB_QUERIES.labels(route).observe(stats.db_queries)
+            HTTP_STAGE_SECONDS.labels(route, "db").observe(stats.db_seconds)
+            HTTP_STAGE_SECONDS.labels(route, "llm").observe(stats.llm_seconds)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from app.models.enums import QuestionCategory, RoleLevel
+from app.schemas.question import QuestionRead
+from app.schemas.role import RoleRead
+
+logger = structlog.get_logger(__name__)
+
+LEVEL_ORDER: Dict[RoleLevel, int] = {
+    RoleLevel.INTERNSHIP: 0,
+    RoleLevel.ENTRY: 1,
+    RoleLevel.MID: 2,
+    RoleLevel.SENIOR: 3,
+    RoleLevel.STAFF: 4,
+}
+
+# ``None`` as a category key means "any category".
+_CategoryKey = Optional[QuestionCategory]
+
+
+@dataclass
+class _RoleIndex:
+    role_id: int
+    by_category: Dict[_CategoryKey, List[QuestionRead]] = field(default_factory=dict)
+    # (category, target level) -> questions grouped by level distance, closest group first.
+    level_buckets: Dict[Tuple[_CategoryKey, RoleLevel], List[List[QuestionRead]]] = (
+        field(default_factory=dict)
+    )
+
+
+def _build_role_index(role_id: int, questions: List[QuestionRead]) -> _RoleIndex:
+    index = _RoleIndex(role_id=role_id)
+    categories: List[_CategoryKey] = [None, *QuestionCategory]
+    for category in categories:
+        pool = [
+            question
+            for question in questions
+            if category is None or question.category == category
+        ]
+        if not pool:
+            continue
+        index.by_category[category] = pool
+        for target, target_rank in LEVEL_ORDER.items():
+            buckets: Dict[int, List[QuestionRead]] = {}
+            for question in pool:
+                distance = abs(target_rank - LEVEL_ORDER[question.level])
+                buckets.setdefault(distance, []).append(question)
+            index.level_buckets[(category, target)] = [
+                buckets[distance] for distance in sorted(buckets)
+            ]
+    return index
+
+
+class QuestionBank:
+    """Process-local index of the question catalogue, keyed by role slug, category and level.
+
+    The index holds no data of its own: :data:`app.services.reference_cache.reference_cache`
+    rebuilds it from the roles and questions it has loaded, so it follows that cache's version
+    checks, including catalogue changes made by other processes.
+    """
+
+    def __init__(self) -> None:
+        self._roles: Optional[Dict[str, _RoleIndex]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._roles is not None
+
+    def invalidate(self) -> None:
+        self._roles = None
+
+    def rebuild(
+        self, roles: Iterable[RoleRead], questions: Iterable[QuestionRead]
+    ) -> None:
+        slugs = {role.id: role.slug for role in roles}
+        grouped: Dict[int, List[QuestionRead]] = {}
+        for question in questions:
+            grouped.setdefault(question.role_id, []).append(question)
+        self._roles = {
+            slugs[role_id]: _build_role_index(role_id, role_questions)
+            for role_id, role_questions in grouped.items()
+            if role_id in slugs
+        }
+        logger.info(
+            "question_bank_loaded",
+            roles=len(self._roles),
+            questions=sum(len(q) for q in grouped.values()),
+        )
+
+    def sample(
+        self,
+        role_slug: str,
+        *,
+        category: Optional[QuestionCategory] = None,
+        level: Optional[RoleLevel] = None,
+        limit: int = 1,
+        exclude_ids: AbstractSet[int] = frozenset(),
+    ) -> Optional[List[QuestionRead]]:
+        """Pick up to ``limit`` random questions, preferring the closest level.
+
+        Questions whose ids are in ``exclude_ids`` are never returned. Returns ``None`` when the
+        role is not indexed so callers can fall back to the database.
+        """
+        if self._roles is None:
+            return None
+        role_index = self._roles.get(role_slug)
+        if role_index is None:
+            return None
+
+        if level is None:
+            buckets = [role_index.by_category.get(category, [])]
+        else:
+            buckets = role_index.level_buckets.get((category, level), [])
+
+        picked: List[QuestionRead] = []
+        for bucket in buckets:
+            remaining = limit - len(picked)
+            if remaining <= 0:
+                break
+            if exclude_ids:
+                bucket = [
+                    question for question in bucket if question.id not in exclude_ids
+                ]
+            picked.extend(random.sample(bucket, min(remaining, len(bucket))))
+        return picked
+
+
+question_bank = QuestionBank()
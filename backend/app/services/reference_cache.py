@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import structlog
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.app_metadata import get_metadata, set_metadata
+from app.models.tables import Question, Role
+from app.schemas.question import QuestionRead
+from app.schemas.role import RoleRead
+from app.services.question_bank import question_bank
+
+logger = structlog.get_logger(__name__)
+
+REFERENCE_VERSION_KEY = "reference_version"
+
+
+class ReferenceCache:
+    """Process-local read-through cache of roles and questions, keyed by role slug, role id and question id.
+
+    Anything that rewrites the catalogue calls :meth:`bump_version` inside its transaction and
+    :meth:`invalidate` after committing. Other processes notice the new version stamp in
+    ``app_metadata`` at most ``reference_cache_check_interval_sec`` later, with one primary-key
+    lookup per interval, and reload. Every load also rebuilds the :data:`question_bank` index
+    from the rows it read.
+    """
+
+    def __init__(self, check_interval: Optional[float] = None) -> None:
+        self._check_interval = (
+            settings.reference_cache_check_interval_sec
+            if check_interval is None
+            else check_interval
+        )
+        self._roles_by_slug: Optional[Dict[str, RoleRead]] = None
+        self._roles_by_id: Dict[int, RoleRead] = {}
+        self._questions: Dict[int, QuestionRead] = {}
+        self._version: Optional[str] = None
+        self._roles_digest: Optional[str] = None
+        self._checked_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._roles_by_slug is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        """The catalogue version stamp seen by the last load; ``None`` before any seeding."""
+        return self._version
+
+    def roles_digest(self) -> str:
+        """Hash of the cached role list, for HTTP validators."""
+        if self._roles_digest is None:
+            assert self._roles_by_slug is not None
+            payload = json.dumps(
+                [role.model_dump() for role in self._sorted_roles()], sort_keys=True
+            )
+            self._roles_digest = hashlib.sha256(payload.encode()).hexdigest()
+        return self._roles_digest
+
+    def invalidate(self) -> None:
+        self._roles_by_slug = None
+        self._roles_by_id = {}
+        self._questions = {}
+        self._roles_digest = None
+        question_bank.invalidate()
+
+    async def bump_version(self, db: AsyncSession) -> None:
+        """Stamp a new catalogue version in the caller's transaction."""
+        await set_metadata(db, REFERENCE_VERSION_KEY, uuid.uuid4().hex)
+
+    async def load(self, db: AsyncSession) -> None:
+        version = await get_metadata(db, REFERENCE_VERSION_KEY)
+        roles = [
+            RoleRead.model_validate(role)
+            for role in (await db.scalars(select(Role).order_by(Role.name)))
+        ]
+        questions = [
+            QuestionRead.model_validate(question)
+            for question in (await db.scalars(select(Question)))
+        ]
+        self._roles_by_slug = {role.slug: role for role in roles}
+        self._roles_by_id = {role.id: role for role in roles}
+        self._questions = {question.id: question for question in questions}
+        self._version = version
+        self._roles_digest = None
+        self._checked_at = time.monotonic()
+        question_bank.rebuild(roles, questions)
+        logger.info(
+            "reference_cache_loaded",
+            roles=len(roles),
+            questions=len(questions),
+            version=version,
+        )
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if not self.loaded:
+            await self.load(db)
+            return
+        if time.monotonic() - self._checked_at >= self._check_interval:
+            version = await get_metadata(db, REFERENCE_VERSION_KEY)
+            self._checked_at = time.monotonic()
+            if version != self._version:
+                logger.info(
+                    "reference_cache_stale", cached=self._version, current=version
+                )
+                self.invalidate()
+                await self.load(db)
+                return
+        if not question_bank.loaded:
+            question_bank.rebuild(self._roles_by_id.values(), self._questions.values())
+
+    async def roles(self, db: AsyncSession) -> List[RoleRead]:
+        """All roles ordered by name."""
+        await self.ensure_fresh(db)
+        return self._sorted_roles()
+
+    def _sorted_roles(self) -> List[RoleRead]:
+        assert self._roles_by_slug is not None
+        return sorted(self._roles_by_slug.values(), key=lambda role: role.name)
+
+    async def role_by_slug(self, db: AsyncSession, slug: str) -> Optional[RoleRead]:
+        await self.ensure_fresh(db)
+        assert self._roles_by_slug is not None
+        role = self._roles_by_slug.get(slug)
+        if role is None:
+            role = await self._read_role(db, Role.slug == slug)
+        return role
+
+    async def role_by_id(self, db: AsyncSession, role_id: int) -> Optional[RoleRead]:
+        await self.ensure_fresh(db)
+        role = self._roles_by_id.get(role_id)
+        if role is None:
+            role = await self._read_role(db, Role.id == role_id)
+        return role
+
+    async def question(
+        self, db: AsyncSession, question_id: int
+    ) -> Optional[QuestionRead]:
+        return (await self.questions(db, [question_id])).get(question_id)
+
+    async def questions(
+        self, db: AsyncSession, question_ids: Iterable[int]
+    ) -> Dict[int, QuestionRead]:
+        """The known questions among ``question_ids``; cache misses are read with one ``IN`` query."""
+        await self.ensure_fresh(db)
+        found: Dict[int, QuestionRead] = {}
+        missing: List[int] = []
+        for question_id in dict.fromkeys(question_ids):
+            question = self._questions.get(question_id)
+            if question is None:
+                missing.append(question_id)
+            else:
+                found[question_id] = question
+        if missing:
+            # Added since the last load (or never existed): read through and remember hits.
+            for row in await db.scalars(
+                select(Question).where(Question.id.in_(missing))
+            ):
+                found[row.id] = self._questions[row.id] = QuestionRead.model_validate(
+                    row
+                )
+        return found
+
+    async def _read_role(
+        self, db: AsyncSession, condition: ColumnElement[bool]
+    ) -> Optional[RoleRead]:
+        row = await db.scalar(select(Role).where(condition))
+        if row is None:
+            return None
+        role = RoleRead.model_validate(row)
+        if self._roles_by_slug is not None:
+            self._roles_by_slug[role.slug] = role
+            self._roles_by_id[role.id] = role
+            self._roles_digest = None
+        return role
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, TypeVar
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a cool-down period.
+
+    ``failure_threshold`` failures within ``window_seconds`` open the circuit. Once
+    ``cooldown_seconds`` have passed a single probe call is let through: success closes the
+    circuit, failure re-opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        failure_threshold: int,
+        window_seconds: float,
+        cooldown_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("Failure threshold must be at least 1.")
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._window_seconds = window_seconds
+        self._cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._failures: Deque[float] = deque()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._times_opened = 0
+        self._rejected_total = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self._cooldown_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            now = self._clock()
+            # A probe that never reported back (e.g. cancelled) must not wedge the circuit.
+            if (
+                self._probe_started_at is None
+                or now - self._probe_started_at >= self._cooldown_seconds
+            ):
+                self._probe_started_at = now
+                return True
+        self._rejected_total += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+        self._failures.clear()
+
+    def record_failure(self) -> None:
+        now = self._clock()
+        if self._state == CircuitState.HALF_OPEN:
+            self._open(now)
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self._window_seconds:
+            self._failures.popleft()
+        if (
+            self._state == CircuitState.CLOSED
+            and len(self._failures) >= self._failure_threshold
+        ):
+            self._open(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        retry_in = 0.0
+        if state == CircuitState.OPEN:
+            retry_in = max(
+                0.0, self._cooldown_seconds - (self._clock() - self._opened_at)
+            )
+        return {
+            "state": state.value,
+            "recent_failures": len(self._failures),
+            "times_opened": self._times_opened,
+            "rejected_total": self._rejected_total,
+            "retry_in_seconds": round(retry_in, 3),
+        }
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._failures.clear()
+        self._times_opened += 1
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        previous, self._state = self._state, state
+        self._probe_started_at = None
+        if previous != state:
+            logger.warning(
+                "circuit_state_changed",
+                circuit=self.name,
+                previous=previous.value,
+                state=state.value,
+            )
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter between ``max_attempts`` tries."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 4.0
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        return rng.uniform(
+            0.0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+
+async def call_with_retries(
+    operation: Callable[[], Awaitable[T]],
+    *,
+    policy: RetryPolicy,
+    retryable: Callable[[BaseException], bool],
+    breaker: Optional[CircuitBreaker] = None,
+    attempt_timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    rng: Optional[random.Random] = None,
+) -> T:
+    """Run ``operation`` with per-attempt timeouts, jittered retries and an overall deadline.
+
+    Every retryable failure counts against ``breaker``; no attempt starts while it is open. A
+    non-retryable error (e.g. a 4xx) means the dependency answered, so it counts as a success.
+    A retry is skipped when its backoff would overrun ``deadline`` (seconds from the first
+    attempt). Queue for any shared capacity before calling this, so waiting for it never
+    counts against ``attempt_timeout`` or the breaker.
+    """
+    rng = rng or random.Random()
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + deadline if deadline else None
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open.")
+
+        timeout = attempt_timeout
+        if give_up_at is not None:
+            timeout = min(timeout or deadline, max(0.0, give_up_at - loop.time()))
+        attempt += 1
+        try:
+            result = (
+                await asyncio.wait_for(operation(), timeout)
+                if timeout is not None
+                else await operation()
+            )
+        except Exception as exc:
+            can_retry = retryable(exc)
+            if breaker is not None and can_retry:
+                breaker.record_failure()
+            elif breaker is not None:
+                breaker.record_success()
+            if attempt >= policy.max_attempts or not can_retry:
+                raise
+            delay = policy.backoff(attempt, rng)
+            if give_up_at is not None and loop.time() + delay >= give_up_at:
+                raise
+            logger.warning(
+                "retrying_call", attempt=attempt, delay=round(delay, 3), error=repr(exc)
+            )
+            await asyncio.sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
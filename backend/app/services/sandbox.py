@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import builtins
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore[assignment]
+
+from app.core.config import settings
+from app.services.code_analysis import CodeMetrics
+
+logger = structlog.get_logger(__name__)
+
+_WORKER_SCRIPT = Path(__file__).with_name("sandbox_worker.py")
+# Headroom over the wall-clock limit for the zygote to fork, reap and report.
+_REPLY_GRACE_SEC = 2.0
+# A reply re-encodes the worker's report (at most 1 MiB), which can double its size.
+_REPLY_LIMIT_BYTES = 4 * 1024 * 1024
+_MAX_DETAIL_CHARS = 300
+_REPLY_STATUSES = frozenset(
+    {"ran", "timeout", "overflow", "garbled", "crashed", "unavailable"}
+)
+_BUILTIN_EXCEPTIONS = frozenset(
+    name
+    for name, value in vars(builtins).items()
+    if isinstance(value, type) and issubclass(value, BaseException)
+)
+
+
+@dataclass(frozen=True)
+class ExecutionResult:
+    """Outcome of running a code answer against its question's test cases.
+
+    ``status`` is ``passed``, ``failed`` (ran, some cases wrong), ``error`` (did not load or
+    define the entry point) or ``timeout`` (hit the CPU or wall-clock limit).
+    """
+
+    status: str
+    passed: int
+    total: int
+    runtime_ms: float
+    detail: Optional[str] = None
+
+    @property
+    def pass_ratio(self) -> float:
+        return self.passed / self.total if self.total else 0.0
+
+
+def _short(value: Any) -> str:
+    # Only for test-case arguments and expected values, never for what the submission returns.
+    text = repr(value)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+def _exception_name(value: Any) -> str:
+    # A submission can define an exception class with any name, or forge the record.
+    if isinstance(value, str) and value in _BUILTIN_EXCEPTIONS:
+        return value
+    return "an exception"
+
+
+def _stopped_detail(reply: Dict[str, Any]) -> str:
+    signal = reply.get("signal")
+    if isinstance(signal, int) and not isinstance(signal, bool):
+        return f"exited with signal {signal}"
+    return "exited without a result"
+
+
+def grade(reply: Dict[str, Any], test_cases: Dict[str, Any]) -> ExecutionResult:
+    """Score a worker reply against ``test_cases``; ``ValueError`` if the reply is malformed.
+
+    The records in a reply are written from inside the submission's process, so only their
+    count, the JSON values they carry and built-in exception names are used. Pass counts come
+    from ``test_cases`` and every detail is built here from the question author's data.
+    """
+    status = reply.get("status")
+    if status not in _REPLY_STATUSES or status == "unavailable":
+        raise ValueError(f"unexpected sandbox reply status {status!r}")
+    cases: List[Dict[str, Any]] = list(test_cases.get("cases", []))
+    total = len(cases)
+    runtime_ms = float(reply.get("runtime_ms", 0.0))
+
+    def result(
+        outcome: str, passed: int = 0, detail: Optional[str] = None
+    ) -> ExecutionResult:
+        if detail is not None:
+            detail = detail[:_MAX_DETAIL_CHARS]
+        return ExecutionResult(outcome, passed, total, runtime_ms, detail)
+
+    if status == "timeout":
+        return result("timeout")
+    if status == "overflow":
+        return result("error", detail="the code reported too much output")
+    if status == "garbled":
+        return result("error", detail="the run's report could not be read")
+    if status == "crashed":
+        return result("error", detail=_stopped_detail(reply))
+
+    records = reply.get("records")
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        raise ValueError("sandbox reply without a record list")
+    entrypoint = test_cases.get("entrypoint")
+    first = records[0] if records else {}
+    if "load_error" in first:
+        detail = f"{_exception_name(first['load_error'])} while loading"
+        line = first.get("line")
+        if isinstance(line, int) and not isinstance(line, bool):
+            detail += f" (line {line})"
+        return result("error", detail=detail)
+    if first.get("missing") is True:
+        return result(
+            "error", detail=f"the code does not define {entrypoint or 'a function'}"
+        )
+    if len(records) != total:
+        if "signal" in reply:
+            return result("error", detail=_stopped_detail(reply))
+        return result("error", detail="the run's report did not match the test cases")
+
+    name = entrypoint or "the function"
+    passed = 0
+    detail: Optional[str] = None
+    for case, record in zip(cases, records):
+        call = f"{name}({', '.join(map(_short, case.get('args', [])))})"
+        if "value" in record:
+            try:
+                actual = json.loads(record["value"])
+            except (TypeError, ValueError, RecursionError):
+                mismatch = f"{call} returned a value that could not be read"
+            else:
+                if actual == case.get("expected"):
+                    passed += 1
+                    continue
+                expected = _short(case.get("expected"))
+                mismatch = f"{call} returned a different value, expected {expected}"
+        elif "raised" in record:
+            mismatch = f"{call} raised {_exception_name(record['raised'])}"
+        else:
+            mismatch = f"{call} returned a value that is not plain JSON"
+        detail = detail or mismatch
+    return result("passed" if passed == total else "failed", passed, detail)
+
+
+class _Zygote:
+    """One warm ``sandbox_worker`` process; forks a limited child per job."""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self._process = process
+
+    @classmethod
+    async def spawn(cls) -> "_Zygote":
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-I",
+            "-S",
+            str(_WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={"PYTHONHASHSEED": "0"},
+            limit=_REPLY_LIMIT_BYTES,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self._process.returncode is None
+
+    async def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        assert self._process.stdin is not None and self._process.stdout is not None
+        self._process.stdin.write(json.dumps(job).encode() + b"\n")
+        await self._process.stdin.drain()
+        line = await asyncio.wait_for(self._process.stdout.readline(), timeout)
+        if not line:
+            raise ConnectionError("sandbox worker exited")
+        reply = json.loads(line)
+        if not isinstance(reply, dict):
+            raise ValueError("sandbox worker reply is not an object")
+        return reply
+
+    def terminate(self) -> None:
+        if self.alive:
+            self._process.kill()
+
+    async def kill(self) -> None:
+        self.terminate()
+        await self._process.wait()
+
+
+class CodeSandbox:
+    """Runs code answers against test cases in isolated, resource-limited, short-lived processes.
+
+    ``workers`` warm zygotes are kept per event loop; each job is a ``fork`` of one of them, so
+    there is no interpreter start-up per run. The child gets CPU-time, address-space,
+    file-size and process-count rlimits, no network, an unprivileged uid, an empty
+    environment and a seccomp filter (see :mod:`app.services.sandbox_worker`), and is killed
+    at the wall-clock limit. The sandbox is only available on Linux when enabled and running
+    as root; otherwise answers are scored without execution. Workers never see expected
+    values: their replies are graded here by :func:`grade`. Results are cached by a hash of
+    the snippet, the test cases and the limits.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        cpu_seconds: Optional[int] = None,
+        memory_mb: Optional[int] = None,
+        wall_seconds: Optional[float] = None,
+        cache_entries: Optional[int] = None,
+    ) -> None:
+        self._workers = workers or settings.sandbox_workers
+        self._cpu_seconds = cpu_seconds or settings.sandbox_cpu_sec
+        self._memory_mb = memory_mb or settings.sandbox_memory_mb
+        self._wall_seconds = wall_seconds or settings.sandbox_wall_sec
+        self._cache_entries = cache_entries or settings.sandbox_cache_entries
+        self._cache: "OrderedDict[str, ExecutionResult]" = OrderedDict()
+        self._idle: Optional[asyncio.Queue[_Zygote]] = None
+        self._zygotes: List[_Zygote] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.cache_hits = 0
+        self.runs = 0
+
+    @property
+    def available(self) -> bool:
+        return (
+            settings.sandbox_enabled
+            and resource is not None
+            and sys.platform.startswith("linux")
+            and os.geteuid() == 0
+        )
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Subprocess pipes belong to the loop that created them.
+            self._discard()
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            if not self.available:
+                if settings.sandbox_enabled:
+                    logger.warning(
+                        "sandbox_unavailable",
+                        reason="code execution needs Linux and root to isolate runs",
+                    )
+                return
+            idle: asyncio.Queue[_Zygote] = asyncio.Queue()
+            for _ in range(self._workers):
+                zygote = await _Zygote.spawn()
+                self._zygotes.append(zygote)
+                idle.put_nowait(zygote)
+            self._idle = idle
+            logger.info("sandbox_started", workers=self._workers)
+
+    async def stop(self) -> None:
+        zygotes, self._zygotes, self._idle = self._zygotes, [], None
+        for zygote in zygotes:
+            await zygote.kill()
+
+    async def run_answer(
+        self, metrics: Optional[CodeMetrics], test_cases: Optional[Dict[str, Any]]
+    ) -> Optional[ExecutionResult]:
+        """Run the Python an answer's analysis found; ``None`` when there is nothing to run."""
+        if not test_cases or not test_cases.get("cases") or metrics is None:
+            return None
+        if metrics.language != "python" or not metrics.parsed or not metrics.source:
+            return None
+        return await self.run(metrics.source, test_cases)
+
+    async def run(
+        self, code: str, test_cases: Dict[str, Any]
+    ) -> Optional[ExecutionResult]:
+        """Execute ``code`` against ``test_cases``; ``None`` if the sandbox itself is unavailable."""
+        if not self.available:
+            return None
+        cases = list(test_cases.get("cases", []))
+        job = {
+            "code": code,
+            "entrypoint": test_cases.get("entrypoint"),
+            "args": [case.get("args", []) for case in cases],
+            "cpu_sec": self._cpu_seconds,
+            "memory_mb": self._memory_mb,
+            "wall_sec": self._wall_seconds,
+            "uid": settings.sandbox_uid,
+            "gid": settings.sandbox_gid,
+        }
+        key = hashlib.sha256(
+            json.dumps([job, cases], sort_keys=True).encode()
+        ).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        await self.start()
+        assert self._idle is not None
+        zygote = await self._idle.get()
+        try:
+            raw = await zygote.run(job, self._wall_seconds + _REPLY_GRACE_SEC)
+            if raw.get("status") == "unavailable":
+                logger.error(
+                    "sandbox_isolation_failed",
+                    detail=str(raw.get("detail"))[:_MAX_DETAIL_CHARS],
+                )
+                return None
+            result = grade(raw, {**test_cases, "cases": cases})
+        except (asyncio.TimeoutError, ConnectionError, OSError, ValueError) as exc:
+            # Includes replies that fail validation: the worker is out of step, start afresh.
+            logger.error("sandbox_worker_failed", error=repr(exc))
+            zygote = await self._replace(zygote)
+            return None
+        finally:
+            if self._idle is not None:
+                self._idle.put_nowait(zygote)
+
+        self.runs += 1
+        self._cache[key] = result
+        if len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+        return result
+
+    async def _replace(self, zygote: _Zygote) -> _Zygote:
+        await zygote.kill()
+        replacement = await _Zygote.spawn()
+        self._zygotes = [
+            replacement if item is zygote else item for item in self._zygotes
+        ]
+        return replacement
+
+    def _discard(self) -> None:
+        for zygote in self._zygotes:
+            zygote.terminate()
+        self._zygotes, self._idle = [], None
+
+
+code_sandbox = CodeSandbox()
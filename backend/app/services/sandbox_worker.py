@@ -0,0 +1,376 @@
+"""Warm zygote process for :mod:`app.services.sandbox`.
+
+Started as ``python -I -S sandbox_worker.py`` so it imports nothing beyond the standard
+library. It reads one JSON job per line on stdin, forks a fresh child for each job (so no
+interpreter start-up per run and no state shared between runs), isolates the child, and
+writes one JSON reply per line on stdout.
+
+Isolation needs Linux and root. Before running the submission the child moves into a new,
+empty network namespace, applies rlimits, drops to the job's unprivileged uid/gid with no
+supplementary groups, clears its environment and installs a seccomp filter that refuses
+sockets, exec, process creation, signals to other processes and tracing. If any step fails
+the job reports ``unavailable`` and nothing is executed.
+
+The child reports over a pipe of its own: its stdin, stdout and stderr point at
+``/dev/null`` and every other inherited descriptor is closed, so it cannot read jobs or write
+replies on the zygote's protocol. That report is still written from inside the submission's
+process and may be forged, so it only says what each test case returned (as JSON text) or
+raised. Jobs carry no expected values; :mod:`app.services.sandbox` grades the reply.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import resource
+import select
+import signal
+import struct
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Reports beyond this size fail the run; values are rarely more than a few kilobytes.
+_MAX_REPORT_BYTES = 1024 * 1024
+
+
+# Linux constants: unshare(2), prctl(2), seccomp(2) and classic BPF.
+_CLONE_NEWNET = 0x40000000
+_PR_SET_NO_NEW_PRIVS = 38
+_PR_SET_SECCOMP = 22
+_SECCOMP_MODE_FILTER = 2
+_SECCOMP_RET_KILL_PROCESS = 0x80000000
+_SECCOMP_RET_ERRNO = 0x00050000
+_SECCOMP_RET_ALLOW = 0x7FFF0000
+_EPERM = 1
+_BPF_LD_W_ABS = 0x20
+_BPF_JEQ_K = 0x15
+_BPF_JGE_K = 0x35
+_BPF_RET_K = 0x06
+_X32_SYSCALL_BIT = 0x40000000
+
+# audit arch -> syscalls the submission may not make (socket, socketpair, connect, clone,
+# clone3, fork, vfork, execve, execveat, kill, tkill, tgkill, ptrace, process_vm_readv/writev,
+# unshare, setns, mount, bpf).
+_DENIED_SYSCALLS: Dict[str, tuple] = {
+    "x86_64": (
+        0xC000003E,
+        (
+            41,
+            53,
+            42,
+            56,
+            435,
+            57,
+            58,
+            59,
+            322,
+            62,
+            200,
+            234,
+            101,
+            310,
+            311,
+            272,
+            308,
+            165,
+            321,
+        ),
+    ),
+    "aarch64": (
+        0xC00000B7,
+        (
+            198,
+            199,
+            203,
+            220,
+            435,
+            221,
+            281,
+            129,
+            130,
+            131,
+            117,
+            270,
+            271,
+            97,
+            268,
+            40,
+            280,
+        ),
+    ),
+}
+
+
+class IsolationError(RuntimeError):
+    """The child could not be isolated; the submission must not run."""
+
+
+def _seccomp_program() -> Optional[bytes]:
+    machine = os.uname().machine
+    if machine not in _DENIED_SYSCALLS:
+        return None
+    arch, denied = _DENIED_SYSCALLS[machine]
+    kill, deny, allow = (
+        _SECCOMP_RET_KILL_PROCESS,
+        _SECCOMP_RET_ERRNO | _EPERM,
+        _SECCOMP_RET_ALLOW,
+    )
+    # struct sock_filter {u16 code; u8 jt; u8 jf; u32 k}; seccomp_data: nr at 0, arch at 4.
+    program = [
+        (_BPF_LD_W_ABS, 0, 0, 4),
+        (_BPF_JEQ_K, 1, 0, arch),
+        (_BPF_RET_K, 0, 0, kill),
+        (_BPF_LD_W_ABS, 0, 0, 0),
+        (_BPF_JGE_K, 0, 1, _X32_SYSCALL_BIT),
+        (_BPF_RET_K, 0, 0, kill),
+    ]
+    for number in denied:
+        program += [(_BPF_JEQ_K, 0, 1, number), (_BPF_RET_K, 0, 0, deny)]
+    program.append((_BPF_RET_K, 0, 0, allow))
+    return b"".join(struct.pack("HBBI", *instruction) for instruction in program)
+
+
+_SECCOMP_PROGRAM = _seccomp_program() if sys.platform.startswith("linux") else None
+
+
+def _libc() -> Any:
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.prctl.argtypes = [
+        ctypes.c_int,
+        ctypes.c_ulong,
+        ctypes.c_ulong,
+        ctypes.c_ulong,
+        ctypes.c_ulong,
+    ]
+    libc.unshare.argtypes = [ctypes.c_int]
+    return libc
+
+
+def _check(result: int, step: str) -> None:
+    if result != 0:
+        raise IsolationError(f"{step} failed: {os.strerror(ctypes.get_errno())}")
+
+
+def _install_seccomp(libc: Any) -> None:
+    if _SECCOMP_PROGRAM is None:
+        raise IsolationError(f"no seccomp filter for {os.uname().machine}")
+    count = len(_SECCOMP_PROGRAM) // struct.calcsize("HBBI")
+    buffer = ctypes.create_string_buffer(_SECCOMP_PROGRAM, len(_SECCOMP_PROGRAM))
+    # struct sock_fprog {unsigned short len; struct sock_filter *filter}
+    fprog = ctypes.create_string_buffer(
+        struct.pack("HP", count, ctypes.addressof(buffer))
+    )
+    _check(libc.prctl(_PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "no_new_privs")
+    _check(
+        libc.prctl(
+            _PR_SET_SECCOMP, _SECCOMP_MODE_FILTER, ctypes.addressof(fprog), 0, 0
+        ),
+        "seccomp",
+    )
+
+
+def _isolate(job: Dict[str, Any]) -> None:
+    if os.geteuid() != 0:
+        raise IsolationError("the sandbox worker must start as root to drop privileges")
+    libc = _libc()
+    _check(libc.unshare(_CLONE_NEWNET), "unshare(CLONE_NEWNET)")
+    _limit_resources(job)
+    os.setgroups([])
+    os.setgid(int(job["gid"]))
+    os.setuid(int(job["uid"]))
+    if os.getuid() == 0 or os.geteuid() == 0:
+        raise IsolationError("still running as root")
+    os.environ.clear()
+    _install_seccomp(libc)
+
+
+def _error_name(exc: BaseException) -> str:
+    # A submission can define an exception class with any name, or put anything in a message.
+    kind = type(exc)
+    return kind.__name__ if kind.__module__ == "builtins" else "an exception"
+
+
+def _entrypoint(
+    namespace: Dict[str, Any], name: Optional[str]
+) -> Optional[Callable[..., Any]]:
+    if name:
+        found = namespace.get(name)
+        return found if callable(found) else None
+    # No name given: use the last function the submission defined at top level.
+    defined = [
+        value
+        for value in namespace.values()
+        if callable(value)
+        and getattr(value, "__module__", None) == "__submission__"
+        and not isinstance(value, type)
+    ]
+    return defined[-1] if defined else None
+
+
+def _limit_resources(job: Dict[str, Any]) -> None:
+    cpu = int(job["cpu_sec"])
+    memory = int(job["memory_mb"]) * 1024 * 1024
+    limits = [
+        (resource.RLIMIT_CPU, (cpu, cpu + 1)),
+        (resource.RLIMIT_AS, (memory, memory)),
+        (resource.RLIMIT_FSIZE, (0, 0)),
+        (resource.RLIMIT_CORE, (0, 0)),
+        (resource.RLIMIT_NOFILE, (32, 32)),
+    ]
+    if hasattr(resource, "RLIMIT_NPROC"):
+        limits.append((resource.RLIMIT_NPROC, (0, 0)))
+    for kind, value in limits:
+        try:
+            resource.setrlimit(kind, value)
+        except (ValueError, OSError):
+            pass
+
+
+def _report(write_fd: int, record: Dict[str, Any]) -> None:
+    data = (json.dumps(record) + "\n").encode()
+    while data:
+        data = data[os.write(write_fd, data) :]
+
+
+def _execute(job: Dict[str, Any], write_fd: int) -> None:
+    """Run the submission and report one record per test case."""
+    namespace: Dict[str, Any] = {"__name__": "__submission__"}
+    try:
+        exec(compile(job["code"], "<answer>", "exec"), namespace)
+    # Anything the submission raises is reported.
+    except BaseException as exc:  # noqa: BLE001
+        line = exc.lineno if isinstance(exc, SyntaxError) else None
+        _report(write_fd, {"load_error": _error_name(exc), "line": line})
+        return
+
+    function = _entrypoint(namespace, job.get("entrypoint"))
+    if function is None:
+        _report(write_fd, {"missing": True})
+        return
+
+    for args in job["args"]:
+        try:
+            actual = function(*args)
+        except BaseException as exc:  # noqa: BLE001
+            _report(write_fd, {"raised": _error_name(exc)})
+            continue
+        try:
+            # Only plain JSON leaves the child, so no object of the submission's (with its
+            # own ``__eq__``) ever takes part in the comparison.
+            value = json.dumps(actual)
+        except BaseException:  # noqa: BLE001
+            _report(write_fd, {"unserialisable": True})
+            continue
+        _report(write_fd, {"value": value})
+
+
+def _detach_descriptors(write_fd: int) -> None:
+    """Point stdio at ``/dev/null`` and close every other inherited descriptor but ``write_fd``."""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.closerange(3, write_fd)
+    os.closerange(write_fd + 1, os.sysconf("SC_OPEN_MAX"))
+
+
+def _child(job: Dict[str, Any], write_fd: int, workdir: str) -> None:
+    _detach_descriptors(write_fd)
+    os.setpgrp()
+    os.chdir(workdir)
+    try:
+        _isolate(job)
+    except (IsolationError, OSError) as exc:
+        _report(write_fd, {"unavailable": str(exc)})
+        return
+    # Written before any submission code runs, so this record cannot be forged.
+    _report(write_fd, {"isolated": True})
+    _execute(job, write_fd)
+
+
+def _parse_report(data: bytes) -> Dict[str, Any]:
+    records: List[Dict[str, Any]] = []
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+        except (ValueError, RecursionError):
+            return {"status": "garbled"}
+        if not isinstance(record, dict):
+            return {"status": "garbled"}
+        records.append(record)
+    if not records:
+        return {"status": "crashed"}
+    first = records[0]
+    if "unavailable" in first:
+        return {"status": "unavailable", "detail": str(first["unavailable"])}
+    if first != {"isolated": True}:
+        return {"status": "garbled"}
+    return {"status": "ran", "records": records[1:]}
+
+
+def _run_job(job: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    read_fd, write_fd = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            _child(job, write_fd, workdir)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+
+    deadline = started + float(job["wall_sec"])
+    chunks: List[bytes] = []
+    size = 0
+    stopped: Optional[str] = None
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+            stopped = "timeout"
+            break
+        data = os.read(read_fd, 65536)
+        if not data:
+            break
+        size += len(data)
+        if size > _MAX_REPORT_BYTES:
+            stopped = "overflow"
+            break
+        chunks.append(data)
+    os.close(read_fd)
+    if stopped is not None:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    _, status = os.waitpid(pid, 0)
+    runtime_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    if stopped == "timeout" or (
+        os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGXCPU
+    ):
+        return {"status": "timeout", "runtime_ms": runtime_ms}
+    if stopped is not None:
+        return {"status": stopped, "runtime_ms": runtime_ms}
+    reply = _parse_report(b"".join(chunks))
+    if os.WIFSIGNALED(status):
+        # Killed before finishing, typically by the memory limit.
+        reply["signal"] = os.WTERMSIG(status)
+    reply["runtime_ms"] = runtime_ms
+    return reply
+
+
+def main() -> None:
+    workdir = tempfile.mkdtemp(prefix="sandbox-")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = _run_job(json.loads(line), workdir)
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Numeric, case, cast, func, literal, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import QuestionCategory, SessionTier
+from app.models.tables import Answer, Evaluation, Question, Role, Session
+from app.services.evaluation import EvaluationPayload
+from app.services.evaluation_cache import evaluation_cache, evaluation_cache_key
+from app.services.llm import EvaluationStreamEvent, llm_service
+
+
+@dataclass(frozen=True)
+class AnswerContext:
+    """Plain snapshot of everything needed to evaluate an answer, detached from any DB session."""
+
+    answer_id: int
+    session_id: int
+    answer_text: str
+    question_id: int
+    question_text: str
+    category: QuestionCategory
+    requires_code: bool
+    keywords: List[str]
+    role_name: str
+    test_cases: Optional[Dict[str, Any]] = None
+
+    @property
+    def cache_key(self) -> str:
+        return evaluation_cache_key(
+            question_id=self.question_id,
+            question_text=self.question_text,
+            category=self.category,
+            role_name=self.role_name,
+            requires_code=self.requires_code,
+            keywords=self.keywords,
+            answer_text=self.answer_text,
+        )
+
+
+def answer_context_query():
+    return (
+        select(
+            Answer.id,
+            Answer.session_id,
+            Answer.answer_text,
+            Question.id,
+            Question.text,
+            Question.category,
+            Question.requires_code,
+            Question.keywords,
+            Role.name,
+            Question.test_cases,
+        )
+        .join(Question, Answer.question_id == Question.id)
+        .join(Session, Answer.session_id == Session.id)
+        .join(Role, Session.role_id == Role.id)
+    )
+
+
+def context_from_row(row: Any) -> AnswerContext:
+    return AnswerContext(
+        answer_id=row[0],
+        session_id=row[1],
+        answer_text=row[2],
+        question_id=row[3],
+        question_text=row[4],
+        category=row[5],
+        requires_code=row[6],
+        keywords=list(row[7] or []),
+        role_name=row[8],
+        test_cases=row[9],
+    )
+
+
+async def load_answer_context(
+    db: AsyncSession, answer_id: int
+) -> Optional[AnswerContext]:
+    row = (
+        await db.execute(answer_context_query().where(Answer.id == answer_id))
+    ).one_or_none()
+    if row is None:
+        return None
+    return context_from_row(row)
+
+
+async def load_answer_contexts(
+    db: AsyncSession, answer_ids: Sequence[int]
+) -> Dict[int, AnswerContext]:
+    """Load contexts for many answers (with their questions and roles) in a single query."""
+    if not answer_ids:
+        return {}
+    rows = await db.execute(
+        answer_context_query().where(Answer.id.in_(set(answer_ids)))
+    )
+    contexts = (context_from_row(row) for row in rows)
+    return {context.answer_id: context for context in contexts}
+
+
+async def lookup_cached_evaluation(
+    db: AsyncSession, context: AnswerContext
+) -> Optional[EvaluationPayload]:
+    return await evaluation_cache.get(db, context.cache_key)
+
+
+async def generate_evaluation(context: AnswerContext) -> EvaluationPayload:
+    return await llm_service.evaluate_answer(
+        answer_text=context.answer_text,
+        question_text=context.question_text,
+        category=context.category,
+        role_name=context.role_name,
+        requires_code=context.requires_code,
+        question_keywords=context.keywords,
+        test_cases=context.test_cases,
+    )
+
+
+def stream_generated_evaluation(
+    context: AnswerContext,
+) -> AsyncIterator[EvaluationStreamEvent]:
+    return llm_service.stream_evaluation(
+        answer_text=context.answer_text,
+        question_text=context.question_text,
+        category=context.category,
+        role_name=context.role_name,
+        requires_code=context.requires_code,
+        question_keywords=context.keywords,
+        test_cases=context.test_cases,
+    )
+
+
+def stored_source(payload: EvaluationPayload) -> str:
+    # Only model output is ever cached, so a cache hit records the model as its origin.
+    return "llm" if payload.source == "cache" else payload.source
+
+
+def _apply_payload(
+    evaluation: Optional[Evaluation], answer_id: int, payload: EvaluationPayload
+) -> Evaluation:
+    if evaluation is None:
+        return Evaluation(
+            answer_id=answer_id,
+            score=payload.score,
+            rubric=payload.rubric,
+            feedback_markdown=payload.feedback_markdown,
+            suggested_improvements=payload.suggested_improvements,
+            source=stored_source(payload),
+        )
+    evaluation.score = payload.score
+    evaluation.rubric = payload.rubric
+    evaluation.feedback_markdown = payload.feedback_markdown
+    evaluation.suggested_improvements = payload.suggested_improvements
+    evaluation.source = stored_source(payload)
+    return evaluation
+
+
+def _cacheable(
+    pairs: Iterable[Tuple[AnswerContext, EvaluationPayload]]
+) -> Dict[str, EvaluationPayload]:
+    # Only model output is worth caching; offline and fallback scores are cheap and may be transient.
+    return {
+        context.cache_key: payload
+        for context, payload in pairs
+        if payload.source == "llm"
+    }
+
+
+async def lock_session_rollups(db: AsyncSession, session_ids: Iterable[int]) -> None:
+    """Take the sessions' row locks before previous scores are read (no commit).
+
+    Rollups only move by deltas, so two transactions re-scoring the same answer must not both
+    compute theirs from the same old score. A no-op UPDATE is the portable row lock (SQLite
+    ignores ``FOR UPDATE``): a concurrent writer waits here until this transaction ends, then
+    reads the score it stored. Sessions are locked in id order so batches cannot deadlock.
+    """
+    for session_id in sorted(set(session_ids)):
+        await db.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .values(revision=Session.revision)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def store_evaluation(
+    db: AsyncSession, context: AnswerContext, payload: EvaluationPayload
+) -> Evaluation:
+    """Insert or replace the answer's evaluation and refresh the session rollup (no commit)."""
+    await lock_session_rollups(db, [context.session_id])
+    existing = await db.scalar(
+        select(Evaluation)
+        .where(Evaluation.answer_id == context.answer_id)
+        .execution_options(populate_existing=True)
+    )
+    previous_score = existing.score if existing is not None else None
+    evaluation = _apply_payload(existing, context.answer_id, payload)
+    if existing is None:
+        db.add(evaluation)
+
+    await evaluation_cache.put_many(db, _cacheable([(context, payload)]))
+
+    await db.flush()
+    await apply_session_rollup(
+        db,
+        context.session_id,
+        score_delta=payload.score - (previous_score or 0.0),
+        count_delta=0 if previous_score is not None else 1,
+    )
+    return evaluation
+
+
+async def store_evaluations(
+    db: AsyncSession, results: Sequence[Tuple[AnswerContext, EvaluationPayload]]
+) -> Dict[int, Evaluation]:
+    """Persist many evaluations with one lookup, one flush and one rollup per session (no commit)."""
+    answer_ids = [context.answer_id for context, _ in results]
+    await lock_session_rollups(db, [context.session_id for context, _ in results])
+    existing_rows = await db.scalars(
+        select(Evaluation)
+        .where(Evaluation.answer_id.in_(answer_ids))
+        .execution_options(populate_existing=True)
+    )
+    existing = {evaluation.answer_id: evaluation for evaluation in existing_rows}
+
+    stored: Dict[int, Evaluation] = {}
+    deltas: Dict[int, Tuple[float, int]] = {}
+    for context, payload in results:
+        previous = existing.get(context.answer_id) or stored.get(context.answer_id)
+        previous_score = previous.score if previous is not None else None
+        evaluation = _apply_payload(previous, context.answer_id, payload)
+        if previous is None:
+            db.add(evaluation)
+        stored[context.answer_id] = evaluation
+
+        score_delta, count_delta = deltas.get(context.session_id, (0.0, 0))
+        deltas[context.session_id] = (
+            score_delta + payload.score - (previous_score or 0.0),
+            count_delta + (0 if previous_score is not None else 1),
+        )
+
+    await evaluation_cache.put_many(db, _cacheable(results))
+
+    await db.flush()
+    for session_id, (score_delta, count_delta) in deltas.items():
+        await apply_session_rollup(
+            db, session_id, score_delta=score_delta, count_delta=count_delta
+        )
+    return stored
+
+
+async def evaluate_and_store(db: AsyncSession, context: AnswerContext) -> Evaluation:
+    """Evaluate an answer, serving from cache when possible, and persist the result (no commit).
+
+    On a cache miss the open read transaction is committed first so the pooled connection is
+    released while the model call is in flight.
+    """
+    payload = await lookup_cached_evaluation(db, context)
+    if payload is None:
+        await db.commit()
+        payload = await generate_evaluation(context)
+    return await store_evaluation(db, context, payload)
+
+
+async def evaluate_and_store_many(
+    db: AsyncSession, contexts: Sequence[AnswerContext]
+) -> Dict[int, Evaluation]:
+    """Batch variant of :func:`evaluate_and_store`.
+
+    Cache misses are evaluated concurrently; the service's concurrency limiter keeps the number
+    of in-flight provider calls bounded.
+    """
+    cached = await evaluation_cache.get_many(
+        db, [context.cache_key for context in contexts]
+    )
+    misses = [context for context in contexts if context.cache_key not in cached]
+    generated: Dict[int, EvaluationPayload] = {}
+    if misses:
+        await db.commit()
+        payloads = await asyncio.gather(
+            *(generate_evaluation(context) for context in misses)
+        )
+        generated = {
+            context.answer_id: payload for context, payload in zip(misses, payloads)
+        }
+
+    results = [
+        (context, cached.get(context.cache_key) or generated[context.answer_id])
+        for context in contexts
+    ]
+    return await store_evaluations(db, results)
+
+
+async def apply_session_rollup(
+    db: AsyncSession, session_id: int, *, score_delta: float, count_delta: int
+) -> None:
+    """Fold a change in evaluated scores into the session's running aggregates.
+
+    A single UPDATE adjusts ``score_sum``/``evaluated_count`` and derives ``overall_score`` and
+    ``summary_tier`` from the new totals, so the cost is constant however many answers exist.
+    It also bumps ``revision``: the evaluation text may have changed even when the score did not.
+    """
+    new_sum = Session.score_sum + score_delta
+    new_count = Session.evaluated_count + count_delta
+    await db.execute(
+        update(Session)
+        .where(Session.id == session_id)
+        .values(
+            score_sum=new_sum,
+            evaluated_count=new_count,
+            revision=Session.revision + 1,
+            **_derived_rollup(new_sum, new_count),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def recompute_session_rollups(
+    db: AsyncSession, session_ids: Collection[int]
+) -> None:
+    """Rebuild the aggregates of ``session_ids`` from their stored evaluations (no commit).
+
+    Used after bulk rewrites that bypass :func:`apply_session_rollup`. The totals are set first
+    so the derived columns can be computed from them without re-running the aggregates.
+    """
+    if not session_ids:
+        return
+    evaluations_of_session = (
+        select(Evaluation.score)
+        .join(Answer, Answer.id == Evaluation.answer_id)
+        .where(Answer.session_id == Session.id)
+        .subquery()
+    )
+    await db.execute(
+        update(Session)
+        .where(Session.id.in_(session_ids))
+        .values(
+            score_sum=select(
+                func.coalesce(func.sum(evaluations_of_session.c.score), 0.0)
+            ).scalar_subquery(),
+            evaluated_count=select(func.count())
+            .select_from(evaluations_of_session)
+            .scalar_subquery(),
+            revision=Session.revision + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(Session)
+        .where(Session.id.in_(session_ids))
+        .values(**_derived_rollup(Session.score_sum, Session.evaluated_count))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _derived_rollup(score_sum: Any, evaluated_count: Any) -> Dict[str, Any]:
+    tier_type = Session.__table__.c.summary_tier.type
+    return {
+        "overall_score": case(
+            (
+                evaluated_count > 0,
+                func.round(cast(score_sum / evaluated_count, Numeric), 2),
+            ),
+            else_=null(),
+        ),
+        # Compare totals instead of averages so tiers match tier_for_score without dividing.
+        "summary_tier": case(
+            (evaluated_count <= 0, null()),
+            (
+                score_sum < 5.0 * evaluated_count,
+                literal(SessionTier.EXPLORING, tier_type),
+            ),
+            (
+                score_sum < 7.5 * evaluated_count,
+                literal(SessionTier.EMERGING, tier_type),
+            ),
+            else_=literal(SessionTier.READY, tier_type),
+        ),
+    }
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import AbstractSet, Any, Dict, List, Optional
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tables import Answer, Evaluation, Session
+from app.schemas.session import SessionDetail, SessionDetailField
+from app.services.reference_cache import reference_cache
+
+_HEADER_COLUMNS = (
+    Session.id,
+    Session.role_id,
+    Session.level,
+    Session.started_at,
+    Session.ended_at,
+    Session.overall_score,
+    Session.summary_tier,
+    Session.revision,
+)
+_ANSWER_COLUMNS = (
+    Answer.id,
+    Answer.question_id,
+    Answer.answer_text,
+    Answer.started_at,
+    Answer.ended_at,
+    Answer.duration_ms,
+)
+_EVALUATION_COLUMNS = (
+    Evaluation.id.label("evaluation_id"),
+    Evaluation.score,
+    Evaluation.rubric,
+    Evaluation.suggested_improvements,
+)
+
+
+async def load_session_header(db: AsyncSession, session_id: int) -> Optional[Row[Any]]:
+    """The session's own columns, ``revision`` included; ``None`` if it does not exist."""
+    return (
+        await db.execute(select(*_HEADER_COLUMNS).where(Session.id == session_id))
+    ).one_or_none()
+
+
+async def load_session_detail(
+    db: AsyncSession,
+    header: Row[Any],
+    *,
+    exclude: AbstractSet[SessionDetailField] = frozenset(),
+) -> SessionDetail:
+    """Build the detail response from one column-projected answers/evaluations query.
+
+    Roles and questions come from the reference cache, so each distinct question is hydrated
+    once per process rather than once per answer. Columns in ``exclude`` are never read; they
+    are also dropped from the output by :func:`detail_dump_exclude`.
+    """
+    columns: List[Any] = [*_ANSWER_COLUMNS, *_EVALUATION_COLUMNS]
+    if SessionDetailField.TRANSCRIPT_TEXT not in exclude:
+        columns.append(Answer.transcript_text)
+    if SessionDetailField.FEEDBACK_MARKDOWN not in exclude:
+        columns.append(Evaluation.feedback_markdown)
+    rows = (
+        await db.execute(
+            select(*columns)
+            .outerjoin(Evaluation, Evaluation.answer_id == Answer.id)
+            .where(Answer.session_id == header.id)
+            .order_by(Answer.id)
+        )
+    ).all()
+    questions = await reference_cache.questions(db, [row.question_id for row in rows])
+
+    answers: List[Dict[str, Any]] = []
+    for row in rows:
+        evaluation = None
+        if row.evaluation_id is not None:
+            evaluation = {
+                "id": row.evaluation_id,
+                "score": row.score,
+                "rubric": row.rubric,
+                "feedback_markdown": getattr(row, "feedback_markdown", ""),
+                "suggested_improvements": row.suggested_improvements,
+            }
+        answers.append(
+            {
+                "id": row.id,
+                "question": questions.get(row.question_id),
+                "answer_text": row.answer_text,
+                "started_at": row.started_at,
+                "ended_at": row.ended_at,
+                "duration_ms": row.duration_ms,
+                "transcript_text": getattr(row, "transcript_text", None),
+                "evaluation": evaluation,
+            }
+        )
+
+    # Plain dicts validate in pydantic-core without SQLAlchemy attribute access per field.
+    return SessionDetail.model_validate(
+        {
+            "id": header.id,
+            "role": await reference_cache.role_by_id(db, header.role_id),
+            "level": header.level,
+            "started_at": header.started_at,
+            "ended_at": header.ended_at,
+            "overall_score": header.overall_score,
+            "summary_tier": header.summary_tier,
+            "answers": answers,
+        }
+    )
+
+
+def detail_dump_exclude(
+    exclude: AbstractSet[SessionDetailField],
+) -> Optional[Dict[str, Any]]:
+    """``model_dump`` exclude spec that drops the requested answer fields from every answer."""
+    if not exclude:
+        return None
+    per_answer: Dict[str, Any] = {}
+    if SessionDetailField.TRANSCRIPT_TEXT in exclude:
+        per_answer["transcript_text"] = True
+    if SessionDetailField.FEEDBACK_MARKDOWN in exclude:
+        per_answer["evaluation"] = {"feedback_markdown": True}
+    return {"answers": {"__all__": per_answer}}
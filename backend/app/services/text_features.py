@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import re
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+_DIGIT = re.compile(r"\d")
+_COMMENT_MARKERS = ("#", "//")
+
+STAR_TOKENS = ("situation", "task", "action", "result", "impact")
+CUSTOMER_TOKENS = ("customer", "client", "stakeholder")
+FUNCTION_TOKENS = ("def ", "function ", "class ")
+CONTROL_FLOW_TOKENS = ("for ", "while ", "if ", "match ")
+TEST_TOKENS = ("assert", "test", "unit", "expect")
+COMPLEXITY_TOKENS = ("o(", "complexity", "big-o")
+EXAMPLE_TOKENS = ("input", "output")
+
+
+class TextFeatures:
+    """Lazily evaluated signals for one lower-cased answer.
+
+    Every signal is computed at most once and only when asked for, and group checks stop at
+    the first hit. Token lookups use ``str.__contains__``: under CPython that C-level search
+    beats a combined alternation regex, which re-enters the matcher at every text position.
+    """
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._tokens: Dict[str, bool] = {}
+
+    def has(self, token: str) -> bool:
+        found = self._tokens.get(token)
+        if found is None:
+            found = self._tokens[token] = token in self._text
+        return found
+
+    def has_any(self, tokens: Iterable[str]) -> bool:
+        return any(self.has(token) for token in tokens)
+
+    def count(self, tokens: Iterable[str]) -> int:
+        return sum(1 for token in tokens if self.has(token))
+
+    @cached_property
+    def has_digit(self) -> bool:
+        return _DIGIT.search(self._text) is not None
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self._text.splitlines()
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    @cached_property
+    def has_comment_line(self) -> bool:
+        # Most answers contain no marker at all; skip the per-line walk for them.
+        if not any(marker in self._text for marker in _COMMENT_MARKERS):
+            return False
+        return any(line.lstrip().startswith(_COMMENT_MARKERS) for line in self.lines)
+
+
+@lru_cache(maxsize=1024)
+def question_tokens(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Lower-cased, de-duplicated question keywords, computed once per question."""
+    return tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+
+def extract_features(answer_text: str) -> TextFeatures:
+    return TextFeatures(answer_text.lower())
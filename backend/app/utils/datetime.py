@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def as_utc_naive(dt: datetime) -> datetime:
+    """Normalise to naive UTC, the representation stored in the database."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utcnow_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1 @@
+"""Load generator and latency benchmarks for the API (``python -m benchmarks.run --help``)."""
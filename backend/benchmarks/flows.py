@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.stats import LatencyRecorder
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass(frozen=True)
+class FlowConfig:
+    flows: int = 50
+    concurrency: int = 10
+    answers_per_session: int = 3
+    level: str = "entry"
+    warmup_flows: int = 2
+
+
+class FlowError(RuntimeError):
+    pass
+
+
+async def _call(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    endpoint: str,
+    method: str,
+    url: str,
+    **kwargs: Any,
+) -> Any:
+    """Issue one request, timing it under ``endpoint`` (the route template, not the concrete URL)."""
+    async with recorder.measure(endpoint):
+        response = await client.request(method, API_PREFIX + url, **kwargs)
+        if response.status_code >= 400:
+            raise FlowError(
+                f"{method} {url} -> {response.status_code}: {response.text[:200]}"
+            )
+    return response.json()
+
+
+async def interview_flow(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    *,
+    role_slug: str,
+    config: FlowConfig,
+    flow_index: int,
+) -> None:
+    """One candidate: start a session, answer and evaluate questions, then review the results."""
+    session = await _call(
+        client,
+        recorder,
+        "POST /sessions",
+        "POST",
+        "/sessions",
+        json={"role_slug": role_slug, "level": config.level},
+    )
+    session_id = session["id"]
+    questions = await _call(
+        client,
+        recorder,
+        "GET /questions",
+        "GET",
+        "/questions",
+        params={
+            "role": role_slug,
+            "level": config.level,
+            "limit": config.answers_per_session,
+            "session_id": session_id,
+        },
+    )
+
+    started = datetime.now(timezone.utc)
+    for index, question in enumerate(questions):
+        answer = await _call(
+            client,
+            recorder,
+            "POST /sessions/{id}/answers",
+            "POST",
+            f"/sessions/{session_id}/answers",
+            json={
+                "question_id": question["id"],
+                # Unique text per flow so evaluations miss the cache the way real traffic does.
+                "answer_text": (
+                    f"Candidate {flow_index} answer {index}: In that situation my task was to reduce "
+                    f"latency, so I profiled the service, took action on the hot path and the result "
+                    f"was a {10 + (flow_index + index) % 40}% improvement for our customers."
+                ),
+                "started_at": (started + timedelta(minutes=index)).isoformat(),
+                "ended_at": (
+                    started + timedelta(minutes=index, seconds=45)
+                ).isoformat(),
+            },
+        )
+        await _call(
+            client,
+            recorder,
+            "POST /evaluate",
+            "POST",
+            "/evaluate",
+            json={"answer_id": answer["id"]},
+        )
+
+    await _call(
+        client, recorder, "GET /sessions/{id}", "GET", f"/sessions/{session_id}"
+    )
+    await _call(
+        client, recorder, "GET /history", "GET", "/history", params={"limit": 10}
+    )
+
+
+async def fetch_role_slugs(client: httpx.AsyncClient) -> List[str]:
+    response = await client.get(API_PREFIX + "/roles")
+    response.raise_for_status()
+    slugs = [role["slug"] for role in response.json()]
+    if not slugs:
+        raise FlowError("No roles available; seed the database first.")
+    return slugs
+
+
+async def run_flows(
+    client: httpx.AsyncClient,
+    config: FlowConfig,
+    recorder: Optional[LatencyRecorder] = None,
+) -> Dict[str, Any]:
+    """Run ``config.flows`` interview flows with at most ``config.concurrency`` in flight."""
+    recorder = recorder or LatencyRecorder()
+    slugs = await fetch_role_slugs(client)
+    failures: List[str] = []
+
+    async def drain(indices: "itertools.count[int]", limit: int) -> None:
+        for flow_index in indices:
+            if flow_index >= limit:
+                return
+            try:
+                await interview_flow(
+                    client,
+                    recorder,
+                    role_slug=slugs[flow_index % len(slugs)],
+                    config=config,
+                    flow_index=flow_index,
+                )
+            except (FlowError, httpx.HTTPError) as exc:
+                failures.append(str(exc))
+
+    # Warm-up flows populate caches and pools; their timings are discarded.
+    if config.warmup_flows:
+        await drain(itertools.count(config.flows), config.flows + config.warmup_flows)
+        recorder.restart()
+        failures.clear()
+
+    indices = itertools.count()
+    await asyncio.gather(
+        *(drain(indices, config.flows) for _ in range(max(1, config.concurrency)))
+    )
+    recorder.finish()
+
+    summary = recorder.summary()
+    summary["flows"] = config.flows
+    summary["flows_per_sec"] = (
+        round(config.flows / summary["elapsed_sec"], 2)
+        if summary["elapsed_sec"]
+        else 0.0
+    )
+    summary["failures"] = len(failures)
+    summary["failure_samples"] = failures[:5]
+    return summary
@@ -0,0 +1,292 @@
+"""Local OpenAI-compatible server implementing the ``POST /v1/responses`` surface we use.
+
+Point the backend at it to exercise the real ``AsyncOpenAI`` path (pooling, parsing, streaming,
+fallbacks) without network access::
+
+    python -m benchmarks.openai_stub --port 8100 --latency-ms 400 --distribution lognormal \\
+        --error-rate 0.02 --malformed-rate 0.01
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.stub_llm import (
+    LATENCY_DISTRIBUTIONS,
+    StubLatency,
+    chunk_text,
+    fake_evaluation,
+)
+
+
+@dataclass
+class StubServerConfig:
+    latency: StubLatency = field(default_factory=StubLatency)
+    # Fraction of requests answered with ``error_status`` instead of a response.
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Fraction of responses whose output text is truncated, invalid JSON.
+    malformed_rate: float = 0.0
+    stream_chunk_size: int = 24
+    seed: Optional[int] = None
+
+
+@dataclass
+class StubServerStats:
+    requests: int = 0
+    streamed: int = 0
+    errors: int = 0
+    malformed: int = 0
+
+
+def _usage(request_text: str, output_text: str) -> Dict[str, Any]:
+    # Rough 4-characters-per-token estimate; enough to exercise token accounting.
+    input_tokens = max(1, len(request_text) // 4)
+    output_tokens = max(1, len(output_text) // 4)
+    return {
+        "input_tokens": input_tokens,
+        "input_tokens_details": {"cached_tokens": 0},
+        "output_tokens": output_tokens,
+        "output_tokens_details": {"reasoning_tokens": 0},
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+def _response_object(
+    response_id: str,
+    model: str,
+    text: str,
+    *,
+    status: str,
+    usage: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    content: List[Dict[str, Any]] = []
+    output: List[Dict[str, Any]] = []
+    if status == "completed":
+        content.append({"type": "output_text", "text": text, "annotations": []})
+        output.append(
+            {
+                "type": "message",
+                "id": f"msg_{response_id}",
+                "status": "completed",
+                "role": "assistant",
+                "content": content,
+            }
+        )
+    return {
+        "id": f"resp_{response_id}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": status,
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": usage,
+    }
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+def create_stub_app(config: Optional[StubServerConfig] = None) -> FastAPI:
+    config = config or StubServerConfig()
+    rng = random.Random(config.seed)
+    stats = StubServerStats()
+    app = FastAPI(title="OpenAI-compatible stub")
+    app.state.stub_config = config
+    app.state.stub_stats = stats
+
+    def output_text(request: Dict[str, Any]) -> str:
+        text = json.dumps(fake_evaluation(request))
+        if config.malformed_rate and rng.random() < config.malformed_rate:
+            stats.malformed += 1
+            return text[: len(text) // 2]
+        return text
+
+    async def stream_events(
+        response_id: str, model: str, text: str, request_text: str
+    ) -> AsyncIterator[str]:
+        sequence = 0
+
+        def event(payload: Dict[str, Any]) -> str:
+            nonlocal sequence
+            payload["sequence_number"] = sequence
+            sequence += 1
+            return _sse(payload)
+
+        yield event(
+            {
+                "type": "response.created",
+                "response": _response_object(
+                    response_id, model, "", status="in_progress", usage=None
+                ),
+            }
+        )
+        chunks = chunk_text(text, config.stream_chunk_size)
+        delay = config.latency.sample(rng) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield event(
+                {
+                    "type": "response.output_text.delta",
+                    "item_id": f"msg_{response_id}",
+                    "output_index": 0,
+                    "content_index": 0,
+                    "delta": chunk,
+                    "logprobs": [],
+                }
+            )
+        yield event(
+            {
+                "type": "response.completed",
+                "response": _response_object(
+                    response_id,
+                    model,
+                    text,
+                    status="completed",
+                    usage=_usage(request_text, text),
+                ),
+            }
+        )
+
+    @app.post("/v1/responses")
+    async def create_response(request: Request) -> Any:
+        body = await request.json()
+        stats.requests += 1
+        if config.error_rate and rng.random() < config.error_rate:
+            stats.errors += 1
+            await asyncio.sleep(config.latency.sample(rng) / 10)
+            return JSONResponse(
+                status_code=config.error_status,
+                content={
+                    "error": {
+                        "message": "Injected stub failure.",
+                        "type": "server_error",
+                        "code": None,
+                    }
+                },
+            )
+
+        response_id = uuid.uuid4().hex
+        model = str(body.get("model") or "stub-model")
+        text = output_text(body)
+        request_text = json.dumps(body.get("input") or "")
+        if body.get("stream"):
+            stats.streamed += 1
+            return StreamingResponse(
+                stream_events(response_id, model, text, request_text),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(config.latency.sample(rng))
+        return _response_object(
+            response_id,
+            model,
+            text,
+            status="completed",
+            usage=_usage(request_text, text),
+        )
+
+    @app.get("/stats")
+    async def read_stats() -> Dict[str, int]:
+        return dict(vars(stats))
+
+    return app
+
+
+def stub_openai_client(
+    config: Optional[StubServerConfig] = None,
+    *,
+    app: Optional[FastAPI] = None,
+    max_retries: int = 0,
+) -> Any:
+    """An ``AsyncOpenAI`` client wired to an in-process stub app over ASGI (no sockets needed)."""
+    from openai import AsyncOpenAI
+
+    base_url = "http://openai-stub/v1"
+    app = app or create_stub_app(config)
+    http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url=base_url
+    )
+    return AsyncOpenAI(
+        api_key="unused",
+        base_url=base_url,
+        http_client=http_client,
+        max_retries=max_retries,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--latency-ms", type=float, default=300.0, help="Mean (or median) latency"
+    )
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Latency spread")
+    parser.add_argument(
+        "--distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests that fail"
+    )
+    parser.add_argument(
+        "--error-status",
+        type=int,
+        default=500,
+        help="HTTP status for injected failures",
+    )
+    parser.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of outputs with broken JSON",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=24, help="Characters per streamed delta"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    args = parse_args(argv)
+    config = StubServerConfig(
+        latency=StubLatency(
+            mean_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            distribution=args.distribution,
+        ),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+        stream_chunk_size=args.chunk_size,
+        seed=args.seed,
+    )
+    uvicorn.run(
+        create_stub_app(config), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Drive realistic interview flows against the API and report per-endpoint latency.
+
+In-process (default): a throwaway SQLite database is created and seeded, the ASGI app runs with
+its normal lifespan, and the LLM is replaced by a local stub with configurable latency::
+
+    python -m benchmarks.run --flows 200 --concurrency 20 --llm-latency-ms 300
+
+Against a running server (the server's own LLM configuration applies)::
+
+    python -m benchmarks.run --base-url http://127.0.0.1:8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import tempfile
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.init_db import load_seed_data
+from app.services.llm import llm_service
+from benchmarks.flows import FlowConfig, run_flows
+from benchmarks.openai_stub import StubServerConfig, stub_openai_client
+from benchmarks.stats import format_table
+from benchmarks.stub_llm import LATENCY_DISTRIBUTIONS, StubLatency, stubbed_llm
+
+SEED_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "app"
+    / "seeds"
+    / "seed_roles_and_questions.json"
+)
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+async def prepare_database(database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        await load_seed_data(session, SEED_PATH)
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def sdk_stubbed_llm(config: StubServerConfig) -> AsyncIterator[None]:
+    """Send provider calls through the real ``AsyncOpenAI`` SDK to the in-process stub server."""
+    client = stub_openai_client(config)
+    llm_service.use_client(client)
+    try:
+        yield
+    finally:
+        llm_service.use_client(None)
+        await client.close()
+
+
+@asynccontextmanager
+async def in_process_client(
+    args: argparse.Namespace, latency: StubLatency
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Serve the real application over ASGI with a fresh database and a stubbed LLM."""
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        settings.database_url = f"sqlite+aiosqlite:///{Path(workdir) / 'bench.db'}"
+        await prepare_database(settings.database_url)
+
+        from app.main import app
+
+        async with app.router.lifespan_context(app), AsyncExitStack() as stack:
+            if args.llm_transport == "sdk":
+                stub_config = StubServerConfig(
+                    latency=latency,
+                    error_rate=args.llm_error_rate,
+                    malformed_rate=args.llm_malformed_rate,
+                    seed=args.seed,
+                )
+                await stack.enter_async_context(sdk_stubbed_llm(stub_config))
+            else:
+                stack.enter_context(stubbed_llm(latency, seed=args.seed))
+            transport = httpx.ASGITransport(app=app)
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=transport, base_url="http://bench")
+            )
+            yield client
+
+
+@asynccontextmanager
+async def remote_client(
+    base_url: str, concurrency: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60.0
+    ) as client:
+        yield client
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    config = FlowConfig(
+        flows=args.flows,
+        concurrency=args.concurrency,
+        answers_per_session=args.answers,
+        level=args.level,
+        warmup_flows=args.warmup,
+    )
+    latency = StubLatency(
+        mean_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        distribution=args.llm_distribution,
+    )
+    if args.base_url:
+        client_context = remote_client(args.base_url, args.concurrency)
+    else:
+        client_context = in_process_client(args, latency)
+
+    async with client_context as client:
+        summary = await run_flows(client, config)
+
+    return {
+        "label": args.label,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "in-process",
+        "config": asdict(config),
+        "llm_stub": (
+            None
+            if args.base_url
+            else {**asdict(latency), "transport": args.llm_transport}
+        ),
+        "python": platform.python_version(),
+        **summary,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--flows", type=int, default=50, help="Interview flows to run (default: 50)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Flows in flight at once (default: 10)",
+    )
+    parser.add_argument(
+        "--answers",
+        type=int,
+        default=3,
+        help="Answers submitted per session (default: 3)",
+    )
+    parser.add_argument(
+        "--level", default="entry", help="Session level (default: entry)"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=2, help="Untimed warm-up flows (default: 2)"
+    )
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=300.0, help="Stub LLM mean latency"
+    )
+    parser.add_argument(
+        "--llm-jitter-ms", type=float, default=100.0, help="Stub LLM latency jitter"
+    )
+    parser.add_argument(
+        "--llm-distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform"
+    )
+    parser.add_argument(
+        "--llm-transport",
+        choices=("inline", "sdk"),
+        default="inline",
+        help="inline: fake client object; sdk: real AsyncOpenAI SDK against the stub server over ASGI",
+    )
+    parser.add_argument(
+        "--llm-error-rate",
+        type=float,
+        default=0.0,
+        help="Injected failures (sdk transport)",
+    )
+    parser.add_argument(
+        "--llm-malformed-rate",
+        type=float,
+        default=0.0,
+        help="Broken JSON outputs (sdk transport)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for the stub's latency sampling"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Benchmark a running server instead of in-process",
+    )
+    parser.add_argument(
+        "--label", default=None, help="Free-form label stored with the results"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Where to write the JSON results (default: benchmarks/results/<timestamp>.json)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # Per-request client logging would dominate the output (and the timings) under load.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = asyncio.run(run(args))
+    print(format_table(results))
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = (
+            RESULTS_DIR
+            / f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+        )
+    output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Compare CPU spent turning a session detail into response bytes.
+
+Builds an in-memory ``Session`` graph (no database) and times three encoders per request:
+FastAPI's validate-and-convert path rendered by the stdlib ``JSONResponse``, the same path
+rendered by ``ORJSONResponse``, and :func:`app.api.responses.model_response` (one validation,
+then orjson)::
+
+    python -m benchmarks.serialization --answers 30 --iterations 300
+
+Two more rows time only the bytes step for an already validated model: ``model_response``'s
+JSON-mode dump re-encoded by orjson against pydantic-core writing the bytes directly
+(``model_dump_json``). ``model_response`` keeps the intermediate dump only while it wins that
+comparison; orjson escapes long strings faster, so vary ``--feedback-chars`` to check it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import model_response
+from app.models.enums import QuestionCategory, RoleLevel
+from app.models.tables import Answer, Evaluation, Question, Role, Session
+from app.schemas.session import SessionDetail
+
+_RESPONSE_FIELD = create_model_field(
+    "Response_get_session_detail", SessionDetail, mode="serialization"
+)
+
+
+def build_session(answers: int, feedback_chars: int = 4000) -> Session:
+    """A session with ``answers`` evaluated answers over a handful of repeated questions."""
+    role = Role(
+        id=1,
+        name="Software Developer",
+        slug="software-developer",
+        description="Builds software.",
+    )
+    questions = [
+        Question(
+            id=index + 1,
+            role_id=1,
+            text=f"Question {index}: walk me through a design decision you would revisit.",
+            category=QuestionCategory.TECHNICAL,
+            level=RoleLevel.MID,
+            difficulty=3,
+            expected_duration_sec=180,
+            requires_code=False,
+            keywords=["design", "trade-offs", "testing"],
+        )
+        for index in range(5)
+    ]
+    started = datetime(2025, 1, 1, 9, 0, 0)
+    session = Session(
+        id=1,
+        role_id=1,
+        role=role,
+        level=RoleLevel.MID,
+        started_at=started,
+        overall_score=7.4,
+    )
+    paragraph = (
+        "- **Strength:** explained the trade-off clearly with a concrete metric.\n"
+    )
+    feedback = (paragraph * (feedback_chars // len(paragraph) + 1))[:feedback_chars]
+    for index in range(answers):
+        answer = Answer(
+            id=index + 1,
+            session_id=1,
+            question_id=questions[index % len(questions)].id,
+            question=questions[index % len(questions)],
+            answer_text="I measured the p95 before and after, then rolled the change out behind a flag. "
+            * 6,
+            started_at=started + timedelta(minutes=3 * index),
+            ended_at=started + timedelta(minutes=3 * index + 2),
+            duration_ms=120_000,
+            transcript_text="um so I measured the p95 first " * 20,
+        )
+        answer.evaluation = Evaluation(
+            id=index + 1,
+            answer_id=index + 1,
+            score=7.5,
+            rubric={
+                "clarity": 8.0,
+                "correctness": 7.0,
+                "structure": 7.5,
+                "relevance": 8.0,
+            },
+            feedback_markdown=feedback,
+            suggested_improvements=["Quantify the impact.", "Mention rollback."],
+        )
+        session.answers.append(answer)
+    return session
+
+
+async def _fastapi_path(session: Session, response_class: type) -> bytes:
+    content = await serialize_response(field=_RESPONSE_FIELD, response_content=session)
+    return response_class(content).body
+
+
+async def _model_response_path(session: Session) -> bytes:
+    return model_response(SessionDetail.model_validate(session)).body
+
+
+async def _encode_dump_orjson(detail: SessionDetail) -> bytes:
+    return model_response(detail).body
+
+
+async def _encode_dump_json(detail: SessionDetail) -> bytes:
+    return Response(
+        detail.__pydantic_serializer__.to_json(detail), media_type="application/json"
+    ).body
+
+
+async def _cpu_per_call(
+    encode: Callable[[], Awaitable[bytes]], iterations: int, repeats: int = 5
+) -> float:
+    """Best-of-``repeats`` CPU time per call; the minimum is the least noisy estimate."""
+    await encode()  # warm caches outside the timing
+    calls = max(1, iterations // repeats)
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.process_time()
+        for _ in range(calls):
+            await encode()
+        best = min(best, (time.process_time() - started) / calls)
+    return best
+
+
+async def run(
+    answers: int, iterations: int, feedback_chars: int = 4000
+) -> Dict[str, Any]:
+    session = build_session(answers, feedback_chars)
+    detail = SessionDetail.model_validate(session)
+    encoders = {
+        "fastapi+json": lambda: _fastapi_path(session, JSONResponse),
+        "fastapi+orjson": lambda: _fastapi_path(session, ORJSONResponse),
+        "model_response": lambda: _model_response_path(session),
+        "encode:dump+orjson": lambda: _encode_dump_orjson(detail),
+        "encode:dump_json": lambda: _encode_dump_json(detail),
+    }
+    bodies = {name: await encode() for name, encode in encoders.items()}
+    reference = json.loads(bodies["fastapi+json"])
+    mismatched = [
+        name for name, body in bodies.items() if json.loads(body) != reference
+    ]
+    if mismatched:
+        raise AssertionError(f"Encoders disagree on the payload: {mismatched}")
+
+    timings = {
+        name: await _cpu_per_call(encode, iterations)
+        for name, encode in encoders.items()
+    }
+    baseline = timings["fastapi+json"]
+    return {
+        "answers": answers,
+        "iterations": iterations,
+        "body_bytes": len(bodies["model_response"]),
+        "encoders": {
+            name: {
+                "cpu_us_per_request": round(seconds * 1e6, 1),
+                "speedup": round(baseline / seconds, 2),
+            }
+            for name, seconds in timings.items()
+        },
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--answers", type=int, default=30, help="Answers in the session (default: 30)"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=300,
+        help="Timed encodes per encoder (default: 300)",
+    )
+    parser.add_argument(
+        "--feedback-chars",
+        type=int,
+        default=4000,
+        help="feedback_markdown length per answer",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    results = asyncio.run(run(args.answers, args.iterations, args.feedback_chars))
+    print(
+        f"session detail: {results['answers']} answers, {results['body_bytes']} bytes"
+    )
+    for name, stats in results["encoders"].items():
+        print(
+            f"  {name:<20} {stats['cpu_us_per_request']:>10.1f} us/request  x{stats['speedup']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+class LatencyRecorder:
+    """Collects per-endpoint request latencies and error counts for one benchmark run."""
+
+    def __init__(self) -> None:
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+    def record(self, endpoint: str, seconds: float, *, ok: bool = True) -> None:
+        self._samples[endpoint].append(seconds)
+        if not ok:
+            self._errors[endpoint] += 1
+
+    @asynccontextmanager
+    async def measure(self, endpoint: str) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(endpoint, time.perf_counter() - start, ok=ok)
+
+    def restart(self) -> None:
+        self._samples.clear()
+        self._errors.clear()
+        self._started = time.perf_counter()
+        self._finished = None
+
+    def finish(self) -> None:
+        self._finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        endpoints: Dict[str, Any] = {}
+        for endpoint in sorted(self._samples):
+            samples = sorted(self._samples[endpoint])
+            endpoints[endpoint] = {
+                "count": len(samples),
+                "errors": self._errors.get(endpoint, 0),
+                "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+                "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+                "max_ms": round(samples[-1] * 1000, 2),
+            }
+        total = sum(len(samples) for samples in self._samples.values())
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def format_table(summary: Dict[str, Any]) -> str:
+    header = f"{'endpoint':<36} {'count':>6} {'err':>4} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [header, "-" * len(header)]
+    for endpoint, stats in summary["endpoints"].items():
+        lines.append(
+            f"{endpoint:<36} {stats['count']:>6} {stats['errors']:>4} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+        )
+    lines.append(
+        f"total: {summary['requests']} requests in {summary['elapsed_sec']}s ({summary['rps']} req/s)"
+    )
+    return "\n".join(lines)
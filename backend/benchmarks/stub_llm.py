@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from collections.abc import AsyncIterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.llm import LLMEvaluationService, llm_service
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+@dataclass(frozen=True)
+class StubLatency:
+    """Simulated provider latency in seconds, drawn around ``mean_ms``.
+
+    ``uniform`` spreads samples up to ``jitter_ms`` either side of the mean; ``lognormal`` uses
+    ``mean_ms`` as the median and ``jitter_ms / mean_ms`` as sigma, giving the long tail real
+    providers show; ``fixed`` ignores the jitter.
+    """
+
+    mean_ms: float = 300.0
+    jitter_ms: float = 100.0
+    distribution: str = "uniform"
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed":
+            return self.mean_ms / 1000.0
+        if self.distribution == "lognormal":
+            return (
+                rng.lognormvariate(
+                    math.log(self.mean_ms), self.jitter_ms / self.mean_ms
+                )
+                / 1000.0
+            )
+        low = max(0.0, self.mean_ms - self.jitter_ms)
+        return rng.uniform(low, self.mean_ms + self.jitter_ms) / 1000.0
+
+
+def _user_prompt(request: Dict[str, Any]) -> str:
+    for message in request.get("input") or []:
+        if isinstance(message, dict) and message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def fake_evaluation(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Deterministic evaluation JSON for a ``responses.create`` request body."""
+    prompt = _user_prompt(request)
+    answer = prompt.split("Answer:", 1)[-1].split("Respond ONLY", 1)[0].strip()
+    digest = int(hashlib.sha256(answer.encode("utf-8")).hexdigest()[:8], 16)
+    score = round(3.0 + (digest % 70) / 10.0, 1)
+    return {
+        "score": score,
+        "feedback_markdown": (
+            "Coaching Highlights -\n"
+            f"- Answer length: {len(answer.split())} words.\n"
+            "- Stubbed provider response for load testing."
+        ),
+        "rubric": {"clarity": score, "structure": score, "relevance": score},
+        "suggested_improvements": [
+            "Quantify the outcome to underscore impact.",
+            "State the trade-offs you considered.",
+        ],
+    }
+
+
+def chunk_text(text: str, size: int = 24) -> List[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)] or [""]
+
+
+class _StubResponses:
+    def __init__(self, latency: StubLatency, rng: random.Random) -> None:
+        self._latency = latency
+        self._rng = rng
+
+    async def create(self, *, stream: bool = False, **request: Any) -> Any:
+        body = json.dumps(fake_evaluation(request))
+        if stream:
+            return self._stream(body)
+        await asyncio.sleep(self._latency.sample(self._rng))
+        return SimpleNamespace(output_text=body)
+
+    async def _stream(self, body: str) -> AsyncIterator[Any]:
+        chunks = chunk_text(body)
+        delay = self._latency.sample(self._rng) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield SimpleNamespace(type="response.output_text.delta", delta=chunk)
+        yield SimpleNamespace(type="response.completed")
+
+
+class StubOpenAIClient:
+    """In-process stand-in for ``AsyncOpenAI`` covering the ``responses.create`` surface we use."""
+
+    def __init__(self, latency: StubLatency, *, seed: Optional[int] = None) -> None:
+        self.responses = _StubResponses(latency, random.Random(seed))
+
+    async def close(self) -> None:
+        return None
+
+
+@contextmanager
+def stubbed_llm(
+    latency: StubLatency,
+    *,
+    service: LLMEvaluationService = llm_service,
+    seed: Optional[int] = None,
+) -> Iterator[StubOpenAIClient]:
+    """Point ``service`` at a :class:`StubOpenAIClient` for the duration of the block."""
+    client = StubOpenAIClient(latency, seed=seed)
+    service.use_client(client)
+    try:
+        yield client
+    finally:
+        service.use_client(None)
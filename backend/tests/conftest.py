@@ -15,6 +15,7 @@ from app.core.config import settings
 from app.db.base import Base
 from app.db.init_db import load_seed_data
 from app.db.session import session_context
+from app.services.metrics import instrument_engine
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -37,6 +38,7 @@ async def app_fixture() -> AsyncIterator[FastAPI]:
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    instrument_engine(engine)
     session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
     session_context.configure(session_factory=session_factory)
 
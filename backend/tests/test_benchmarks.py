@@ -0,0 +1,48 @@
+import pytest
+
+from app.services.llm import llm_service
+from benchmarks import serialization
+from benchmarks.flows import FlowConfig, run_flows
+from benchmarks.stats import percentile
+from benchmarks.stub_llm import StubLatency, stubbed_llm
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_benchmark_flows_report_every_endpoint(client):
+    config = FlowConfig(flows=2, concurrency=2, answers_per_session=1, warmup_flows=0)
+    with stubbed_llm(StubLatency(mean_ms=0, jitter_ms=0), seed=1):
+        summary = await run_flows(client, config)
+
+    assert summary["failures"] == 0
+    assert set(summary["endpoints"]) == {
+        "POST /sessions",
+        "GET /questions",
+        "POST /sessions/{id}/answers",
+        "POST /evaluate",
+        "GET /sessions/{id}",
+        "GET /history",
+    }
+    for stats in summary["endpoints"].values():
+        assert stats["count"] == 2
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    # The stub is detached again once the block exits.
+    assert llm_service._client is None
+
+
+async def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == pytest.approx(2.5)
+    assert percentile([5.0], 0.99) == 5.0
+    assert percentile([], 0.5) == 0.0
+
+
+async def test_serialization_benchmark_encoders_agree():
+    results = await serialization.run(answers=2, iterations=2)
+    assert set(results["encoders"]) == {
+        "fastapi+json",
+        "fastapi+orjson",
+        "model_response",
+        "encode:dump+orjson",
+        "encode:dump_json",
+    }
+    assert results["body_bytes"] > 0
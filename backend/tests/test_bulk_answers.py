@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.db.session import session_context
+from app.models.tables import Answer, Session
+from app.services.jobs import evaluation_workers
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _session_and_questions(client, role="software-developer", limit=3):
+    session_id = (
+        await client.post("/api/v1/sessions", json={"role_slug": role})
+    ).json()["id"]
+    questions = (
+        await client.get("/api/v1/questions", params={"role": role, "limit": limit})
+    ).json()
+    return session_id, [question["id"] for question in questions]
+
+
+def _answers(question_ids):
+    started = datetime.now(tz=timezone.utc)
+    return [
+        {
+            "question_id": question_id,
+            "answer_text": f"Answer {index}: I measured the outcome and shared it.",
+            "started_at": (started + timedelta(minutes=index)).isoformat(),
+            "ended_at": (started + timedelta(minutes=index, seconds=45)).isoformat(),
+        }
+        for index, question_id in enumerate(question_ids)
+    ]
+
+
+async def test_bulk_submission_stores_answers_and_queues_evaluations(client):
+    session_id, question_ids = await _session_and_questions(client)
+    payload = {"answers": _answers(question_ids), "evaluate": True}
+
+    async with session_context.session() as db:
+        sync_engine = db.get_bind()
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.post(
+            f"/api/v1/sessions/{session_id}/answers/bulk", json=payload
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [answer["question"]["id"] for answer in body["answers"]] == question_ids
+    assert all(answer["duration_ms"] == 45_000 for answer in body["answers"])
+    assert len(body["evaluation_job_ids"]) == len(question_ids)
+    # One session lookup and one session update whatever the batch size. SQLite cannot return
+    # multi-row INSERT ids in parameter order, so there each answer and job is its own INSERT.
+    assert sorted(statements) == ["INSERT"] * 2 * len(question_ids) + [
+        "SELECT",
+        "UPDATE",
+    ]
+
+    while await evaluation_workers.run_once("test-worker"):
+        pass
+    detail = (await client.get(f"/api/v1/sessions/{session_id}")).json()
+    assert all(answer["evaluation"] is not None for answer in detail["answers"])
+    assert detail["ended_at"].startswith(payload["answers"][-1]["ended_at"][:19])
+
+
+async def test_bulk_submission_rejects_the_whole_batch(client):
+    session_id, question_ids = await _session_and_questions(client)
+    _, foreign_ids = await _session_and_questions(client, role="data-engineer", limit=1)
+
+    wrong_role = await client.post(
+        f"/api/v1/sessions/{session_id}/answers/bulk",
+        json={"answers": _answers([*question_ids, *foreign_ids])},
+    )
+    assert wrong_role.status_code == 400
+    assert wrong_role.json()["detail"].startswith(f"answers[{len(question_ids)}]:")
+
+    unknown = await client.post(
+        f"/api/v1/sessions/{session_id}/answers/bulk",
+        json={"answers": _answers([question_ids[0], 999_999])},
+    )
+    assert unknown.status_code == 404
+    assert "999999" in unknown.json()["detail"]
+
+    inverted = _answers(question_ids)
+    inverted[1]["ended_at"] = inverted[1]["started_at"]
+    assert (
+        await client.post(
+            f"/api/v1/sessions/{session_id}/answers/bulk", json={"answers": inverted}
+        )
+    ).status_code == 400
+    assert (
+        await client.post(
+            f"/api/v1/sessions/{session_id}/answers/bulk", json={"answers": []}
+        )
+    ).status_code == 422
+
+    async with session_context.session() as db:
+        stored = await db.scalar(
+            select(func.count(Answer.id)).where(Answer.session_id == session_id)
+        )
+        session_obj = await db.get(Session, session_id)
+    assert stored == 0
+    assert session_obj.revision == 0
@@ -0,0 +1,91 @@
+import pytest
+
+from app.models.enums import QuestionCategory
+from app.services.code_analysis import CodeAnalyzer, analyze_source
+from app.services.llm import llm_service
+
+SNIPPET = """Here is my solution:
+
+```python
+def reverse_words(sentence):
+    parts = sentence.split(" ")
+    for index, part in enumerate(parts):
+        if part and index % 2 or not part:
+            continue
+    return " ".join(reversed(parts))
+
+assert reverse_words("hello  world") == "world  hello"
+```
+"""
+
+
+def test_python_answer_is_counted_from_its_ast():
+    metrics = analyze_source(SNIPPET)
+
+    assert metrics.language == "python" and metrics.parsed
+    assert (metrics.functions, metrics.loops, metrics.branches, metrics.asserts) == (
+        1,
+        1,
+        1,
+        1,
+    )
+    # 1 + for + if + two extra boolean operands
+    assert metrics.cyclomatic_complexity == 5
+
+
+def test_syntax_errors_and_prose_are_told_apart():
+    broken = analyze_source("My attempt:\ndef reverse(s)\n    return s[::-1]")
+    assert broken.language == "python"
+    assert broken.syntax_error and broken.error_line == 1
+
+    js = analyze_source(
+        "const debounce = (fn, ms) => {\n  let t;\n  if (t) { clearTimeout(t); }\n"
+    )
+    assert js.language == "javascript" and js.syntax_error == "'{' was never closed"
+
+    assert (
+        analyze_source("I would split on spaces and join in reverse order.").language
+        is None
+    )
+
+
+def test_code_evaluation_uses_static_analysis():
+    # "for " and "def " appear in prose only; the parsed code has neither.
+    answer = (
+        "I'd look for a def clean approach.\n```python\nresult = sentence[::-1]\n```"
+    )
+    payload = llm_service.heuristic_evaluation(
+        answer_text=answer,
+        question_text="Reverse a sentence",
+        category=QuestionCategory.TECHNICAL,
+        requires_code=True,
+    )
+    assert payload.rubric["structure"] == 6.0
+    assert payload.rubric["correctness"] == 4.5
+
+    broken = llm_service.heuristic_evaluation(
+        answer_text="def reverse(s)\n    return s",
+        question_text="Reverse a sentence",
+        category=QuestionCategory.TECHNICAL,
+        requires_code=True,
+    )
+    assert broken.rubric["correctness"] == 3.0
+    assert broken.suggested_improvements[0].startswith("Fix the syntax error on line 1")
+
+
+@pytest.mark.asyncio
+async def test_analyzer_bounds_size_and_time():
+    threaded = CodeAnalyzer(workers=0, timeout=5, max_chars=len(SNIPPET))
+    assert (await threaded.analyze(SNIPPET)).functions == 1
+    assert await threaded.analyze(SNIPPET + " ") is None
+
+    pooled = CodeAnalyzer(workers=1, timeout=10, max_chars=10_000)
+    try:
+        assert (await pooled.analyze(SNIPPET)).asserts == 1
+    finally:
+        pooled.shutdown()
+
+    # Far below the worker start-up time: the task is abandoned and the pool replaced.
+    impatient = CodeAnalyzer(workers=1, timeout=0.001, max_chars=10_000)
+    assert await impatient.analyze(SNIPPET) is None
+    assert impatient._pool is None
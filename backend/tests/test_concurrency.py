@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.services.concurrency import ConcurrencyLimiter
+from app.services.llm import LLMEvaluationService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_limiter_bounds_concurrency_and_preserves_order():
+    limiter = ConcurrencyLimiter(limit=2)
+    active = 0
+    peak = 0
+    started_order = []
+
+    async def worker(index: int) -> None:
+        nonlocal active, peak
+        async with limiter.slot():
+            started_order.append(index)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    tasks = []
+    for index in range(6):
+        tasks.append(asyncio.create_task(worker(index)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert started_order == list(range(6))
+    stats = limiter.snapshot()
+    assert stats["acquired_total"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+
+async def test_limiter_releases_slot_when_waiter_cancelled():
+    limiter = ConcurrencyLimiter(limit=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    limiter.release()
+
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
+
+
+async def test_stubbed_service_skips_http_pool(monkeypatch):
+    monkeypatch.setenv("CI", "true")
+    service = LLMEvaluationService(api_key="real-key", max_concurrency=3)
+
+    await service.startup()
+    assert service._http_client is None
+    assert service.limiter.limit == 3
+    await service.aclose()
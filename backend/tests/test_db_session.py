@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import text
+
+from app.db.session import TimedQueuePool, create_engine_and_sessionmaker
+from app.services.metrics import registry
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_file_sqlite_gets_pool_and_pragmas(tmp_path):
+    engine, session_factory = create_engine_and_sessionmaker(
+        f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    )
+    try:
+        assert isinstance(engine.pool, TimedQueuePool)
+        async with session_factory() as db:
+            pragmas = {
+                name: (await db.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "busy_timeout", "synchronous")
+            }
+        assert pragmas == {
+            "journal_mode": "wal",
+            "busy_timeout": 5000,
+            "synchronous": 1,
+        }
+        assert 'db_pool_connections{state="idle"} 1' in registry.render()
+        assert "db_pool_checkout_seconds_count" in registry.render()
+    finally:
+        await engine.dispose()
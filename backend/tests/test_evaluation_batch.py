@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.session import session_context
+from app.models.tables import Session
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_batch_evaluation_scores_all_answers_and_rolls_up(client):
+    session_id = (
+        await client.post(
+            "/api/v1/sessions",
+            json={"role_slug": "software-developer", "level": "entry"},
+        )
+    ).json()["id"]
+    questions = (
+        await client.get(
+            "/api/v1/questions",
+            params={
+                "role": "software-developer",
+                "category": "behavioral",
+                "level": "entry",
+                "limit": 2,
+            },
+        )
+    ).json()
+
+    answer_ids = []
+    start_time = datetime.now(tz=timezone.utc)
+    for index, question in enumerate(questions):
+        response = await client.post(
+            f"/api/v1/sessions/{session_id}/answers",
+            json={
+                "question_id": question["id"],
+                "answer_text": f"Situation {index}: I took action and improved the result by {index + 10}%.",
+                "started_at": (start_time + timedelta(minutes=index)).isoformat(),
+                "ended_at": (
+                    start_time + timedelta(minutes=index, seconds=50)
+                ).isoformat(),
+            },
+        )
+        answer_ids.append(response.json()["id"])
+
+    response = await client.post(
+        "/api/v1/evaluate/batch",
+        json={"answer_ids": [*answer_ids, answer_ids[0], 999999]},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [item["answer_id"] for item in payload["evaluations"]] == answer_ids
+    assert payload["missing_answer_ids"] == [999999]
+
+    scores = [item["evaluation"]["score"] for item in payload["evaluations"]]
+    detail = (await client.get(f"/api/v1/sessions/{session_id}")).json()
+    assert detail["overall_score"] == pytest.approx(sum(scores) / len(scores), abs=0.01)
+    assert all(answer["evaluation"] for answer in detail["answers"])
+
+    # Re-evaluating replaces scores in place: the running aggregates must not double count.
+    await client.post("/api/v1/evaluate", json={"answer_id": answer_ids[0]})
+    await client.post("/api/v1/evaluate/batch", json={"answer_ids": answer_ids})
+    async with session_context.session() as db:
+        session_row = await db.get(Session, session_id)
+    assert session_row.evaluated_count == 2
+    assert session_row.score_sum == pytest.approx(sum(scores))
+    assert session_row.summary_tier.value == detail["summary_tier"]
+
+
+async def test_batch_evaluation_validates_size(client):
+    response = await client.post("/api/v1/evaluate/batch", json={"answer_ids": []})
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.db.session import session_context
+from app.models.enums import QuestionCategory, SessionTier
+from app.models.tables import EvaluationCacheEntry
+from app.services.evaluation import EvaluationPayload
+from app.services.evaluation_cache import EvaluationCache, evaluation_cache_key
+from app.utils.datetime import utcnow_naive
+
+pytestmark = pytest.mark.asyncio
+
+
+def _key(answer_text: str) -> str:
+    return evaluation_cache_key(
+        question_id=1,
+        question_text="Describe a cache.",
+        category=QuestionCategory.TECHNICAL,
+        role_name="Software Developer",
+        requires_code=False,
+        keywords=["cache", "ttl"],
+        answer_text=answer_text,
+    )
+
+
+def _payload() -> EvaluationPayload:
+    return EvaluationPayload(
+        score=8.0,
+        feedback_markdown="Great answer.",
+        rubric={"clarity": 8.0},
+        suggested_improvements=["Mention eviction."],
+        readiness_tier=SessionTier.READY,
+        source="llm",
+    )
+
+
+async def test_cache_key_depends_on_answer_content():
+    assert _key("An LRU with expiry.") == _key("  An LRU with expiry.  ")
+    assert _key("An LRU with expiry.") != _key("A plain dict.")
+
+
+async def test_cache_serves_memory_then_persistent_tier(app_fixture):
+    cache = EvaluationCache(max_entries=8, ttl_seconds=60)
+    key = _key("An LRU with expiry.")
+
+    async with session_context.session() as db:
+        assert await cache.get(db, key) is None
+        await cache.put(db, key, _payload())
+        await db.commit()
+
+        memory_hit = await cache.get(db, key)
+        assert memory_hit is not None
+        assert memory_hit.score == 8.0
+        assert memory_hit.source == "cache"
+
+        cache.clear()
+        db_hit = await cache.get(db, key)
+        assert db_hit is not None
+        assert db_hit.feedback_markdown == "Great answer."
+
+    assert cache.snapshot() == {"size": 1, "memory_hits": 1, "db_hits": 1, "misses": 1}
+
+
+async def test_memory_tier_expires_and_evicts(app_fixture):
+    cache = EvaluationCache(max_entries=1, ttl_seconds=0, persist=False)
+
+    async with session_context.session() as db:
+        await cache.put(db, _key("first"), _payload())
+        assert await cache.get(db, _key("first")) is None
+
+    cache = EvaluationCache(max_entries=1, ttl_seconds=60, persist=False)
+    async with session_context.session() as db:
+        await cache.put(db, _key("first"), _payload())
+        await cache.put(db, _key("second"), _payload())
+        assert await cache.get(db, _key("first")) is None
+        assert await cache.get(db, _key("second")) is not None
+
+
+async def test_persistent_tier_honours_the_ttl_and_prunes(app_fixture):
+    cache = EvaluationCache(max_entries=8, ttl_seconds=60)
+    key = _key("An entry written long ago.")
+
+    async def backdate(db):
+        await db.execute(
+            update(EvaluationCacheEntry)
+            .where(EvaluationCacheEntry.cache_key == key)
+            .values(created_at=utcnow_naive() - timedelta(minutes=5))
+        )
+        await db.commit()
+        cache.clear()
+
+    async with session_context.session() as db:
+        await cache.put(db, key, _payload())
+        await backdate(db)
+        assert await cache.get(db, key) is None
+        assert await cache.get_many(db, [key]) == {}
+
+        # Storing a fresh evaluation restarts the entry's TTL.
+        await cache.put(db, key, _payload())
+        await db.commit()
+        cache.clear()
+        assert await cache.get(db, key) is not None
+
+        await backdate(db)
+        assert await cache.prune(db) == 1
+        await db.commit()
+        remaining = await db.scalar(
+            select(func.count()).where(EvaluationCacheEntry.cache_key == key)
+        )
+    assert remaining == 0
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.session import session_context
+from app.models.enums import JobStatus
+from app.models.tables import Answer, Evaluation, EvaluationJob, Session
+from app.services.jobs import claim_next_job, evaluation_workers, process_job
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _submit_answer(client) -> int:
+    session_response = await client.post(
+        "/api/v1/sessions",
+        json={"role_slug": "software-developer", "level": "entry"},
+    )
+    session_id = session_response.json()["id"]
+    question_response = await client.get(
+        "/api/v1/questions",
+        params={
+            "role": "software-developer",
+            "category": "behavioral",
+            "level": "entry",
+            "limit": 1,
+        },
+    )
+    question = question_response.json()[0]
+    start_time = datetime.now(tz=timezone.utc)
+    answer_response = await client.post(
+        f"/api/v1/sessions/{session_id}/answers",
+        json={
+            "question_id": question["id"],
+            "answer_text": "I led the situation, owned the task, took action and measured a 20% result.",
+            "started_at": start_time.isoformat(),
+            "ended_at": (start_time + timedelta(seconds=60)).isoformat(),
+        },
+    )
+    return answer_response.json()["id"]
+
+
+async def test_evaluation_job_lifecycle(client):
+    answer_id = await _submit_answer(client)
+
+    enqueue_response = await client.post(
+        "/api/v1/evaluate/jobs", json={"answer_id": answer_id}
+    )
+    assert enqueue_response.status_code == 202
+    job = enqueue_response.json()
+    assert job["status"] == "queued"
+    assert job["evaluation"] is None
+
+    duplicate = await client.post(
+        "/api/v1/evaluate/jobs", json={"answer_id": answer_id}
+    )
+    assert duplicate.json()["id"] == job["id"]
+
+    assert await evaluation_workers.run_once("test-worker") is True
+    assert await evaluation_workers.run_once("test-worker") is False
+
+    status_response = await client.get(f"/api/v1/evaluate/jobs/{job['id']}")
+    assert status_response.status_code == 200
+    finished = status_response.json()
+    assert finished["status"] == "succeeded"
+    assert finished["attempts"] == 1
+    assert 0 <= finished["evaluation"]["score"] <= 10
+
+
+async def test_job_can_only_be_claimed_once(client):
+    answer_id = await _submit_answer(client)
+    await client.post("/api/v1/evaluate/jobs", json={"answer_id": answer_id})
+
+    async with session_context.session() as first, session_context.session() as second:
+        claimed = await claim_next_job(first, worker_id="worker-a", lease_seconds=60)
+        competing = await claim_next_job(second, worker_id="worker-b", lease_seconds=60)
+
+    assert claimed is not None
+    assert claimed.answer_id == answer_id
+    assert competing is None
+
+
+async def test_enqueue_unknown_answer_returns_404(client):
+    response = await client.post("/api/v1/evaluate/jobs", json={"answer_id": 999999})
+    assert response.status_code == 404
+    missing_job = await client.get("/api/v1/evaluate/jobs/999999")
+    assert missing_job.status_code == 404
+
+
+async def test_worker_that_lost_its_lease_does_not_store(client):
+    answer_id = await _submit_answer(client)
+    await client.post("/api/v1/evaluate/jobs", json={"answer_id": answer_id})
+
+    async with session_context.session() as db:
+        stale = await claim_next_job(db, worker_id="worker-a", lease_seconds=60)
+    # worker-a stalls past its lease and worker-b takes the job over.
+    async with session_context.session() as db:
+        current = await claim_next_job(db, worker_id="worker-b", lease_seconds=0)
+    assert (stale.id, current.id) == (current.id, stale.id)
+
+    await process_job(stale, worker_id="worker-a", max_attempts=3)
+    async with session_context.session() as db:
+        assert (
+            await db.scalar(
+                select(func.count(Evaluation.id)).where(
+                    Evaluation.answer_id == answer_id
+                )
+            )
+            == 0
+        )
+        job = await db.get(EvaluationJob, current.id)
+        assert (job.status, job.worker_id) == (JobStatus.RUNNING, "worker-b")
+
+    await process_job(current, worker_id="worker-b", max_attempts=3)
+    async with session_context.session() as db:
+        evaluated = await db.scalar(
+            select(Session.evaluated_count).join(Answer).where(Answer.id == answer_id)
+        )
+        assert evaluated == 1
+        assert (
+            await db.get(EvaluationJob, current.id, populate_existing=True)
+        ).status == JobStatus.SUCCEEDED
@@ -0,0 +1,209 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.enums import QuestionCategory
+from app.services.json_stream import JsonStringFieldExtractor
+from app.services.llm import LLMEvaluationService
+from app.services.metrics import LLM_QUEUE_WAIT, registry
+
+pytestmark = pytest.mark.asyncio
+
+
+def _parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def test_extractor_decodes_field_across_chunks():
+    extractor = JsonStringFieldExtractor("feedback_markdown")
+    document = '{"score": 7, "feedback_markdown": "Line one\\nSaid \\"hi\\" \\u00e9", "rubric": {}}'
+    decoded = "".join(
+        extractor.feed(document[index : index + 3])
+        for index in range(0, len(document), 3)
+    )
+
+    assert decoded == 'Line one\nSaid "hi" é'
+    assert extractor.finished
+
+
+async def test_extractor_joins_surrogate_pairs_split_across_chunks():
+    document = json.dumps({"feedback_markdown": "Great \U0001F600 work \ud83d."})
+    extractor = JsonStringFieldExtractor("feedback_markdown")
+    decoded = "".join(extractor.feed(char) for char in document)
+
+    assert decoded == "Great \U0001F600 work \ufffd."
+    decoded.encode("utf-8")
+
+
+async def test_extractor_ignores_the_key_inside_other_values():
+    document = json.dumps(
+        {
+            "summary": 'Quote: "feedback_markdown": "fake"',
+            "rubric": {"feedback_markdown": "nested"},
+            "feedback_markdown": "real",
+        }
+    )
+    for size in (1, 7, len(document)):
+        extractor = JsonStringFieldExtractor("feedback_markdown")
+        decoded = "".join(
+            extractor.feed(document[index : index + size])
+            for index in range(0, len(document), size)
+        )
+        assert decoded == "real"
+
+
+class _FakeResponses:
+    def __init__(self, deltas):
+        self._deltas = deltas
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+
+        async def events():
+            yield SimpleNamespace(type="response.created")
+            for delta in self._deltas:
+                yield SimpleNamespace(type="response.output_text.delta", delta=delta)
+
+        return events()
+
+
+async def test_service_streams_feedback_before_result():
+    document = json.dumps(
+        {
+            "score": 8.5,
+            "feedback_markdown": "Strong STAR structure.",
+            "rubric": {"clarity": 9},
+            "suggested_improvements": ["Add metrics."],
+        }
+    )
+    service = LLMEvaluationService(api_key="key")
+    service._should_stub = False
+    service._client = SimpleNamespace(
+        responses=_FakeResponses([document[:30], document[30:50], document[50:]])
+    )
+
+    events = [
+        event
+        async for event in service.stream_evaluation(
+            answer_text="answer",
+            question_text="question",
+            category=QuestionCategory.BEHAVIORAL,
+            role_name="Software Developer",
+        )
+    ]
+
+    assert [event.kind for event in events][-1] == "result"
+    assert (
+        "".join(event.text for event in events if event.kind == "delta")
+        == "Strong STAR structure."
+    )
+    assert events[-1].payload.score == 8.5
+    assert events[-1].payload.source == "llm"
+
+
+async def test_slow_reader_does_not_hold_a_provider_slot():
+    document = json.dumps(
+        {"score": 7, "feedback_markdown": "Clear answer with a metric.", "rubric": {}}
+    )
+    service = LLMEvaluationService(api_key="key", max_concurrency=1)
+    service._should_stub = False
+    service._client = SimpleNamespace(
+        responses=_FakeResponses(
+            [document[index : index + 8] for index in range(0, len(document), 8)]
+        )
+    )
+
+    stream = service.stream_evaluation(
+        answer_text="answer",
+        question_text="question",
+        category=QuestionCategory.BEHAVIORAL,
+        role_name="Software Developer",
+    )
+    first = await stream.__anext__()
+    # The client stalls after one event; the model has finished.
+    await asyncio.sleep(0.01)
+    assert first.kind == "delta"
+    assert service.limiter.in_flight == 0
+
+    rest = [event async for event in stream]
+    assert rest[-1].payload.feedback_markdown == "Clear answer with a metric."
+
+
+async def test_queue_wait_is_observed_for_every_slot():
+    document = json.dumps({"score": 6, "feedback_markdown": "Fine.", "rubric": {}})
+    service = LLMEvaluationService(api_key="key", max_concurrency=1)
+    service._should_stub = False
+    service._client = SimpleNamespace(responses=_FakeResponses([document]))
+    waits = LLM_QUEUE_WAIT.labels("stream")
+    count_before, sum_before = sum(waits.counts), waits.sum
+
+    async def drain():
+        return [
+            event
+            async for event in service.stream_evaluation(
+                answer_text="answer",
+                question_text="question",
+                category=QuestionCategory.BEHAVIORAL,
+                role_name="Software Developer",
+            )
+        ]
+
+    await asyncio.gather(drain(), drain())
+
+    assert sum(waits.counts) == count_before + 2
+    assert waits.sum >= sum_before
+    assert 'llm_queue_wait_seconds_count{operation="stream"}' in registry.render()
+
+
+async def test_stream_endpoint_emits_deltas_and_persists(client):
+    session_id = (
+        await client.post(
+            "/api/v1/sessions",
+            json={"role_slug": "software-developer", "level": "entry"},
+        )
+    ).json()["id"]
+    question = (
+        await client.get(
+            "/api/v1/questions",
+            params={
+                "role": "software-developer",
+                "category": "behavioral",
+                "level": "entry",
+                "limit": 1,
+            },
+        )
+    ).json()[0]
+    start_time = datetime.now(tz=timezone.utc)
+    answer_id = (
+        await client.post(
+            f"/api/v1/sessions/{session_id}/answers",
+            json={
+                "question_id": question["id"],
+                "answer_text": "I owned the rollout and cut errors by 30% for our customers.",
+                "started_at": start_time.isoformat(),
+                "ended_at": (start_time + timedelta(seconds=45)).isoformat(),
+            },
+        )
+    ).json()["id"]
+
+    response = await client.get(f"/api/v1/evaluate/{answer_id}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+    assert events[0][0] == "delta"
+    assert events[-1][0] == "result"
+    result = events[-1][1]
+    assert 0 <= result["score"] <= 10
+
+    detail = (await client.get(f"/api/v1/sessions/{session_id}")).json()
+    assert detail["answers"][0]["evaluation"]["score"] == result["score"]
+
+    missing = await client.get("/api/v1/evaluate/999999/stream")
+    assert missing.status_code == 404
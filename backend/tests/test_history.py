@@ -0,0 +1,103 @@
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.db.session import session_context
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_sessions(client, count: int):
+    ids = []
+    for _ in range(count):
+        response = await client.post(
+            "/api/v1/sessions",
+            json={"role_slug": "software-developer", "level": "entry"},
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def test_history_pages_with_cursor(client):
+    created = await _create_sessions(client, 5)
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/history", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == sorted(created, reverse=True)
+
+
+async def test_history_filters_by_tier_and_date_range(client):
+    await _create_sessions(client, 2)
+
+    response = await client.get("/api/v1/history", params={"tier": "Ready"})
+    assert response.status_code == 200
+    assert response.json() == []
+
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    response = await client.get("/api/v1/history", params={"started_after": tomorrow})
+    assert response.json() == []
+    response = await client.get("/api/v1/history", params={"started_before": tomorrow})
+    assert len(response.json()) == 2
+
+
+async def test_history_rejects_malformed_cursor(client):
+    response = await client.get("/api/v1/history", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def _migration(name):
+    path = Path(__file__).resolve().parents[1] / "alembic" / "versions" / name
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def test_history_pages_rows_from_the_legacy_server_default(client):
+    # Rows written by the old CURRENT_TIMESTAMP default carry no fractional seconds.
+    async with session_context.session() as db:
+        role_id = await db.scalar(
+            text("SELECT id FROM role WHERE slug = 'software-developer'")
+        )
+        for _ in range(3):
+            await db.execute(
+                text(
+                    "INSERT INTO session (role_id, level, started_at, score_sum, evaluated_count, revision) "
+                    "VALUES (:role_id, 'ENTRY', '2024-05-01 10:00:00', 0, 0, 0)"
+                ),
+                {"role_id": role_id},
+            )
+        migration = _migration("0006_add_session_history_index.py")
+        await db.run_sync(
+            lambda sync_db: migration.rewrite_legacy_started_at(sync_db.connection())
+        )
+        await db.commit()
+    created = await _create_sessions(client, 2)
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/history", params=params)
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen[:2] == sorted(created, reverse=True)
+    assert len(seen) == len(set(seen)) == 5
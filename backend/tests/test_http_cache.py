@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.http_cache import etag_matches
+
+
+@pytest.mark.asyncio
+async def test_roles_conditional_get(client):
+    first = await client.get("/api/v1/roles")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    cached = await client.get(
+        "/api/v1/roles", headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_session_etag_changes_with_answers_and_evaluations(client):
+    session_id = (
+        await client.post("/api/v1/sessions", json={"role_slug": "software-developer"})
+    ).json()["id"]
+    question = (
+        await client.get("/api/v1/questions", params={"role": "software-developer"})
+    ).json()[0]
+
+    empty = await client.get(f"/api/v1/sessions/{session_id}")
+    assert empty.headers["cache-control"] == "no-cache"
+    assert (
+        await client.get(
+            f"/api/v1/sessions/{session_id}",
+            headers={"If-None-Match": empty.headers["etag"]},
+        )
+    ).status_code == 304
+
+    started = datetime.now(tz=timezone.utc)
+    answer = await client.post(
+        f"/api/v1/sessions/{session_id}/answers",
+        json={
+            "question_id": question["id"],
+            "answer_text": "I profiled the slow endpoint and cached the hot query.",
+            "started_at": started.isoformat(),
+            "ended_at": (started + timedelta(seconds=40)).isoformat(),
+        },
+    )
+    answered = await client.get(
+        f"/api/v1/sessions/{session_id}",
+        headers={"If-None-Match": empty.headers["etag"]},
+    )
+    assert (
+        answered.status_code == 200
+        and answered.headers["etag"] != empty.headers["etag"]
+    )
+
+    await client.post("/api/v1/evaluate", json={"answer_id": answer.json()["id"]})
+    evaluated = await client.get(
+        f"/api/v1/sessions/{session_id}",
+        headers={"If-None-Match": answered.headers["etag"]},
+    )
+    assert (
+        evaluated.status_code == 200
+        and evaluated.json()["answers"][0]["evaluation"] is not None
+    )
+
+    assert (
+        await client.get("/api/v1/sessions/999999", headers={"If-None-Match": "*"})
+    ).status_code == 404
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('W/"abc", "def"', '"def"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abc"', '"abcd"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,145 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.db.import_questions import QuestionImporter, iter_records
+from app.db.session import session_context
+from app.models.tables import Question, Role
+
+pytestmark = pytest.mark.asyncio
+
+
+def _jsonl(*records):
+    return io.StringIO(
+        "".join((r if isinstance(r, str) else json.dumps(r)) + "\n" for r in records)
+    )
+
+
+async def test_jsonl_import_batches_and_rejects_bad_rows(app_fixture):
+    source = _jsonl(
+        {
+            "role_slug": "cyber-analyst",
+            "text": "Imported one?",
+            "category": "technical",
+            "keywords": ["a"],
+        },
+        {
+            "role_slug": "cyber-analyst",
+            "text": "Imported two?",
+            "category": "behavioral",
+            "difficulty": 9,
+        },
+        "{not json",
+        {"role_slug": "no-such-role", "text": "Orphan?", "category": "technical"},
+        {
+            "role_slug": "cyber-analyst",
+            "text": "Imported three?",
+            "category": "technical",
+            "difficulty": 5,
+        },
+        {
+            "role_slug": "cyber-analyst",
+            "text": "Imported one?",
+            "category": "technical",
+            "difficulty": 4,
+        },
+    )
+    rejects = io.StringIO()
+    async with session_context.session() as db:
+        importer = QuestionImporter(db, batch_size=2, rejects=rejects)
+        stats = await importer.run(iter_records(source, "jsonl"))
+        assert (stats.read, stats.inserted, stats.skipped, stats.rejected) == (
+            6,
+            2,
+            1,
+            3,
+        )
+
+        texts = set(
+            await db.scalars(
+                select(Question.text).where(Question.text.like("Imported%"))
+            )
+        )
+        assert texts == {"Imported one?", "Imported three?"}
+
+    lines = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [entry["line"] for entry in lines] == [2, 3, 4]
+    assert lines[0]["errors"][0].startswith("difficulty:")
+    assert lines[2]["errors"] == ["role_slug: unknown role 'no-such-role'"]
+
+
+async def test_csv_import_updates_existing_and_creates_roles(app_fixture):
+    header = (
+        "role_slug,text,category,level,difficulty,requires_code,keywords,test_cases\n"
+    )
+    first = io.StringIO(
+        header + 'data-engineer,"Design a\nbackfill?",technical,,,,etl; airflow,\n'
+    )
+    second = io.StringIO(
+        header
+        + 'data-engineer,"Design a\nbackfill?",technical,senior,4,true,etl|spark,"{""cases"": []}"\n'
+        + "brand-new-role,Why us?,behavioral,,,,,\n"
+    )
+    async with session_context.session() as db:
+        stats = await QuestionImporter(db).run(iter_records(first, "csv"))
+        assert (stats.inserted, stats.rejected) == (1, 0)
+
+        stats = await QuestionImporter(db, create_roles=True, update_existing=True).run(
+            iter_records(second, "csv")
+        )
+        assert (stats.inserted, stats.updated) == (1, 1)
+
+        question = await db.scalar(
+            select(Question).where(Question.text == "Design a\nbackfill?")
+        )
+        await db.refresh(question)
+        assert (question.level.value, question.difficulty, question.requires_code) == (
+            "senior",
+            4,
+            True,
+        )
+        assert question.keywords == ["etl", "spark"]
+        assert question.test_cases == {"cases": []}
+        assert (
+            await db.scalar(select(Role.name).where(Role.slug == "brand-new-role"))
+            == "Brand New Role"
+        )
+
+
+async def test_database_errors_reject_only_the_offending_rows(app_fixture):
+    source = _jsonl(
+        {
+            "role_slug": "cyber-analyst",
+            "text": "Before the clash?",
+            "category": "technical",
+        },
+        # --create-roles would name this role "Qa Lead", which another slug already uses.
+        {"role_slug": "qa-lead", "text": "Clashing role?", "category": "technical"},
+        {
+            "role_slug": "cyber-analyst",
+            "text": "After the clash?",
+            "category": "behavioral",
+        },
+    )
+    rejects = io.StringIO()
+    async with session_context.session() as db:
+        db.add(Role(name="Qa Lead", slug="quality-lead", description=None))
+        await db.commit()
+
+        stats = await QuestionImporter(db, rejects=rejects, create_roles=True).run(
+            iter_records(source, "jsonl")
+        )
+        assert (stats.read, stats.inserted, stats.rejected) == (3, 2, 1)
+        texts = set(
+            await db.scalars(select(Question.text).where(Question.text.like("%clash?")))
+        )
+        assert texts == {"Before the clash?", "After the clash?"}
+        assert await db.scalar(select(Role.id).where(Role.slug == "qa-lead")) is None
+
+    [entry] = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert entry["line"] == 2
+    assert entry["errors"][0].startswith(
+        "database: UNIQUE constraint failed: role.name"
+    )
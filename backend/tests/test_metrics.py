@@ -0,0 +1,86 @@
+import re
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import get_application
+from app.services.metrics import MetricsRegistry
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(
+        rf"^{re.escape(name)}{{{re.escape(wanted)}}} (\S+)$", body, re.MULTILINE
+    )
+    assert match, f"{name}{{{wanted}}} not exported"
+    return float(match.group(1))
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "job_seconds", "Job time.", ("kind",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels("a").observe(value)
+    registry.counter("jobs", "Jobs.").inc(2)
+
+    body = registry.render()
+    assert 'job_seconds_bucket{kind="a",le="0.1"} 2' in body
+    assert 'job_seconds_bucket{kind="a",le="1"} 3' in body
+    assert 'job_seconds_bucket{kind="a",le="+Inf"} 4' in body
+    assert 'job_seconds_count{kind="a"} 4' in body
+    assert "# TYPE jobs counter\njobs_total 2" in body
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_route_with_db_time(app_fixture):
+    app = get_application()
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        before = (await client.get("/metrics")).text
+        route = "/api/v1/questions"
+        baseline = 0.0
+        if f'route="{route}",status="200"' in before:
+            baseline = _sample(
+                before, "http_requests_total", method="GET", route=route, status="200"
+            )
+
+        response = await client.get(
+            route, params={"role": "software-developer", "limit": 3}
+        )
+        assert response.status_code == 200
+        assert (await client.get("/api/v1/sessions/999999")).status_code == 404
+        await client.get("/no/such/path")
+
+        metrics = await client.get("/metrics")
+
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = metrics.text
+    assert (
+        _sample(body, "http_requests_total", method="GET", route=route, status="200")
+        == baseline + 1
+    )
+    assert (
+        _sample(
+            body,
+            "http_requests_total",
+            method="GET",
+            route="/api/v1/sessions/{session_id}",
+            status="404",
+        )
+        >= 1
+    )
+    assert (
+        _sample(
+            body, "http_requests_total", method="GET", route="unmatched", status="404"
+        )
+        >= 1
+    )
+    assert _sample(body, "http_request_db_queries_count", route=route) >= 1
+    assert _sample(body, "http_request_db_queries_sum", route=route) >= 1
+    assert _sample(body, "http_request_stage_seconds_sum", route=route, stage="db") > 0
+    # The scrape itself.
+    assert _sample(body, "http_requests_in_progress", method="GET") == 1
+    assert "llm_circuit_open 0" in body
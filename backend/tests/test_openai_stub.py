@@ -0,0 +1,65 @@
+import pytest
+
+from app.core.config import settings
+from app.models.enums import QuestionCategory
+from app.services.llm import LLMEvaluationService
+from benchmarks.openai_stub import StubServerConfig, stub_openai_client
+from benchmarks.stub_llm import StubLatency
+
+pytestmark = pytest.mark.asyncio
+
+ANSWER = dict(
+    answer_text="I led the incident response and cut recovery time by 40%.",
+    question_text="Tell me about a production incident you handled.",
+    category=QuestionCategory.BEHAVIORAL,
+    role_name="Software Developer",
+)
+
+
+def _service(**config):
+    service = LLMEvaluationService(api_key="unused")
+    client = stub_openai_client(
+        StubServerConfig(latency=StubLatency(mean_ms=0), seed=7, **config),
+        max_retries=0,
+    )
+    service.use_client(client)
+    return service, client
+
+
+async def test_sdk_round_trip_against_stub_server():
+    service, client = _service()
+    try:
+        payload = await service.evaluate_answer(**ANSWER)
+        assert payload.source == "llm"
+        assert 0 <= payload.score <= 10
+
+        events = [event async for event in service.stream_evaluation(**ANSWER)]
+        result = events[-1].payload
+        assert events[-1].kind == "result" and result.source == "llm"
+        streamed = "".join(event.text for event in events if event.kind == "delta")
+        assert streamed == result.feedback_markdown
+    finally:
+        await client.close()
+
+
+@pytest.mark.parametrize("config", [{"error_rate": 1.0}, {"malformed_rate": 1.0}])
+async def test_injected_failures_fall_back_to_offline(config):
+    service, client = _service(**config)
+    try:
+        payload = await service.evaluate_answer(**ANSWER)
+        assert payload.source == "offline"
+    finally:
+        await client.close()
+
+
+async def test_base_url_overrides_offline_mode(monkeypatch):
+    monkeypatch.setenv("CI", "true")
+    monkeypatch.setattr(settings, "app_env", "test")
+
+    service = LLMEvaluationService(base_url="http://127.0.0.1:8100/v1")
+    await service.startup()
+    try:
+        assert service._client is not None
+        assert str(service._client.base_url).startswith("http://127.0.0.1:8100/v1")
+    finally:
+        await service.aclose()
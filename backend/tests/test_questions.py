@@ -1,5 +1,9 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
+from app.services.question_bank import question_bank
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -41,3 +45,63 @@ async def test_questions_fallback_when_level_missing(client):
     # ensure we gracefully downgraded rather than erroring
     assert question["text"]
 
+
+async def test_question_bank_serves_from_memory_after_warmup(client):
+    first = await client.get(
+        "/api/v1/questions", params={"role": "data-engineer", "limit": 3}
+    )
+    assert first.status_code == 200
+    assert question_bank.loaded
+    assert len(first.json()) == 3
+
+    question_bank.invalidate()
+    assert not question_bank.loaded
+    second = await client.get(
+        "/api/v1/questions",
+        params={"role": "data-engineer", "level": "staff", "limit": 10},
+    )
+    assert second.status_code == 200
+    levels = [question["level"] for question in second.json()]
+    # Closest levels come first, mirroring the former ORDER BY level distance.
+    assert levels[0] == "staff"
+    assert len({question["id"] for question in second.json()}) == len(levels)
+
+
+async def test_questions_unknown_role_returns_404(client):
+    response = await client.get("/api/v1/questions", params={"role": "astronaut"})
+    assert response.status_code == 404
+
+
+async def test_questions_skip_those_answered_in_session(client):
+    session_id = (
+        await client.post(
+            "/api/v1/sessions", json={"role_slug": "cyber-analyst", "level": "entry"}
+        )
+    ).json()["id"]
+    params = {"role": "cyber-analyst", "category": "behavioral", "limit": 10}
+    available = (await client.get("/api/v1/questions", params=params)).json()
+    answered = available[0]
+
+    start_time = datetime.now(tz=timezone.utc)
+    await client.post(
+        f"/api/v1/sessions/{session_id}/answers",
+        json={
+            "question_id": answered["id"],
+            "answer_text": "I triaged the alert and escalated it.",
+            "started_at": start_time.isoformat(),
+            "ended_at": (start_time + timedelta(seconds=30)).isoformat(),
+        },
+    )
+
+    remaining = await client.get(
+        "/api/v1/questions", params={**params, "session_id": session_id}
+    )
+    assert remaining.status_code == 200
+    remaining_ids = {question["id"] for question in remaining.json()}
+    assert answered["id"] not in remaining_ids
+    assert len(remaining_ids) == len(available) - 1
+
+    missing_session = await client.get(
+        "/api/v1/questions", params={**params, "session_id": 999999}
+    )
+    assert missing_session.status_code == 404
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.db.session import session_context
+from app.models.tables import Question, Role
+from app.services.reference_cache import ReferenceCache, reference_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_hot_write_paths_skip_reference_lookups(client):
+    question = (
+        await client.get("/api/v1/questions", params={"role": "software-developer"})
+    ).json()[0]
+    async with session_context.session() as db:
+        await reference_cache.load(db)
+        sync_engine = db.get_bind()
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        created = await client.post(
+            "/api/v1/sessions", json={"role_slug": "software-developer"}
+        )
+        assert (
+            created.status_code == 201
+            and created.json()["role"]["slug"] == "software-developer"
+        )
+        assert statements == ["INSERT"]
+
+        statements.clear()
+        started = datetime.now(tz=timezone.utc)
+        answer = await client.post(
+            f"/api/v1/sessions/{created.json()['id']}/answers",
+            json={
+                "question_id": question["id"],
+                "answer_text": "Cached question",
+                "started_at": started.isoformat(),
+                "ended_at": (started + timedelta(seconds=30)).isoformat(),
+            },
+        )
+        assert answer.status_code == 201
+        assert answer.json()["question"]["text"] == question["text"]
+        assert answer.json()["evaluation"] is None
+        assert sorted(statements) == ["INSERT", "SELECT", "UPDATE"]
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+
+
+async def test_other_workers_reload_after_version_bump(app_fixture):
+    other_worker = ReferenceCache(check_interval=0)
+    async with session_context.session() as db:
+        await other_worker.load(db)
+        await reference_cache.load(db)
+        assert (
+            await other_worker.role_by_slug(db, "data-engineer")
+        ).name == "Data Engineer"
+
+        await db.execute(
+            update(Role)
+            .where(Role.slug == "data-engineer")
+            .values(name="Data Platform Engineer")
+        )
+        await reference_cache.bump_version(db)
+        await db.commit()
+        reference_cache.invalidate()
+
+        assert (
+            await other_worker.role_by_slug(db, "data-engineer")
+        ).name == "Data Platform Engineer"
+        assert "Data Platform Engineer" in [
+            role.name for role in await reference_cache.roles(db)
+        ]
+
+
+async def test_question_sampling_follows_a_version_bump_from_another_process(
+    client, monkeypatch
+):
+    params = {"role": "data-engineer", "limit": 3}
+    assert (await client.get("/api/v1/questions", params=params)).status_code == 200
+
+    async with session_context.session() as db:
+        role_id = select(Role.id).where(Role.slug == "data-engineer").scalar_subquery()
+        await db.execute(
+            update(Question)
+            .where(Question.role_id == role_id)
+            .values(text="Reworded: " + Question.text)
+        )
+        # Another process: it stamps the version but cannot invalidate this one's caches.
+        await reference_cache.bump_version(db)
+        await db.commit()
+    monkeypatch.setattr(reference_cache, "_check_interval", 0)
+
+    response = await client.get("/api/v1/questions", params=params)
+    assert len(response.json()) == 3
+    assert all(
+        question["text"].startswith("Reworded: ") for question in response.json()
+    )
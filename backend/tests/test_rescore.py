@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.db.rescore import rescore
+from app.db.session import session_context
+from app.models.tables import Evaluation, Session
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _evaluated_session(client, answers: int = 3):
+    session_id = (
+        await client.post(
+            "/api/v1/sessions",
+            json={"role_slug": "software-developer", "level": "entry"},
+        )
+    ).json()["id"]
+    questions = (
+        await client.get(
+            "/api/v1/questions",
+            params={
+                "role": "software-developer",
+                "category": "behavioral",
+                "limit": answers,
+            },
+        )
+    ).json()
+    start = datetime.now(timezone.utc)
+    answer_ids = []
+    for index, question in enumerate(questions):
+        answer = await client.post(
+            f"/api/v1/sessions/{session_id}/answers",
+            json={
+                "question_id": question["id"],
+                "answer_text": f"Situation {index}: my task was to act and the result was {index + 20}% faster.",
+                "started_at": (start + timedelta(minutes=index)).isoformat(),
+                "ended_at": (start + timedelta(minutes=index, seconds=40)).isoformat(),
+            },
+        )
+        answer_ids.append(answer.json()["id"])
+    await client.post("/api/v1/evaluate/batch", json={"answer_ids": answer_ids})
+    return session_id, answer_ids
+
+
+async def test_rescore_rewrites_heuristic_scores_and_rollups(client):
+    session_id, answer_ids = await _evaluated_session(client)
+    expected = (await client.get(f"/api/v1/sessions/{session_id}")).json()[
+        "overall_score"
+    ]
+
+    async with session_context.session() as db:
+        # Drift the stored data: stale heuristic scores, a model-graded row and a bad rollup.
+        await db.execute(
+            update(Evaluation)
+            .where(Evaluation.answer_id == answer_ids[0])
+            .values(score=1.0)
+        )
+        await db.execute(
+            update(Evaluation)
+            .where(Evaluation.answer_id == answer_ids[1])
+            .values(score=9.5, source="llm")
+        )
+        await db.execute(
+            update(Session)
+            .where(Session.id == session_id)
+            .values(score_sum=0.0, overall_score=0.0)
+        )
+        await db.commit()
+
+        dry = await rescore(db, chunk_size=2, dry_run=True)
+        assert dry.scanned == 2 and dry.rescored == 0
+        assert (
+            await db.scalar(
+                select(Evaluation.score).where(Evaluation.answer_id == answer_ids[0])
+            )
+            == 1.0
+        )
+
+        stats = await rescore(db, chunk_size=2)
+        assert stats.rescored == 2 and stats.changed == 1
+
+        scores = dict(
+            (await db.execute(select(Evaluation.answer_id, Evaluation.score))).all()
+        )
+        session = (
+            await db.execute(
+                select(Session.score_sum, Session.evaluated_count).where(
+                    Session.id == session_id
+                )
+            )
+        ).one()
+
+    assert scores[answer_ids[1]] == 9.5
+    assert scores[answer_ids[0]] != 1.0
+    assert session.evaluated_count == 3
+    assert session.score_sum == pytest.approx(
+        sum(scores[answer_id] for answer_id in answer_ids)
+    )
+    detail = (await client.get(f"/api/v1/sessions/{session_id}")).json()
+    assert detail["overall_score"] == pytest.approx(round(session.score_sum / 3, 2))
+    assert detail["overall_score"] != expected
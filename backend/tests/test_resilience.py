@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.enums import QuestionCategory
+from app.services.llm import LLMEvaluationService
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryPolicy,
+    call_with_retries,
+)
+from benchmarks.openai_stub import StubServerConfig, create_stub_app, stub_openai_client
+from benchmarks.stub_llm import StubLatency
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_breaker_opens_then_recovers_through_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        name="test",
+        failure_threshold=2,
+        window_seconds=10,
+        cooldown_seconds=5,
+        clock=clock,
+    )
+
+    breaker.record_failure()
+    clock.now = 11  # first failure slides out of the window
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 16
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()["times_opened"] == 1
+
+
+async def test_retries_retryable_errors_and_timeouts():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        if len(calls) == 2:
+            await asyncio.sleep(1)
+        return "ok"
+
+    result = await call_with_retries(
+        flaky,
+        policy=RetryPolicy(max_attempts=3, base_delay=0.0),
+        retryable=lambda exc: isinstance(exc, (ConnectionError, asyncio.TimeoutError)),
+        attempt_timeout=0.05,
+    )
+    assert result == "ok"
+    assert len(calls) == 3
+
+
+async def test_non_retryable_errors_and_open_circuit_fail_fast():
+    breaker = CircuitBreaker(
+        name="test", failure_threshold=1, window_seconds=10, cooldown_seconds=60
+    )
+    calls = []
+
+    async def rejected():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    async def unavailable():
+        calls.append(1)
+        raise ConnectionError("reset")
+
+    # A rejected request is not retried and does not count against the breaker.
+    with pytest.raises(ValueError):
+        await call_with_retries(
+            rejected, policy=RetryPolicy(), retryable=lambda exc: False, breaker=breaker
+        )
+    assert breaker.state == CircuitState.CLOSED
+
+    with pytest.raises(ConnectionError):
+        await call_with_retries(
+            unavailable,
+            policy=RetryPolicy(max_attempts=1),
+            retryable=lambda exc: True,
+            breaker=breaker,
+        )
+    with pytest.raises(CircuitOpenError):
+        await call_with_retries(
+            rejected, policy=RetryPolicy(), retryable=lambda exc: False, breaker=breaker
+        )
+    assert len(calls) == 2
+
+
+async def test_queueing_for_a_slot_is_not_a_provider_timeout(monkeypatch):
+    # 12 calls through 2 slots at ~50 ms each: the last ones queue far longer than the timeout.
+    monkeypatch.setattr(settings, "llm_request_timeout_sec", 0.2)
+    stub_app = create_stub_app(
+        StubServerConfig(latency=StubLatency(mean_ms=50, distribution="fixed"))
+    )
+    client = stub_openai_client(app=stub_app)
+    service = LLMEvaluationService(api_key="unused", max_concurrency=2)
+    service.use_client(client)
+    service.breaker = CircuitBreaker(
+        name="llm", failure_threshold=2, window_seconds=60, cooldown_seconds=60
+    )
+    try:
+        payloads = await asyncio.gather(
+            *(
+                service.evaluate_answer(
+                    answer_text=f"I reduced deploy time by {index}%.",
+                    question_text="Describe an improvement you led.",
+                    category=QuestionCategory.BEHAVIORAL,
+                    role_name="Software Developer",
+                )
+                for index in range(12)
+            )
+        )
+    finally:
+        await client.close()
+
+    assert [payload.source for payload in payloads] == ["llm"] * 12
+    assert stub_app.state.stub_stats.requests == 12
+    assert service.breaker.snapshot()["state"] == "closed"
+
+
+async def test_service_routes_to_offline_while_circuit_is_open():
+    stub_app = create_stub_app(
+        StubServerConfig(
+            latency=StubLatency(mean_ms=0), error_rate=1.0, error_status=503
+        )
+    )
+    client = stub_openai_client(app=stub_app)
+    service = LLMEvaluationService(api_key="unused")
+    service.use_client(client)
+    service.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+    service.breaker = CircuitBreaker(
+        name="llm", failure_threshold=2, window_seconds=60, cooldown_seconds=60
+    )
+    try:
+        for _ in range(3):
+            payload = await service.evaluate_answer(
+                answer_text="I reduced deploy time by 30%.",
+                question_text="Describe an improvement you led.",
+                category=QuestionCategory.BEHAVIORAL,
+                role_name="Software Developer",
+            )
+            assert payload.source == "offline"
+    finally:
+        await client.close()
+
+    # Two attempts opened the circuit; later calls never reached the provider.
+    assert stub_app.state.stub_stats.requests == 2
+    assert service.breaker.snapshot()["state"] == "open"
@@ -0,0 +1,219 @@
+import json
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.models.enums import QuestionCategory
+from app.services.llm import llm_service
+from app.services.sandbox import CodeSandbox, code_sandbox, grade
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def sandbox_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "sandbox_enabled", True)
+    if not CodeSandbox().available:
+        pytest.skip("sandbox isolation needs Linux and root")
+
+
+REVERSE_CASES = {
+    "entrypoint": "reverse_words",
+    "cases": [
+        {"args": ["hello  world"], "expected": "world  hello"},
+        {"args": ["one two three"], "expected": "three two one"},
+    ],
+}
+SOLUTION = "import re\n\ndef reverse_words(s):\n    print('noise')\n    return ''.join(reversed(re.split(r'(\\s+)', s)))\n"
+
+
+@pytest.mark.usefixtures("sandbox_enabled")
+async def test_runs_cases_and_caches_by_snippet():
+    sandbox = CodeSandbox(workers=1, cpu_seconds=1, wall_seconds=2)
+    try:
+        result = await sandbox.run(SOLUTION, REVERSE_CASES)
+        assert (result.status, result.passed, result.total) == ("passed", 2, 2)
+
+        wrong = await sandbox.run(
+            "def reverse_words(s):\n    return s.split()\n", REVERSE_CASES
+        )
+        assert wrong.status == "failed" and wrong.passed == 0
+        assert (
+            wrong.detail
+            == "reverse_words('hello  world') returned a different value, expected 'world  hello'"
+        )
+
+        assert await sandbox.run(SOLUTION, REVERSE_CASES) == result
+        assert (sandbox.runs, sandbox.cache_hits) == (2, 1)
+    finally:
+        await sandbox.stop()
+
+
+@pytest.mark.usefixtures("sandbox_enabled")
+async def test_limits_stop_runaway_code_and_keep_the_worker():
+    sandbox = CodeSandbox(workers=1, cpu_seconds=1, wall_seconds=1.5)
+    try:
+        spin = await sandbox.run(
+            "def reverse_words(s):\n    while True:\n        pass\n", REVERSE_CASES
+        )
+        assert spin.status == "timeout"
+
+        sleep = await sandbox.run(
+            "import time\ndef reverse_words(s):\n    time.sleep(30)\n", REVERSE_CASES
+        )
+        assert sleep.status == "timeout" and sleep.runtime_ms < 5000
+
+        missing = await sandbox.run("def something_else():\n    pass\n", REVERSE_CASES)
+        assert missing.status == "error" and "reverse_words" in missing.detail
+
+        # The same warm worker still serves normal runs afterwards.
+        assert (await sandbox.run(SOLUTION, REVERSE_CASES)).status == "passed"
+    finally:
+        await sandbox.stop()
+
+
+@pytest.mark.usefixtures("sandbox_enabled")
+async def test_runs_are_isolated_and_never_echo_submission_values(monkeypatch):
+    monkeypatch.setenv("SANDBOX_CANARY", "sk-canary")
+    probes = {
+        "environ": f"def reverse_words(s):\n    return open('/proc/{os.getpid()}/environ').read()\n",
+        "own_env": "import os\ndef reverse_words(s):\n    return dict(os.environ)\n",
+        "spawn": "import os\ndef reverse_words(s):\n    return os.fork()\n",
+        "uid": "import os\ndef reverse_words(s):\n    return [os.getuid(), os.geteuid()]\n",
+        "named": "class Leak(Exception):\n    pass\ndef reverse_words(s):\n    raise type(s, (Exception,), {})(s)\n",
+    }
+    sandbox = CodeSandbox(workers=1, cpu_seconds=1, wall_seconds=2)
+    try:
+        results = {
+            name: await sandbox.run(code, REVERSE_CASES)
+            for name, code in probes.items()
+        }
+        for name in ("environ", "spawn"):
+            assert (
+                results[name].detail
+                == "reverse_words('hello  world') raised PermissionError"
+            ), name
+        assert results["own_env"].detail.startswith(
+            "reverse_words('hello  world') returned a different value"
+        )
+        assert results["uid"].status == "failed"
+        assert (
+            results["named"].detail
+            == "reverse_words('hello  world') raised an exception"
+        )
+        assert all("canary" not in (result.detail or "") for result in results.values())
+
+        uid_check = {
+            "entrypoint": "f",
+            "cases": [{"args": [], "expected": [settings.sandbox_uid] * 2}],
+        }
+        uid_code = "import os\ndef f():\n    return [os.getuid(), os.geteuid()]\n"
+        assert (await sandbox.run(uid_code, uid_check)).status == "passed"
+        # socket(2) is refused by the seccomp filter (ctypes is already loaded in the worker).
+        socket_check = {"entrypoint": "f", "cases": [{"args": [], "expected": -1}]}
+        socket_code = (
+            "import ctypes\ndef f():\n    return ctypes.CDLL(None).socket(2, 1, 0)\n"
+        )
+        assert (await sandbox.run(socket_code, socket_check)).status == "passed"
+    finally:
+        await sandbox.stop()
+
+
+@pytest.mark.usefixtures("sandbox_enabled")
+async def test_submissions_cannot_forge_their_result():
+    forged = json.dumps({"status": "passed", "passed": 9, "total": 9}) + "\n"
+    probes = {
+        "eq": "class Yes:\n"
+        "    def __eq__(self, other):\n"
+        "        return True\n"
+        "def reverse_words(s):\n"
+        "    return Yes()\n",
+        "stdout": "import os\n"
+        "def reverse_words(s):\n"
+        f"    os.write(1, {forged.encode()!r})\n"
+        "    return s\n",
+        "report": "import os\n"
+        "def reverse_words(s):\n"
+        "    for fd in range(64):\n"
+        "        try:\n"
+        f"            os.write(fd, {forged.encode()!r})\n"
+        "        except OSError:\n"
+        "            pass\n"
+        "    return s\n",
+        # Expected values are never sent to the worker, so there is nothing to find.
+        "memory": "import gc\ndef reverse_words(s):\n"
+        "    needle = ' '.join(['world', '', 'hello'])\n"
+        "    for obj in gc.get_objects():\n"
+        "        for item in obj if isinstance(obj, list) else ():\n"
+        "            if isinstance(item, dict) and needle in item.values():\n"
+        "                return needle\n"
+        "    return s\n",
+    }
+    sandbox = CodeSandbox(workers=1, cpu_seconds=1, wall_seconds=2)
+    try:
+        results = {
+            name: await sandbox.run(code, REVERSE_CASES)
+            for name, code in probes.items()
+        }
+        for name, result in results.items():
+            assert result.status in {"failed", "error"} and result.passed == 0, name
+        assert results["eq"].detail == (
+            "reverse_words('hello  world') returned a value that is not plain JSON"
+        )
+
+        # The worker's protocol stayed in step: the next job gets its own result.
+        one_case = {**REVERSE_CASES, "cases": REVERSE_CASES["cases"][:1]}
+        honest = await sandbox.run(SOLUTION, one_case)
+        assert (honest.status, honest.passed, honest.total) == ("passed", 1, 1)
+    finally:
+        await sandbox.stop()
+
+
+async def test_grade_reads_only_values_and_builtin_exception_names():
+    reply = {
+        "status": "ran",
+        "records": [{"value": '"world  hello"'}, {"raised": "Leak: sk-secret"}],
+    }
+    result = grade(reply, REVERSE_CASES)
+    assert (result.status, result.passed, result.total) == ("failed", 1, 2)
+    assert result.detail == "reverse_words('one two three') raised an exception"
+
+    extra = {"status": "ran", "records": [{"value": '"world  hello"'}] * 3}
+    assert grade(extra, REVERSE_CASES).status == "error"
+    with pytest.raises(ValueError):
+        grade({"status": "passed", "passed": 9, "total": 9}, REVERSE_CASES)
+
+
+@pytest.mark.usefixtures("sandbox_enabled")
+async def test_execution_feeds_correctness():
+    answer = (
+        f"```python\n{SOLUTION}```\nSplitting on whitespace runs keeps spacing; O(n)."
+    )
+    try:
+        payload = await llm_service.evaluate_answer(
+            answer_text=answer,
+            question_text="Implement reverse_words",
+            category=QuestionCategory.TECHNICAL,
+            role_name="Software Developer",
+            requires_code=True,
+            test_cases=REVERSE_CASES,
+        )
+        half = await llm_service.evaluate_answer(
+            answer_text="def reverse_words(s):\n    return 'world  hello'\n",
+            question_text="Implement reverse_words",
+            category=QuestionCategory.TECHNICAL,
+            role_name="Software Developer",
+            requires_code=True,
+            test_cases=REVERSE_CASES,
+        )
+    finally:
+        await code_sandbox.stop()
+
+    assert payload.rubric["correctness"] == 10.0
+    assert "2/2 test cases passed" in payload.feedback_markdown
+    assert half.rubric["correctness"] == 6.0
+    assert any(
+        item.startswith("Fix the failing test case")
+        for item in half.suggested_improvements
+    )
@@ -0,0 +1,115 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.init_db import load_seed_data
+from app.db.session import session_context
+from app.models.tables import Answer, Question, Role, Session
+
+pytestmark = pytest.mark.asyncio
+
+
+def _entry(text, **overrides):
+    entry = {
+        "role_slug": "qa-engineer",
+        "text": text,
+        "category": "technical",
+        "difficulty": 3,
+        "keywords": ["testing"],
+    }
+    entry.update(overrides)
+    return entry
+
+
+async def test_unchanged_seed_costs_a_single_query(app_fixture, tmp_path):
+    seed_path = tmp_path / "seed.json"
+    seed_path.write_text(json.dumps([_entry("How do you pick what to automate?")]))
+
+    async with session_context.session() as db:
+        first = await load_seed_data(db, seed_path)
+        assert (first.roles_created, first.questions_created) == (1, 1)
+
+        statements = []
+        sync_engine = db.get_bind()
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(sync_engine, "before_cursor_execute", listener)
+        try:
+            assert await load_seed_data(db, seed_path) is None
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", listener)
+        assert len(statements) == 1
+
+        assert (await load_seed_data(db, seed_path, force=True)).questions_updated == 0
+
+
+async def test_changed_seed_is_diffed_and_applied_in_bulk(app_fixture, tmp_path):
+    seed_path = tmp_path / "seed.json"
+    seed_path.write_text(
+        json.dumps(
+            [_entry("Old wording"), _entry("Duplicate wording"), _entry("Unchanged")]
+        )
+    )
+    async with session_context.session() as db:
+        await load_seed_data(db, seed_path)
+        role = await db.scalar(select(Role).where(Role.slug == "qa-engineer"))
+        questions = {
+            q.text: q.id
+            for q in (
+                await db.scalars(select(Question).where(Question.role_id == role.id))
+            )
+        }
+        session = Session(role_id=role.id)
+        db.add(session)
+        await db.flush()
+        now = datetime(2025, 1, 1)
+        db.add(
+            Answer(
+                session_id=session.id,
+                question_id=questions["Duplicate wording"],
+                answer_text="answer",
+                started_at=now,
+                ended_at=now,
+                duration_ms=0,
+            )
+        )
+        await db.commit()
+
+        seed_path.write_text(
+            json.dumps(
+                [
+                    _entry(
+                        "New wording",
+                        difficulty=5,
+                        legacy_texts=["Old wording", "Duplicate wording"],
+                    ),
+                    _entry("Unchanged"),
+                    _entry("Brand new", requires_code=True, test_cases={"cases": []}),
+                ]
+            )
+        )
+        stats = await load_seed_data(db, seed_path)
+        assert (
+            stats.questions_updated,
+            stats.questions_merged,
+            stats.questions_created,
+        ) == (1, 1, 1)
+
+        rows = {
+            q.text: q
+            for q in (
+                await db.scalars(select(Question).where(Question.role_id == role.id))
+            )
+        }
+        assert set(rows) == {"New wording", "Unchanged", "Brand new"}
+        assert rows["New wording"].id == questions["Old wording"]
+        assert rows["New wording"].difficulty == 5
+        assert rows["Brand new"].test_cases == {"cases": []}
+        moved = await db.scalar(
+            select(Answer.question_id).where(Answer.session_id == session.id)
+        )
+        assert moved == questions["Old wording"]
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import selectinload
+
+from app.db.session import session_context
+from app.models.tables import Answer, Session
+from app.schemas.session import SessionDetail
+from app.services.reference_cache import reference_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _session_with_answers(client, count):
+    session_id = (
+        await client.post("/api/v1/sessions", json={"role_slug": "software-developer"})
+    ).json()["id"]
+    questions = (
+        await client.get(
+            "/api/v1/questions", params={"role": "software-developer", "limit": 2}
+        )
+    ).json()
+    started = datetime.now(tz=timezone.utc)
+    for index in range(count):
+        answer = await client.post(
+            f"/api/v1/sessions/{session_id}/answers",
+            json={
+                "question_id": questions[index % 2]["id"],
+                "answer_text": f"Answer {index} with a measurable outcome.",
+                "started_at": (started + timedelta(minutes=index)).isoformat(),
+                "ended_at": (
+                    started + timedelta(minutes=index, seconds=50)
+                ).isoformat(),
+                "transcript_text": f"transcript {index}",
+            },
+        )
+        if index % 2 == 0:
+            await client.post(
+                "/api/v1/evaluate", json={"answer_id": answer.json()["id"]}
+            )
+    return session_id
+
+
+async def test_projection_matches_the_orm_graph_in_two_queries(client):
+    session_id = await _session_with_answers(client, 4)
+
+    async with session_context.session() as db:
+        session_obj = await db.scalar(
+            select(Session)
+            .where(Session.id == session_id)
+            .options(
+                selectinload(Session.role),
+                selectinload(Session.answers).selectinload(Answer.question),
+                selectinload(Session.answers).selectinload(Answer.evaluation),
+            )
+        )
+        expected = SessionDetail.model_validate(session_obj).model_dump(mode="json")
+        sync_engine = db.get_bind()
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get(f"/api/v1/sessions/{session_id}")
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+
+    assert response.json() == expected
+    assert len(statements) == 2
+
+
+async def test_uncached_questions_are_read_in_one_query(client):
+    session_id = await _session_with_answers(client, 4)
+    async with session_context.session() as db:
+        sync_engine = db.get_bind()
+    # As if both questions were imported after this worker's last load.
+    reference_cache._questions.clear()
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get(f"/api/v1/sessions/{session_id}")
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+
+    assert all(answer["question"] for answer in response.json()["answers"])
+    assert len(statements) == 3
+
+
+async def test_exclude_skips_heavy_columns(client):
+    session_id = await _session_with_answers(client, 2)
+    full = await client.get(f"/api/v1/sessions/{session_id}")
+    lean = await client.get(
+        f"/api/v1/sessions/{session_id}",
+        params=[("exclude", "transcript_text"), ("exclude", "feedback_markdown")],
+    )
+
+    assert lean.headers["etag"] != full.headers["etag"]
+    first = lean.json()["answers"][0]
+    assert "transcript_text" not in first
+    assert "feedback_markdown" not in first["evaluation"]
+    assert (
+        first["evaluation"]["score"] == full.json()["answers"][0]["evaluation"]["score"]
+    )
+    assert (
+        await client.get(
+            f"/api/v1/sessions/{session_id}", params={"exclude": "answers"}
+        )
+    ).status_code == 422
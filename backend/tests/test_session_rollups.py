@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.db.base import Base
+from app.db.session import create_engine_and_sessionmaker
+from app.models.enums import QuestionCategory, SessionTier
+from app.models.tables import Answer, Question, Role, Session
+from app.services.evaluation import EvaluationPayload
+from app.services.scoring import AnswerContext, store_evaluation
+
+pytestmark = pytest.mark.asyncio
+
+
+def _payload(score: float) -> EvaluationPayload:
+    return EvaluationPayload(
+        score=score,
+        feedback_markdown=f"Scored {score}.",
+        rubric={"clarity": score},
+        suggested_improvements=[],
+        readiness_tier=SessionTier.EMERGING,
+    )
+
+
+async def test_overlapping_rescores_of_one_answer_compose(tmp_path):
+    # A file database, so the two transactions really run on separate connections.
+    engine, session_factory = create_engine_and_sessionmaker(
+        f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}"
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    started = datetime(2025, 1, 1, 9, 0, 0)
+    async with session_factory() as db:
+        role = Role(name="Developer", slug="developer", description="Builds software.")
+        question = Question(
+            role=role,
+            text="Tell me about a launch.",
+            category=QuestionCategory.BEHAVIORAL,
+        )
+        session_obj = Session(role=role, started_at=started)
+        answer = Answer(
+            session=session_obj,
+            question=question,
+            answer_text="It shipped.",
+            started_at=started,
+            ended_at=started,
+            duration_ms=0,
+        )
+        db.add(answer)
+        await db.commit()
+        context = AnswerContext(
+            answer_id=answer.id,
+            session_id=session_obj.id,
+            answer_text=answer.answer_text,
+            question_id=question.id,
+            question_text=question.text,
+            category=question.category,
+            requires_code=False,
+            keywords=[],
+            role_name=role.name,
+        )
+        await store_evaluation(db, context, _payload(5.0))
+        await db.commit()
+
+    try:
+        async with session_factory() as first, session_factory() as second:
+            await store_evaluation(first, context, _payload(7.0))
+            # The second re-score waits for the first transaction instead of reusing the old 5.0.
+            pending = asyncio.create_task(
+                store_evaluation(second, context, _payload(9.0))
+            )
+            await asyncio.sleep(0.2)
+            assert not pending.done()
+            await first.commit()
+            await pending
+            await second.commit()
+
+        async with session_factory() as db:
+            stored = await db.get(Session, context.session_id)
+            assert (stored.score_sum, stored.evaluated_count, stored.overall_score) == (
+                9.0,
+                1,
+                9.0,
+            )
+    finally:
+        await engine.dispose()
@@ -0,0 +1,28 @@
+from app.services.text_features import TEST_TOKENS, extract_features, question_tokens
+
+
+def test_features_match_substring_semantics():
+    features = extract_features(
+        "Wrote UnitTests for the API Gateway\n  # covers edge cases\r\nDone in 3 days"
+    )
+
+    assert features.has_any(TEST_TOKENS)
+    assert features.count(("unit", "test", "assert")) == 2
+    assert features.has_any(question_tokens(("API gateway",)))
+    assert features.has_digit
+    assert features.has_comment_line
+    assert features.line_count == 3
+
+
+def test_comment_detection_requires_marker_at_line_start():
+    assert not extract_features(
+        "see https://example.com/docs or issue #12"
+    ).has_comment_line
+    assert extract_features("x = 1\n\t// explain").has_comment_line
+    assert extract_features("").line_count == 0
+
+
+def test_question_tokens_are_normalised_and_cached():
+    tokens = question_tokens(("Kafka", "kafka", "Streams"))
+    assert tokens == ("kafka", "streams")
+    assert question_tokens(("Kafka", "kafka", "Streams")) is tokens
@@ -8,6 +8,7 @@ import type {
   Session,
   SessionDetail,
   RoleLevel,
+  SessionTier,
 } from "./types";
 
 export const fetchRoles = async (): Promise<Role[]> => {
@@ -20,6 +21,7 @@ export const fetchQuestions = async (params: {
   category?: string;
   level?: RoleLevel;
   limit?: number;
+  session_id?: number;
 }): Promise<Question[]> => {
   const response = await apiClient.get<Question[]>("/questions", { params });
   return response.data;
@@ -57,8 +59,19 @@ export const fetchSessionDetail = async (sessionId: number): Promise<SessionDeta
 export const fetchHistory = async (params?: {
   role?: string;
   level?: RoleLevel;
+  tier?: SessionTier;
+  started_after?: string;
+  started_before?: string;
+  cursor?: string;
   limit?: number;
 }): Promise<HistoryItem[]> => {
   const response = await apiClient.get<HistoryItem[]>("/history", { params });
   return response.data;
 };
+
+export const fetchHistoryPage = async (
+  params?: Parameters<typeof fetchHistory>[0],
+): Promise<{ items: HistoryItem[]; nextCursor: string | null }> => {
+  const response = await apiClient.get<HistoryItem[]>("/history", { params });
+  return { items: response.data, nextCursor: response.headers["x-next-cursor"] ?? null };
+};